@@ -1,6 +1,14 @@
-from airflow.sdk import dag,task
-from airflow.operators import *
+from airflow.sdk import dag,task,Param
 from datetime import datetime, timedelta
+import os
+
+# fused: extract -> clean -> transform -> validate run in-process as one task (src/space_alert/pipeline.py)
+FUSED = os.getenv("SPACE_ALERT_EXECUTION_MODE", "tasks") == "fused"
+EXTRACT_TASK = "process_neo_data" if FUSED else "extract_neo_data"
+# quarantine: rows failing validation go to a quarantine table, the valid rows still load and monitor
+QUARANTINE = os.getenv("SPACE_ALERT_VALIDATION_MODE", "halt") == "quarantine"
+FRAME_TASK = "process_neo_data" if FUSED else ("validate_neo_data" if QUARANTINE else "transform_neo_data")
+VALIDATION_TASK = "process_neo_data" if FUSED else "validate_neo_data"
 
 default_args = {
     'retries': 2,
@@ -12,17 +20,29 @@ default_args = {
     schedule=None,
     catchup=False, 
     default_args=default_args,
+    params={
+        # leave both empty for the regular half-day window, set them to backfill a date range
+        "start_date": Param(None, type=["null", "string"], format="date"),
+        "end_date": Param(None, type=["null", "string"], format="date"),
+        # only request feed dates the extraction watermark has not ingested yet
+        "incremental": Param(True, type="boolean"),
+    },
 )
 
 def space_alert_dag():
 
     @task.python
     def extract_neo_data(**kwargs):
-        from src.space_alert.step01_extract_neo_data import neosapi
-        output=neosapi()
+        from src.space_alert.step01_extract_neo_data import neosapi, plan_feed_dates
+        from airflow.exceptions import AirflowSkipException
+        params=kwargs['params']
+        feed_dates=plan_feed_dates(params.get('start_date'),params.get('end_date'),params.get('incremental'))
+        if not feed_dates:
+            raise AirflowSkipException("All feed dates in the window are already ingested.")
+        output=neosapi(dates=feed_dates)
         ti=kwargs['ti']
+        ti.xcom_push(key='neo_feed_dates',value=[day.isoformat() for day in feed_dates])
         ti.xcom_push(key='raw_neo_data',value=output)
-        return output
     
     @task.python
     def clean_neo_data(**kwargs):
@@ -31,7 +51,6 @@ def space_alert_dag():
         input=ti.xcom_pull(key='raw_neo_data',task_ids='extract_neo_data')
         output=clean_data(input)
         ti.xcom_push(key='cleaned_neo_data',value=output)
-        return output
     
     
     @task.python
@@ -39,25 +58,43 @@ def space_alert_dag():
         from src.space_alert.step03_transform_neo_data import transform_data
         ti=kwargs['ti']
         input=ti.xcom_pull(key='cleaned_neo_data',task_ids='clean_neo_data')
-        output=transform_data(input)
+        output=transform_data(input,run_key=kwargs['run_id'],run_ts=kwargs['dag_run'].run_after)
         ti.xcom_push(key='transformed_neo_data',value=output)
-        return output
     
     @task.python
     def validate_neo_data(**kwargs):
-        from src.space_alert.step04_validate_neo_data import validate_data
+        from src.space_alert.step04_validate_neo_data import validate_data, validate_and_quarantine
         ti=kwargs['ti']
         input=ti.xcom_pull(key='transformed_neo_data',task_ids='transform_neo_data')
-        output=validate_data(input)
+        if QUARANTINE:
+            valid,output=validate_and_quarantine(input)
+            ti.xcom_push(key='transformed_neo_data',value=valid)
+        else:
+            output=validate_data(input)
         ti.xcom_push(key='validate_neo_data',value=output)
         return output
+
+    @task.python
+    def process_neo_data(**kwargs):
+        from src.space_alert.step01_extract_neo_data import plan_feed_dates
+        from src.space_alert.pipeline import run_space_alert_pipeline
+        from airflow.exceptions import AirflowSkipException
+        params=kwargs['params']
+        feed_dates=plan_feed_dates(params.get('start_date'),params.get('end_date'),params.get('incremental'))
+        if not feed_dates:
+            raise AirflowSkipException("All feed dates in the window are already ingested.")
+        output,validation_result,lineage=run_space_alert_pipeline(feed_dates,run_key=kwargs['run_id'],run_ts=kwargs['dag_run'].run_after,quarantine=QUARANTINE)
+        ti=kwargs['ti']
+        ti.xcom_push(key='neo_feed_dates',value=lineage['feed_dates'])
+        ti.xcom_push(key='transformed_neo_data',value=output)
+        ti.xcom_push(key='validate_neo_data',value=validation_result)
+        ti.xcom_push(key='pipeline_lineage',value=lineage)
     
     @task.branch
     def validation_checker(**kwargs):
-        from src.space_alert.step04_validate_neo_data import validate_data
         ti=kwargs['ti']
-        validation_result=ti.xcom_pull(key='validate_neo_data',task_ids='validate_neo_data')
-        if validation_result==True:
+        validation_result=ti.xcom_pull(key='validate_neo_data',task_ids=VALIDATION_TASK)
+        if validation_result['passed']:
             return ["monitor_neo_data","load_neo_data"]
         else:
             return "raiserror"
@@ -76,7 +113,7 @@ def space_alert_dag():
     def monitor_neo_data(**kwargs):
         from src.space_alert.step06_monitor_neo_data import monitor_neo
         ti=kwargs['ti']
-        input=ti.xcom_pull(key='transformed_neo_data',task_ids='transform_neo_data')
+        input=ti.xcom_pull(key='transformed_neo_data',task_ids=FRAME_TASK)
         output=monitor_neo(input)
         if hasattr(output, 'select_dtypes'):
             for col in output.select_dtypes(include=['datetime64']).columns:
@@ -93,7 +130,6 @@ def space_alert_dag():
         import os
         load_dotenv()
         ti=kwargs['ti']
-        input=ti.xcom_pull(key='transformed_neo_data',task_ids='transform_neo_data')
         alerts=ti.xcom_pull(key='monitor_neo_data',task_ids='monitor_neo_data')
         recipient_emails = os.getenv("RECIPIENT_EMAILS", "")
         # for users
@@ -109,8 +145,11 @@ def space_alert_dag():
         from src.space_alert.step05_load_neo_data import load_dataframe_to_postgres
         import pandas as pd
         ti=kwargs['ti']
-        input=ti.xcom_pull(key='transformed_neo_data',task_ids='transform_neo_data')
+        input=ti.xcom_pull(key='transformed_neo_data',task_ids=FRAME_TASK)
         output=load_dataframe_to_postgres(input)
+        if output[0]==True:
+            from src.space_alert.neo_watermark import mark_dates_ingested
+            mark_dates_ingested(ti.xcom_pull(key='neo_feed_dates',task_ids=EXTRACT_TASK))
         ti.xcom_push(key='load_neo_data',value=output)
         return output
     
@@ -134,12 +173,14 @@ def space_alert_dag():
     
             
         send_load_success_email(is_skipped,is_failure,schema_name,table_name,batch_id,record_count)
+
+    # DataFrames travel as Arrow files (src/common/xcom_backend.py); drop the expired ones
+    @task.python(trigger_rule="all_done")
+    def purge_expired_xcom():
+        from src.common.frame_store import sweep_expired
+        return sweep_expired()
     
     
-    step1_extract=extract_neo_data()
-    step2_clean=clean_neo_data()
-    step3_transform=transform_neo_data()
-    step4_validate=validate_neo_data()
     step5_validation_check=validation_checker()
     step6_raiserror=raiserror()
     step6_load=load_neo_data()
@@ -147,15 +188,28 @@ def space_alert_dag():
     step8_alert=alert_neo_data()
     step9_data_load_alert=data_load_alert()
     step10_pipeline_error_alert=error_alert()
-    
-    
-    step1_extract >> step2_clean >> step3_transform >> step4_validate >> step5_validation_check >> [step6_load,step6_raiserror]
+    step11_purge_xcom=purge_expired_xcom()
+    
+    
+    if FUSED:
+        step1_process=process_neo_data()
+        step1_process >> step5_validation_check
+    else:
+        step1_extract=extract_neo_data()
+        step2_clean=clean_neo_data()
+        step3_transform=transform_neo_data()
+        step4_validate=validate_neo_data()
+        step1_extract >> step2_clean >> step3_transform >> step4_validate >> step5_validation_check
+
+    step5_validation_check >> [step6_load,step6_raiserror]
     
     step6_raiserror >> step10_pipeline_error_alert
      
     step5_validation_check >> step7_monitor >> step8_alert
     
     step6_load >> step9_data_load_alert
+
+    [step8_alert,step9_data_load_alert,step10_pipeline_error_alert] >> step11_purge_xcom
 space_alert_dag()
 
 #end
\ No newline at end of file
@@ -0,0 +1,147 @@
+# CLEAN BENCHMARK
+# Fused single-pass clean_data() (NEO) and clean_weather_data() against the
+# column-by-column functions they replaced, on synthetic extracted frames with
+# duplicate keys, NaNs and outliers. Checks both produce the same frame first.
+#
+#   cd dags && python -m src.benchmarks.clean --sizes 10000 100000 1000000
+
+import numpy as np
+import pandas as pd
+
+from ..common.dtypes import NEO_SCHEMA, WEATHER_SCHEMA, apply_dtypes
+from ..space_alert.step02_clean_neo_data import clean_data
+from ..weather_alert._01_extract_weather_data import HOURLY_VARIABLES
+from ..weather_alert._02_clean_weather_data import clean_weather_data
+from .harness import best_time, parse_sizes, quiet, speedup
+
+
+def synthetic_neo(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'asteroid_name': [f'({i} AB)' for i in range(rows)],
+        'nasa_id': np.arange(rows).astype(str),
+        'nasa_site_url': 'https://ssd-api.jpl.nasa.gov/x',
+        'closest_approach_time_to_earth_IST': '2025-Jan-01 10:20',
+        'closest_approach_distance_km': rng.uniform(5e4, 1.2e8, rows),
+        'velocity_kmph': rng.uniform(5e3, 1e5, rows),
+        'diameter_min_m': rng.uniform(1, 300, rows).astype(np.float32),
+        'diameter_max_m': rng.uniform(1, 500, rows).astype(np.float32),
+        'is_potentially_hazardous': rng.random(rows) < 0.1,
+    })
+    df.loc[::97, 'closest_approach_distance_km'] = np.nan
+    df.loc[::89, 'velocity_kmph'] = np.nan
+    # every 101st row repeats an earlier nasa_id
+    repeated = df.index[5::101]
+    df.loc[repeated, 'nasa_id'] = df['nasa_id'].to_numpy()[::101][:len(repeated)]
+    return df
+
+
+def synthetic_weather(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({column: rng.uniform(-10, 120, rows).astype(np.float32) for _, column in HOURLY_VARIABLES})
+    df['weather_code'] = rng.integers(0, 110, rows).astype(np.float32)
+    df.loc[::50, 'rain_mm'] = np.nan
+    df.loc[::70, 'temperature_celcius'] = np.nan
+    # one city in twenty reports twice
+    df.insert(0, 'city', [f'City{i % (rows - rows // 20)}' for i in range(rows)])
+    return df
+
+
+def column_wise_clean_neo(data):
+    """The replaced step02 clean_data, kept for comparison."""
+    df = pd.DataFrame(data)
+    df['asteroid_name'] = df['asteroid_name'].astype(str)
+    df['nasa_id'] = df['nasa_id'].astype(str)
+    df['nasa_site_url'] = df['nasa_site_url'].astype(str)
+    df['is_potentially_hazardous'] = df['is_potentially_hazardous'].astype(bool)
+    df['closest_approach_distance_km'] = df['closest_approach_distance_km'].round(2)
+    df['velocity_kmph'] = df['velocity_kmph'].round(2)
+    df['diameter_min_m'] = df['diameter_min_m'].round(2)
+    df['diameter_max_m'] = df['diameter_max_m'].round(2)
+    df['closest_approach_time_to_earth_IST'] = pd.to_datetime(df['closest_approach_time_to_earth_IST'], format='%Y-%b-%d %H:%M')
+    df['closest_approach_time_to_earth_IST'] = df['closest_approach_time_to_earth_IST'] + pd.Timedelta(hours=5, minutes=30)
+    df['asteroid_name'] = df['asteroid_name'].astype(str).str.replace(r'[()]', '', regex=True)
+    df['asteroid_name'] = df['asteroid_name'].str.upper()
+    df.drop_duplicates(subset=['nasa_id'], inplace=True)
+    critical_columns = ["asteroid_name", "nasa_id", "closest_approach_time_to_earth_IST", "closest_approach_distance_km", "velocity_kmph", "diameter_max_m", "is_potentially_hazardous"]
+    df['is_missing_data'] = df[critical_columns].isnull().any(axis=1)
+    thresholds = {
+        "closest_approach_distance_km": (100000, 110000000),
+        "velocity_kmph": (7000, 99000)
+    }
+    df['is_outlier'] = False
+    for col, (min_val, max_val) in thresholds.items():
+        if col in df.columns:
+            df['is_outlier'] |= (df[col] < min_val) | (df[col] > max_val)
+    df.dropna(subset=["nasa_id", "closest_approach_distance_km"], inplace=True)
+    df['processing_status'] = 'cleaned'
+    apply_dtypes(df, NEO_SCHEMA)
+    return df
+
+
+def column_wise_clean_weather(data):
+    """The replaced _02 clean_weather_data, kept for comparison (it returned records)."""
+    df = apply_dtypes(pd.DataFrame(data), WEATHER_SCHEMA)
+    df = df.round({
+        'temperature_celcius': 2, 'humidity_%': 0, 'dew_temperature_celcius': 2,
+        'feels_like_temperature_celcius': 2, 'wind_speed_kmph': 2, 'precipitation_%': 0,
+        'precipitation_occured_mm': 2, 'rain_mm': 2, 'showers_mm': 2, 'snowfall_mm': 2,
+        'snow_depth_mm': 2, 'mean_sea_level_pressure_hpa': 2, 'surface_pressure_hpa': 1,
+        'cloud_cover_%': 0, 'visibility_m': 2, 'evapotranspiration_mm': 3,
+        'et0_fao_evapotranspiration_mm': 3, 'vapour_pressure_deficit_kpa': 4
+    })
+    critical_columns = [
+        "temperature_celcius", "humidity_%", "dew_temperature_celcius", "feels_like_temperature_celcius",
+        "wind_speed_kmph", "precipitation_%", "precipitation_occured_mm", "rain_mm", "showers_mm", "snowfall_mm",
+        "snow_depth_mm", "weather_code", "mean_sea_level_pressure_hpa", "surface_pressure_hpa", "cloud_cover_%",
+        "visibility_m", "evapotranspiration_mm", "et0_fao_evapotranspiration_mm", "vapour_pressure_deficit_kpa"
+    ]
+    df['is_missing_data'] = df[critical_columns].isnull().any(axis=1)
+    thresholds = {
+        "temperature_celcius": (-90, 60), "humidity_%": (0, 100), "dew_temperature_celcius": (-100, 60),
+        "feels_like_temperature_celcius": (-100, 70), "wind_speed_kmph": (0, 300), "precipitation_%": (0, 100),
+        "precipitation_occured_mm": (0, 500), "rain_mm": (0, 500), "showers_mm": (0, 500),
+        "snowfall_mm": (0, 500), "snow_depth_mm": (0, 1000), "weather_code": (0, 101),
+        "cloud_cover_%": (0, 100), "visibility_m": (0, 100000)
+    }
+    df['is_outlier'] = False
+    for col, (min_val, max_val) in thresholds.items():
+        if col in df.columns:
+            df['is_outlier'] |= (df[col] < min_val) | (df[col] > max_val)
+    df.drop_duplicates(subset=['city'], inplace=True)
+    df.dropna(subset=["city", "temperature_celcius", "weather_code"], inplace=True)
+    df['processing_status'] = 'cleaned'
+    apply_dtypes(df, WEATHER_SCHEMA)
+    print(df)
+    return df.to_dict(orient='records')
+
+
+def check_same_output(rows=5000):
+    before = quiet(column_wise_clean_neo, synthetic_neo(rows))
+    after = quiet(clean_data, synthetic_neo(rows))
+    pd.testing.assert_frame_equal(before, after[before.columns], check_dtype=False)
+
+    after = quiet(clean_weather_data, synthetic_weather(rows))
+    before = pd.DataFrame(quiet(column_wise_clean_weather, synthetic_weather(rows)), index=after.index)
+    pd.testing.assert_frame_equal(before, after[before.columns], check_dtype=False, check_categorical=False)
+
+
+def main(argv=None):
+    args = parse_sizes("Cleaning: column-wise vs fused single pass", [10_000, 100_000, 1_000_000], argv)
+    check_same_output()
+    print("✅ Column-wise and fused cleaning agree (NEO and weather)")
+
+    for rows in args.sizes:
+        neo, weather = synthetic_neo(rows), synthetic_weather(rows)
+        old_neo = best_time(column_wise_clean_neo, args.repeat, lambda: (neo.copy(),))
+        new_neo = best_time(clean_data, args.repeat, lambda: (neo.copy(),))
+        old_weather = best_time(column_wise_clean_weather, args.repeat, lambda: (weather.copy(),))
+        new_weather = best_time(clean_weather_data, args.repeat, lambda: (weather.copy(),))
+        print(
+            f"{rows:>9,} rows  NEO {old_neo:.3f}s -> {new_neo:.3f}s ({speedup(old_neo, new_neo)})  "
+            f"weather {old_weather:.3f}s -> {new_weather:.3f}s ({speedup(old_weather, new_weather)})"
+        )
+
+
+if __name__ == "__main__":
+    main()
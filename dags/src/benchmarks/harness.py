@@ -0,0 +1,51 @@
+# BENCHMARK HARNESS
+# Shared timing / peak-memory helpers for the scripts in this package. Each
+# script compares the current code path with a reference copy of the path it
+# replaced, on synthetic data, and prints one line per size:
+#
+#   cd dags && python -m src.benchmarks.<script> [--sizes 10000 100000]
+
+import argparse
+import contextlib
+import io
+import time
+import tracemalloc
+
+
+def quiet(fn, *args, **kwargs):
+    """Call fn with its progress prints swallowed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def best_time(fn, repeat=3, setup=None):
+    """Best wall time in seconds over `repeat` runs; setup() builds fresh arguments for every run."""
+    best = float("inf")
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        started = time.perf_counter()
+        quiet(fn, *args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def peak_memory_mb(fn, setup=None):
+    """Peak Python heap allocated while fn runs (tracemalloc), in MB."""
+    args = setup() if setup else ()
+    tracemalloc.start()
+    try:
+        quiet(fn, *args)
+        return tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    finally:
+        tracemalloc.stop()
+
+
+def speedup(before, after):
+    return f"x{before / after:.1f}" if after else "n/a"
+
+
+def parse_sizes(description, default_sizes, argv=None):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--sizes", type=int, nargs="+", default=default_sizes)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args(argv)
@@ -0,0 +1,86 @@
+# NEO FEED PARSE BENCHMARK
+# Streaming columnar parse_neo_feed() against the json.loads + list-of-dicts +
+# DataFrame path it replaced, on synthetic 7-day feed payloads: parse time
+# (best of --repeat) and peak heap.
+#
+#   cd dags && python -m src.benchmarks.neo_parse --sizes 1000 3000 10000
+
+import io
+import json
+from datetime import date, timedelta
+
+import pandas as pd
+
+from ..space_alert.step01_extract_neo_data import parse_neo_feed
+from .harness import best_time, parse_sizes, peak_memory_mb, speedup
+
+FEED_DAYS = 7
+
+
+def synthetic_feed(objects_per_day, days=FEED_DAYS, start=date(2024, 1, 1)):
+    """Feed JSON bytes shaped like the NeoWs /feed response."""
+    near_earth_objects = {}
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        near_earth_objects[day.isoformat()] = [
+            {
+                "id": str(offset * objects_per_day + i),
+                "name": f"({offset * objects_per_day + i} AB)",
+                "nasa_jpl_url": "https://ssd.jpl.nasa.gov/tools/sbdb_lookup.html",
+                "is_potentially_hazardous_asteroid": i % 7 == 0,
+                "estimated_diameter": {"meters": {"estimated_diameter_min": 10.5 + i % 300, "estimated_diameter_max": 23.4 + i % 500}},
+                "close_approach_data": [{
+                    "close_approach_date_full": f"{day:%Y-%b-%d} 10:15",
+                    "miss_distance": {"kilometers": str(1e6 + i * 13.7)},
+                    "relative_velocity": {"kilometers_per_hour": str(20000 + i % 90000)},
+                }],
+            }
+            for i in range(objects_per_day)
+        ]
+    return json.dumps({"near_earth_objects": near_earth_objects}).encode()
+
+
+def list_of_dicts_parse(raw):
+    """The replaced path: whole response decoded, nested loops, list of dicts, then a DataFrame."""
+    data = json.loads(raw)
+    neos_list = []
+    for feed_date in sorted(data.get("near_earth_objects", {})):
+        for neo in data["near_earth_objects"][feed_date]:
+            approach_data = neo.get("close_approach_data", [])
+            if approach_data:
+                neos_list.append({
+                    "asteroid_name": neo["name"],
+                    "nasa_id": neo["id"],
+                    "nasa_site_url": neo["nasa_jpl_url"],
+                    "closest_approach_time_to_earth_IST": approach_data[0].get("close_approach_date_full"),
+                    "closest_approach_distance_km": float(approach_data[0]["miss_distance"]["kilometers"]),
+                    "velocity_kmph": float(approach_data[0]["relative_velocity"]["kilometers_per_hour"]),
+                    "diameter_min_m": float(neo["estimated_diameter"]["meters"]["estimated_diameter_min"]),
+                    "diameter_max_m": float(neo["estimated_diameter"]["meters"]["estimated_diameter_max"]),
+                    "is_potentially_hazardous": neo["is_potentially_hazardous_asteroid"]
+                })
+    return pd.DataFrame(neos_list)
+
+
+def streaming_parse(raw):
+    return pd.DataFrame(parse_neo_feed(io.BytesIO(raw)), copy=False)
+
+
+def main(argv=None):
+    args = parse_sizes("NeoWs feed parse: list-of-dicts vs streaming columnar", [1000, 3000, 10000], argv)
+    for objects_per_day in args.sizes:
+        raw = synthetic_feed(objects_per_day)
+        rows = len(streaming_parse(raw))
+        assert rows == len(list_of_dicts_parse(raw))
+
+        old_s, new_s = best_time(list_of_dicts_parse, args.repeat, lambda: (raw,)), best_time(streaming_parse, args.repeat, lambda: (raw,))
+        old_mb, new_mb = peak_memory_mb(list_of_dicts_parse, lambda: (raw,)), peak_memory_mb(streaming_parse, lambda: (raw,))
+        print(
+            f"{rows:>9,} rows ({len(raw) / 1024 ** 2:.1f} MB JSON)  "
+            f"list-of-dicts {old_s:.3f}s peak {old_mb:.1f} MB  |  "
+            f"streaming {new_s:.3f}s peak {new_mb:.1f} MB  ({speedup(old_s, new_s)} time, {speedup(old_mb, new_mb)} memory)"
+        )
+
+
+if __name__ == "__main__":
+    main()
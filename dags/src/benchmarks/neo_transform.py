@@ -0,0 +1,109 @@
+# NEO TRANSFORM BENCHMARK
+# Vectorized transform_data() against the row-by-row transform it replaced
+# (apply/lambda per row), on synthetic cleaned frames. Checks both produce the
+# same columns and values first. The stored hazard score range is not read:
+# both paths scale on the batch alone.
+#
+#   cd dags && python -m src.benchmarks.neo_transform --sizes 10000 100000 1000000
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ..space_alert import hazard_scaler
+from ..space_alert.step03_transform_neo_data import transform_data
+from .harness import best_time, parse_sizes, quiet, speedup
+
+ID_COLUMNS = ['created_at', 'data_id', 'batch_id']
+
+
+def synthetic_cleaned(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'asteroid_name': [f'({i} AB)' for i in range(rows)],
+        'nasa_id': [str(i) for i in range(rows)],
+        'nasa_site_url': rng.choice(['https://ssd.jpl.nasa.gov/x', 'http://nasa.gov/x', 'https://example.com'], rows),
+        'closest_approach_time_to_earth_IST': pd.Timestamp('2025-01-01 10:15'),
+        'closest_approach_distance_km': rng.uniform(1e4, 2e6, rows),
+        'velocity_kmph': np.where(rng.random(rows) < 0.01, np.nan, rng.uniform(1000, 120000, rows)),
+        'diameter_min_m': rng.uniform(1, 300, rows),
+        'diameter_max_m': rng.uniform(1, 500, rows),
+        'is_potentially_hazardous': rng.random(rows) < 0.1,
+        'is_missing_data': False,
+        'is_outlier': False,
+        'processing_status': 'cleaned',
+    })
+
+
+def row_wise_transform(data):
+    """The replaced path, kept for comparison (sklearn MinMaxScaler swapped for the same NumPy min-max)."""
+    df = data
+    now = datetime.now()
+    df['data_id'] = df['nasa_id'].apply(lambda nasa_id: f"{nasa_id}-{now:%d%m%y%H%M%S}{now.microsecond // 10000:02d}")
+    df['created_at'] = datetime.now()
+    df['nasa_site_url'] = df['nasa_site_url'].apply(
+        lambda url: url if isinstance(url, str) and url.startswith('https://') and 'nasa.gov' in url
+        else 'url not found'
+    )
+
+    def determine_hazard(row):
+        val = str(row['is_potentially_hazardous']).strip().lower()
+        if val in ['true', 'yes', '1']:
+            return True
+        elif val in ['false', 'no', '0']:
+            return False
+        return bool(row['diameter_max_m'] > 150 and row['closest_approach_distance_km'] < 1000000 and row['velocity_kmph'] > 8000)
+    df['is_potentially_hazardous'] = df.apply(determine_hazard, axis=1)
+
+    if not df['data_id'].is_unique:
+        df = df.drop_duplicates(subset=['data_id'], keep='first')
+    columns_imp = [
+        'asteroid_name', 'nasa_id', 'nasa_site_url', 'closest_approach_time_to_earth_IST',
+        'closest_approach_distance_km', 'velocity_kmph', 'diameter_min_m', 'diameter_max_m',
+        'is_potentially_hazardous', 'data_id', 'created_at'
+    ]
+    df['is_deleted'] = df[columns_imp].isnull().any(axis=1)
+    df['processing_status'] = 'transformed'
+    df['batch_id'] = datetime.now().strftime('%Y%m%d%H%M%S')
+
+    def categorize_speed(speed):
+        if speed < 25000:
+            return "slow"
+        elif speed < 65000:
+            return "moderate"
+        return "fast"
+    df['velocity_category'] = df['velocity_kmph'].apply(categorize_speed)
+
+    product = df['velocity_kmph'] * df['diameter_max_m']
+    df['hazard_score'] = ((product - product.min()) / (product.max() - product.min())).round(3)
+    df['risk_level'] = pd.cut(df['hazard_score'], bins=[0, 0.2, 0.5, 0.8, 1.0], labels=['Low', 'Medium', 'High', 'Critical'], include_lowest=True)
+    df['size_category'] = pd.cut(df['diameter_max_m'], bins=[0, 70, 180, 350, np.inf], labels=['small', 'medium', 'large', 'very_large'])
+    df['is_close'] = (df['closest_approach_distance_km'] < 750000)
+    return df
+
+
+def check_same_output(rows=5000):
+    before = quiet(row_wise_transform, synthetic_cleaned(rows)).drop(columns=ID_COLUMNS).reset_index(drop=True)
+    after = quiet(transform_data, synthetic_cleaned(rows)).drop(columns=ID_COLUMNS).reset_index(drop=True)
+    pd.testing.assert_frame_equal(
+        before[after.columns], after, check_dtype=False, check_categorical=False, check_exact=False, atol=1e-3
+    )
+
+
+def main(argv=None):
+    args = parse_sizes("NEO transform: row-wise apply vs vectorized", [10_000, 100_000, 1_000_000], argv)
+    # scale on the batch alone, like the replaced path, without a database
+    hazard_scaler.load_state = lambda score_name=None: hazard_scaler.RunningMinMaxScaler()
+    check_same_output()
+    print("✅ Row-wise and vectorized transforms agree")
+
+    for rows in args.sizes:
+        frame = synthetic_cleaned(rows)
+        old_s = best_time(row_wise_transform, args.repeat, lambda: (frame.copy(),))
+        new_s = best_time(transform_data, args.repeat, lambda: (frame.copy(),))
+        print(f"{rows:>9,} rows  row-wise {old_s:.3f}s  vectorized {new_s:.3f}s  ({speedup(old_s, new_s)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# POSTGRES LOAD BENCHMARK
+# copy_frame() (COPY FROM STDIN) against the to_sql(method='multi') insert it
+# replaced, in rows/s, on synthetic NEO- and weather-shaped frames. Needs the
+# db_* settings of a scratch database; tables are created in BENCH_SCHEMA
+# (default pipeline_bench) and the schema is dropped at the end.
+#
+#   cd dags && python -m src.benchmarks.pg_load --sizes 10000 50000
+
+import os
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from ..common.db import create_db_engine
+from ..common.pg_copy import copy_frame
+from .harness import best_time, parse_sizes, speedup
+
+BENCH_SCHEMA = os.getenv("BENCH_SCHEMA", "pipeline_bench")
+
+
+def neo_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'nasa_id': [str(i) for i in range(rows)],
+        'asteroid_name': [f'({i} AB)' for i in range(rows)],
+        'closest_approach_time_to_earth_IST': pd.Timestamp('2025-01-01 10:15'),
+        'closest_approach_distance_km': rng.uniform(1e4, 2e6, rows).round(2),
+        'velocity_kmph': rng.uniform(1000, 120000, rows).round(2),
+        'diameter_min_m': rng.uniform(1, 300, rows).round(2),
+        'diameter_max_m': rng.uniform(1, 500, rows).round(2),
+        'nasa_site_url': 'https://ssd.jpl.nasa.gov/tools/sbdb_lookup.html',
+        'is_potentially_hazardous': rng.random(rows) < 0.1,
+        'velocity_category': rng.choice(['slow', 'moderate', 'fast'], rows),
+        'hazard_score': rng.random(rows).round(3),
+        'risk_level': rng.choice(['Low', 'Medium', 'High', 'Critical'], rows),
+        'is_deleted': False,
+        'processing_status': 'loaded to db',
+        'created_at': pd.Timestamp.now(),
+        'batch_id': 'bench',
+    })
+
+
+def weather_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    # '%' in column names, as in the weather table
+    frame = pd.DataFrame({
+        column: rng.uniform(-10, 120, rows).round(2)
+        for column in ['temperature_celcius', 'humidity_%', 'precipitation_%', 'cloud_cover_%', 'rain_mm',
+                       'showers_mm', 'snowfall_mm', 'wind_speed_kmph', 'visibility_m', 'surface_pressure_hpa']
+    })
+    frame.loc[::50, 'rain_mm'] = np.nan
+    frame.insert(0, 'city', [f'City{i % 500}' for i in range(rows)])
+    frame['weather_code'] = pd.array(rng.integers(0, 100, rows), dtype='Int64')
+    frame['weather_id'] = [f'W{i}' for i in range(rows)]
+    frame['created_at'] = pd.Timestamp.now()
+    frame['batch_id'] = 'bench'
+    return frame
+
+
+def _truncate(engine, table_name):
+    with engine.begin() as conn:
+        conn.execute(text(f'TRUNCATE "{BENCH_SCHEMA}"."{table_name}"'))
+
+
+def to_sql_multi(engine, df, table_name):
+    """The replaced path: one parameterized multi-row INSERT through pandas."""
+    df.to_sql(name=table_name, con=engine, schema=BENCH_SCHEMA, if_exists='append', index=False, method='multi')
+
+
+def copy_load(engine, df, table_name):
+    with engine.begin() as conn:
+        copy_frame(conn, df, BENCH_SCHEMA, table_name)
+
+
+def main(argv=None):
+    args = parse_sizes("Postgres load: to_sql(method='multi') vs COPY", [10_000, 50_000], argv)
+    engine = create_db_engine()
+    with engine.begin() as conn:
+        conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{BENCH_SCHEMA}"'))
+    try:
+        for name, build in (("neo", neo_frame), ("weather", weather_frame)):
+            for rows in args.sizes:
+                df = build(rows)
+                df.head(0).to_sql(name, engine, schema=BENCH_SCHEMA, if_exists='replace', index=False)
+                timings = {}
+                for label, load in (("to_sql multi", to_sql_multi), ("COPY", copy_load)):
+                    def setup():
+                        _truncate(engine, name)
+                        return engine, df, name
+                    timings[label] = best_time(load, args.repeat, setup)
+                old_s, new_s = timings["to_sql multi"], timings["COPY"]
+                print(
+                    f"{name:>7} {rows:>9,} rows  to_sql multi {rows / old_s:>9,.0f} rows/s  "
+                    f"COPY {rows / new_s:>9,.0f} rows/s  ({speedup(old_s, new_s)})"
+                )
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA IF EXISTS "{BENCH_SCHEMA}" CASCADE'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# DATABASE CONNECTION
+# One pooled engine per process for each distinct set of db_* settings, shared
+# by the loaders, the watermark, the hazard scaler state and the quarantine.
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL
+from sqlalchemy.pool import NullPool
+import os
+import threading
+
+from .settings import load_settings
+
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "300000"))  # 0 = no timeout
+# behind pgbouncer (transaction pooling): no client-side pool, no session-level settings
+PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() in ("1", "true", "yes")
+
+_ENGINES = {}
+_LOCK = threading.Lock()
+
+
+def _settings():
+    load_settings()
+    return (
+        os.getenv("db_user"),
+        os.getenv("db_password"),
+        os.getenv("db_host"),
+        os.getenv("db_port"),
+        os.getenv("db_name")
+    )
+
+
+def _build_engine(settings):
+    # --- Build the connection URL from the shared db_* settings ---
+    user, password, host, port, name = settings
+    connection_url = URL.create(
+        drivername="postgresql+psycopg2",
+        username=user,
+        password=password,
+        host=host,
+        port=port,
+        database=name
+    )
+
+    if PGBOUNCER:
+        # pgbouncer owns the pool; startup options would be rejected, so the
+        # timeout is set per transaction instead
+        engine = create_engine(connection_url, poolclass=NullPool)
+        if STATEMENT_TIMEOUT_MS:
+            @event.listens_for(engine, "begin")
+            def _statement_timeout(conn):
+                with conn.connection.driver_connection.cursor() as cursor:
+                    cursor.execute(f"SET LOCAL statement_timeout = {STATEMENT_TIMEOUT_MS}")
+        return engine
+
+    connect_args = {}
+    if STATEMENT_TIMEOUT_MS:
+        connect_args["options"] = f"-c statement_timeout={STATEMENT_TIMEOUT_MS}"
+    return create_engine(
+        connection_url,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_recycle=POOL_RECYCLE,
+        pool_pre_ping=True,
+        connect_args=connect_args
+    )
+
+
+def create_db_engine():
+    """Process-wide engine for the current db_* settings, built on first use."""
+    settings = _settings()
+    engine = _ENGINES.get(settings)
+    if engine is None:
+        with _LOCK:
+            engine = _ENGINES.get(settings)
+            if engine is None:
+                engine = _ENGINES[settings] = _build_engine(settings)
+    return engine
+
+
+def _reset_after_fork():
+    # a forked worker must not reuse the parent's sockets; keep the engines, drop their connections
+    for engine in _ENGINES.values():
+        engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
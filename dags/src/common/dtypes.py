@@ -0,0 +1,114 @@
+# DTYPE CONTRACT
+# Compact column types shared by both pipelines: categoricals for the
+# low-cardinality text columns and float32 where the cleaned precision fits.
+# Every stage re-applies its schema (cheap when already applied) and reports
+# memory; storage_frame() widens the frame again just before it is loaded.
+
+import numpy as np
+import pandas as pd
+
+NEO_SCHEMA = {
+    # column -> categories (None = inferred from the data)
+    "categorical": {
+        "velocity_category": ["slow", "moderate", "fast"],
+        "risk_level": ["Low", "Medium", "High", "Critical"],
+        "size_category": ["small", "medium", "large", "very_large"],
+        "processing_status": None,
+        "batch_id": None,
+    },
+    # column -> decimals kept when loading; distance and velocity stay float64
+    # (up to 1e8 km / 1e5 km/h at 2 decimals is beyond float32)
+    "float32": {
+        "diameter_min_m": 2,
+        "diameter_max_m": 2,
+        "hazard_score": 3,
+    },
+}
+
+WEATHER_SCHEMA = {
+    "categorical": {
+        "city": None,
+        "weather_type": None,
+        "extreme_weather_yn": None,
+        "processing_status": None,
+        "batch_id": None,
+    },
+    "float32": {
+        "temperature_celcius": 2,
+        "feels_like_temperature_celcius": 2,
+        "dew_temperature_celcius": 2,
+        "humidity_%": 0,
+        "vapour_pressure_deficit_kpa": 4,
+        "wind_speed_kmph": 2,
+        "precipitation_%": 0,
+        "precipitation_occured_mm": 2,
+        "rain_mm": 2,
+        "showers_mm": 2,
+        "snowfall_mm": 2,
+        "snow_depth_mm": 2,
+        "snowfall_water_equivalent_mm": 3,
+        "effective_precipitation_mm": 3,
+        "visibility_m": 2,
+        "cloud_cover_%": 0,
+        "mean_sea_level_pressure_hpa": 2,
+        "surface_pressure_hpa": 1,
+        "evapotranspiration_mm": 3,
+        "et0_fao_evapotranspiration_mm": 3,
+        "weather_code": 0,
+        "water_stress_index": 2,
+    },
+    # float32 columns holding whole-number codes, stored as integers
+    "integer": ["weather_code"],
+}
+
+# pd.cut produces ordered categoricals for these, keep them ordered
+_ORDERED = {"velocity_category", "risk_level", "size_category"}
+
+
+def category_dtype(column, categories):
+    if categories is None:
+        return "category"
+    return pd.CategoricalDtype(categories, ordered=column in _ORDERED)
+
+
+def apply_dtypes(df, schema):
+    """Cast the schema's columns present in df, in place; returns df."""
+    for column, categories in schema["categorical"].items():
+        if column in df.columns:
+            current = df[column].dtype
+            target = category_dtype(column, categories)
+            if isinstance(current, pd.CategoricalDtype) and (categories is None or current == target):
+                continue
+            df[column] = df[column].astype(target)
+    for column in schema["float32"]:
+        if column in df.columns and df[column].dtype != np.float32:
+            df[column] = df[column].astype(np.float32)
+    return df
+
+
+def code_lookup(codes, dtype):
+    """Categorical whose category is dtype.categories[code]; NaN/unknown codes -> NaN."""
+    codes = np.asarray(codes, dtype=np.float64)
+    known = (codes >= 0) & (codes < len(dtype.categories)) & (codes == np.floor(codes))
+    return pd.Categorical.from_codes(np.where(known, codes, -1).astype(np.int16), dtype=dtype)
+
+
+def storage_frame(df, schema):
+    """Shallow copy with categoricals as plain values, float32 as rounded float64 and codes as Int64."""
+    out = df.copy(deep=False)
+    for column in schema["categorical"]:
+        if column in out.columns and isinstance(out[column].dtype, pd.CategoricalDtype):
+            out[column] = out[column].astype(object)
+    for column, decimals in schema["float32"].items():
+        if column in out.columns and out[column].dtype == np.float32:
+            out[column] = out[column].astype(np.float64).round(decimals)
+    for column in schema.get("integer", ()):
+        if column in out.columns:
+            out[column] = out[column].round().astype("Int64")
+    return out
+
+
+def memory_report(df, stage, system):
+    size_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+    print(f"📦 {stage} frame: {len(df)} rows, {size_mb:.2f} MB for {system}")
+    return size_mb
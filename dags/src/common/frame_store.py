@@ -0,0 +1,96 @@
+# DATAFRAME PAYLOAD STORE
+# DataFrames passed between tasks are written as Arrow IPC files (zstd by
+# default) under XCOM_ARROW_PATH, a local directory shared by the workers or an
+# object-store URI (s3://, gs://). Only a short reference string goes through
+# XCom; local payloads are memory-mapped when read back.
+
+import os
+import re
+import time
+import uuid
+
+import pyarrow as pa
+import pyarrow.fs as pafs
+
+REFERENCE_PREFIX = "xcom-arrow://"
+STORE_PATH = os.getenv("XCOM_ARROW_PATH", "/opt/airflow/xcom")
+COMPRESSION = os.getenv("XCOM_ARROW_COMPRESSION", "zstd")  # zstd | lz4 | none (uncompressed maps zero-copy)
+TTL_HOURS = float(os.getenv("XCOM_ARROW_TTL_HOURS", "72"))
+
+_store = None
+
+
+def get_store():
+    """(filesystem, base path) for STORE_PATH; plain paths use the local filesystem."""
+    global _store
+    if _store is None:
+        if "://" in STORE_PATH:
+            _store = pafs.FileSystem.from_uri(STORE_PATH)
+        else:
+            _store = (pafs.LocalFileSystem(), os.path.abspath(STORE_PATH))
+    return _store
+
+
+def _safe(part):
+    return re.sub(r"[^A-Za-z0-9._-]", "_", str(part))
+
+
+def is_reference(value):
+    return isinstance(value, str) and value.startswith(REFERENCE_PREFIX)
+
+
+def write_frame(df, dag_id, run_id, task_id, key, map_index=None):
+    """Write df as one Arrow IPC file and return its reference."""
+    fs, base = get_store()
+    relative = "/".join([
+        _safe(dag_id), _safe(run_id), _safe(task_id),
+        f"{_safe(key)}-{-1 if map_index is None else map_index}-{uuid.uuid4().hex}.arrow"
+    ])
+    path = f"{base}/{relative}"
+    fs.create_dir(path.rsplit("/", 1)[0], recursive=True)
+
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    options = pa.ipc.IpcWriteOptions(compression=None if COMPRESSION == "none" else COMPRESSION)
+    with fs.open_output_stream(path) as sink:
+        with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+    return REFERENCE_PREFIX + relative
+
+
+def read_frame(reference):
+    fs, base = get_store()
+    path = f"{base}/{reference[len(REFERENCE_PREFIX):]}"
+    if isinstance(fs, pafs.LocalFileSystem):
+        source = pa.memory_map(path, "r")
+    else:
+        source = fs.open_input_file(path)
+    with source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas()
+
+
+def delete_frame(reference):
+    fs, base = get_store()
+    try:
+        fs.delete_file(f"{base}/{reference[len(REFERENCE_PREFIX):]}")
+    except FileNotFoundError:
+        pass
+
+
+def sweep_expired(ttl_hours=None):
+    """Delete payloads older than ttl_hours (XCOM_ARROW_TTL_HOURS by default); returns the count."""
+    ttl_hours = TTL_HOURS if ttl_hours is None else ttl_hours
+    fs, base = get_store()
+    cutoff_ns = time.time_ns() - int(ttl_hours * 3600 * 1e9)
+    try:
+        entries = fs.get_file_info(pafs.FileSelector(base, recursive=True))
+    except FileNotFoundError:
+        return 0
+
+    removed = 0
+    for entry in entries:
+        if entry.type == pafs.FileType.File and entry.path.endswith(".arrow") and entry.mtime_ns < cutoff_ns:
+            fs.delete_file(entry.path)
+            removed += 1
+    print(f"🧹 Removed {removed} expired XCom payload(s) older than {ttl_hours:g}h from {STORE_PATH}")
+    return removed
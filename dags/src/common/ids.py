@@ -0,0 +1,83 @@
+# ID GENERATION
+# ULID-style IDs (48-bit millisecond timestamp + 80-bit entropy, Crockford
+# base32, 26 chars) built for a whole column at once. IDs sort by creation time;
+# given a run key they are derived from row content, so a retried run reproduces
+# the same IDs.
+
+import hashlib
+import secrets
+import time
+
+import numpy as np
+import pandas as pd
+
+ID_LENGTH = 26
+_CROCKFORD = np.frombuffer(b"0123456789ABCDEFGHJKMNPQRSTVWXYZ", dtype=np.uint8)
+_MASK_16 = np.uint64(0xFFFF)
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _timestamp_ms(timestamp=None):
+    if timestamp is None:
+        return time.time_ns() // 1_000_000
+    # naive datetimes are taken as UTC, like Airflow's run_after
+    return int(pd.Timestamp(timestamp).timestamp() * 1000)
+
+
+def _hash_key(run_key):
+    # hash_pandas_object wants a 16-character key
+    return hashlib.blake2b(str(run_key).encode(), digest_size=8).hexdigest()
+
+
+def _encode(timestamp_ms, entropy_hi, entropy_lo):
+    """Crockford base32 of (48-bit time | 16-bit entropy_hi | 64-bit entropy_lo) per row."""
+    count = len(entropy_lo)
+    hi = (np.uint64(timestamp_ms) << np.uint64(16)) | (entropy_hi & _MASK_16)
+    lo = entropy_lo.astype(np.uint64, copy=False)
+
+    chars = np.empty((count, ID_LENGTH), dtype=np.uint8)
+    for position in range(ID_LENGTH):
+        shift = 5 * (ID_LENGTH - 1 - position)
+        if shift >= 64:
+            digit = hi >> np.uint64(shift - 64)
+        elif shift + 5 <= 64:
+            digit = lo >> np.uint64(shift)
+        else:  # 5-bit group straddles the two words
+            digit = (lo >> np.uint64(shift)) | (hi << np.uint64(64 - shift))
+        chars[:, position] = _CROCKFORD[digit & np.uint64(31)]
+    return chars.view(f"S{ID_LENGTH}").ravel().astype(f"U{ID_LENGTH}")
+
+
+def new_ids(count, timestamp=None):
+    """`count` time-sortable IDs: random base + row sequence, so never equal within a call."""
+    base_hi, base_lo = secrets.randbits(16), secrets.randbits(64)
+    lo = np.uint64(base_lo) + np.arange(count, dtype=np.uint64)  # wraps around like a counter
+    hi = np.full(count, base_hi, dtype=np.uint64) + (lo < np.uint64(base_lo))
+    return _encode(_timestamp_ms(timestamp), hi, lo)
+
+
+def content_ids(frame, run_key, timestamp=None):
+    """One ID per row of `frame`, deterministic in its content, run_key and timestamp."""
+    frame = pd.DataFrame(frame)
+    lo = pd.util.hash_pandas_object(frame, index=False, hash_key=_hash_key(run_key)).to_numpy()
+    # identical rows (or hash collisions) are told apart by their occurrence number
+    if pd.Series(lo).duplicated().any():
+        occurrence = pd.Series(lo).groupby(lo, sort=False).cumcount().to_numpy(dtype=np.uint64)
+        lo = lo + occurrence * _GOLDEN_GAMMA
+    # remaining 16 entropy bits: splitmix64 finalizer of the row hash
+    hi = (lo ^ (lo >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    hi = (hi ^ (hi >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return _encode(_timestamp_ms(timestamp), hi >> np.uint64(48), lo)
+
+
+def batch_id(run_key=None, timestamp=None):
+    if run_key is None:
+        return new_ids(1, timestamp)[0]
+    return content_ids(pd.DataFrame({"run_key": [str(run_key)]}), run_key, timestamp)[0]
+
+
+def row_ids(frame, run_key=None, timestamp=None):
+    """content_ids when a run key is given, new_ids otherwise."""
+    if run_key is None:
+        return new_ids(len(frame), timestamp)
+    return content_ids(frame, run_key, timestamp)
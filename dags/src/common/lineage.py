@@ -0,0 +1,40 @@
+# STAGE LINEAGE
+# Timing and row counts per pipeline stage, so a fused in-process run keeps the
+# per-step record that separate Airflow tasks would have given.
+
+import time
+from datetime import datetime, timezone
+
+
+def new_lineage(pipeline, run_key=None):
+    return {
+        "pipeline": pipeline,
+        "run_key": run_key,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "stages": []
+    }
+
+
+def _rows(value):
+    return len(value) if hasattr(value, "__len__") and not isinstance(value, (str, bool, dict)) else None
+
+
+def run_stage(lineage, stage, func, *args, **kwargs):
+    """Call func(*args, **kwargs) and append its timing and row counts to lineage."""
+    started = time.perf_counter()
+    output = func(*args, **kwargs)
+    seconds = time.perf_counter() - started
+    lineage["stages"].append({
+        "stage": stage,
+        "seconds": round(seconds, 4),
+        "rows_in": _rows(args[0]) if args else None,
+        "rows_out": _rows(output)
+    })
+    print(f"⏱️ {lineage['pipeline']} {stage}: {seconds:.3f}s")
+    return output
+
+
+def finish_lineage(lineage, **details):
+    lineage.update(details)
+    lineage["total_seconds"] = round(sum(stage["seconds"] for stage in lineage["stages"]), 4)
+    return lineage
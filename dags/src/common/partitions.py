@@ -0,0 +1,99 @@
+# MONTHLY PARTITIONS
+# The pipeline tables are range-partitioned by created_at month (see
+# src/migrations). Partitions are created on demand for the months a batch
+# touches and dropped by month for retention.
+
+from datetime import date
+
+import pandas as pd
+
+PARTITION_COLUMN = "created_at"
+
+# (schema, table, month) already present, per process
+_READY_PARTITIONS = set()
+
+
+def _quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def keys_table_name(table_name):
+    """Unpartitioned registry keeping the table's key unique across all partitions."""
+    return f"{table_name}_keys"
+
+
+def partition_name(table_name, month):
+    return f"{table_name}_p{month.year:04d}{month.month:02d}"
+
+
+def _next_month(month):
+    return date(month.year + (month.month == 12), month.month % 12 + 1, 1)
+
+
+def batch_months(created_at):
+    """Distinct first-of-month dates covered by a created_at column."""
+    periods = pd.Series(created_at).dropna().dt.to_period("M").unique()
+    return sorted(date(period.year, period.month, 1) for period in periods)
+
+
+def ensure_month_partitions(conn, schema_name, table_name, months):
+    """
+    Create the missing monthly partitions of schema_name.table_name. Run it in
+    its own transaction before the load: attaching a partition locks the parent.
+    """
+    months = [month for month in months if (schema_name, table_name, month) not in _READY_PARTITIONS]
+    if not months:
+        return
+    driver = conn.connection.driver_connection
+    with driver.cursor() as cursor:
+        # one creator at a time per table; the IF NOT EXISTS below then never races
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"{schema_name}.{table_name}",))
+        for month in months:
+            partition = f"{_quote(schema_name)}.{_quote(partition_name(table_name, month))}"
+            cursor.execute("SELECT to_regclass(%s)", (partition,))
+            if cursor.fetchone()[0] is None:
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {partition} PARTITION OF {_quote(schema_name)}.{_quote(table_name)} "
+                    f"FOR VALUES FROM (%s) TO (%s)",
+                    (month, _next_month(month))
+                )
+    _READY_PARTITIONS.update((schema_name, table_name, month) for month in months)
+
+
+def list_partitions(conn, schema_name, table_name):
+    """[(partition name, first-of-month date)] for the monthly partitions, oldest first."""
+    prefix = f"{table_name}_p"
+    with conn.connection.driver_connection.cursor() as cursor:
+        cursor.execute('''
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            JOIN pg_namespace ns ON ns.oid = parent.relnamespace
+            WHERE ns.nspname = %s AND parent.relname = %s
+        ''', (schema_name, table_name))
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = []
+    for name in names:
+        suffix = name[len(prefix):]
+        if name.startswith(prefix) and len(suffix) == 6 and suffix.isdigit():
+            partitions.append((name, date(int(suffix[:4]), int(suffix[4:]), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def drop_partitions_before(conn, schema_name, table_name, before, keys_table=None):
+    """Drop whole monthly partitions older than `before` (and their key registry rows). Returns dropped names."""
+    dropped = []
+    with conn.connection.driver_connection.cursor() as cursor:
+        for name, month in list_partitions(conn, schema_name, table_name):
+            if month >= before:
+                continue
+            if keys_table:
+                cursor.execute(
+                    f"DELETE FROM {_quote(schema_name)}.{_quote(keys_table)} "
+                    f"WHERE {_quote(PARTITION_COLUMN)} >= %s AND {_quote(PARTITION_COLUMN)} < %s",
+                    (month, _next_month(month))
+                )
+            cursor.execute(f"DROP TABLE {_quote(schema_name)}.{_quote(name)}")
+            _READY_PARTITIONS.discard((schema_name, table_name, month))
+            dropped.append(name)
+    return dropped
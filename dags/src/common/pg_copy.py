@@ -0,0 +1,134 @@
+# POSTGRES COPY
+# Streams a DataFrame into an existing table with COPY ... FROM STDIN through
+# psycopg2's copy_expert, one in-memory CSV buffer per chunk, instead of the
+# large parameterized INSERTs that to_sql(method='multi') builds. merge_frame
+# goes through a temporary staging table so duplicates are dropped server-side,
+# against a unique index or the key registry of a partitioned table;
+# revise_staged then updates the rows that were already there.
+
+import io
+import os
+
+from .partitions import PARTITION_COLUMN
+
+COPY_CHUNK_ROWS = int(os.getenv("PG_COPY_CHUNK_ROWS", "100000"))
+NULL_MARKER = r"\N"  # keeps empty strings distinct from NULL
+
+
+def _quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def copy_frame(conn, df, schema_name, table_name, chunk_rows=None):
+    """
+    COPY df into schema_name.table_name on an open SQLAlchemy connection, inside
+    the caller's transaction. Columns are matched by name. Returns the row count.
+    """
+    chunk_rows = chunk_rows or COPY_CHUNK_ROWS
+    columns = ", ".join(_quote(str(column)) for column in df.columns)
+    statement = (
+        f"COPY {_quote(schema_name)}.{_quote(table_name)} ({columns}) "
+        f"FROM STDIN WITH (FORMAT csv, NULL '{NULL_MARKER}')"
+    )
+
+    cursor = conn.connection.driver_connection.cursor()
+    try:
+        buffer = io.StringIO()
+        for start in range(0, len(df), chunk_rows):
+            buffer.seek(0)
+            buffer.truncate()
+            df.iloc[start:start + chunk_rows].to_csv(buffer, index=False, header=False, na_rep=NULL_MARKER)
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+    finally:
+        cursor.close()
+    return len(df)
+
+
+def _execute(conn, statement):
+    # straight to the driver cursor: no bind parameters, so a '%' in a column name stays literal
+    with conn.connection.driver_connection.cursor() as cursor:
+        cursor.execute(statement)
+        return cursor.rowcount
+
+
+def staging_table_name(table_name):
+    return f"{table_name}_staging"
+
+
+def _first_rows(staging, key, *order_by):
+    # one staged row per key: the first by order_by
+    order = ", ".join(_quote(column) for column in (key, *order_by))
+    return f"(SELECT DISTINCT ON ({_quote(key)}) * FROM {staging} ORDER BY {order})"
+
+
+def merge_frame(conn, df, schema_name, table_name, key, keys_table=None):
+    """
+    COPY df into a temporary staging table, then insert the rows whose key is new
+    into schema_name.table_name. Dedupe happens on the server, so its cost follows
+    the batch size, not the table size. Returns the number of rows inserted.
+
+    Without keys_table the target needs a unique index on key (ON CONFLICT DO
+    NOTHING). A partitioned target can only be unique per partition, so its keys
+    are claimed first in the unpartitioned keys_table (key PRIMARY KEY, created_at)
+    and only the claimed rows are inserted. A key repeated within df is inserted
+    once, from its row with the earliest created_at.
+    """
+    target = f"{_quote(schema_name)}.{_quote(table_name)}"
+    staging = staging_table_name(table_name)
+    columns = ", ".join(_quote(str(column)) for column in df.columns)
+
+    _execute(conn, f"CREATE TEMP TABLE {_quote(staging)} (LIKE {target} INCLUDING DEFAULTS) ON COMMIT DROP")
+    copy_frame(conn, df, "pg_temp", staging)
+
+    # rows are deduped by key here, so the insert cannot depend on the caller having done it
+    if keys_table is None:
+        return _execute(
+            conn,
+            f"INSERT INTO {target} ({columns}) SELECT {columns} "
+            f"FROM {_first_rows(f'pg_temp.{_quote(staging)}', key)} AS staged "
+            f"ON CONFLICT ({_quote(key)}) DO NOTHING"
+        )
+
+    staged_columns = ", ".join(f"staged.{_quote(str(column))}" for column in df.columns)
+    # the earliest created_at wins, so the claim and the inserted row agree on the partition
+    first_rows = _first_rows(f"pg_temp.{_quote(staging)}", key, PARTITION_COLUMN)
+    return _execute(
+        conn,
+        f"WITH claimed AS ("
+        f"INSERT INTO {_quote(schema_name)}.{_quote(keys_table)} ({_quote(key)}, {_quote(PARTITION_COLUMN)}) "
+        f"SELECT {_quote(key)}, {_quote(PARTITION_COLUMN)} FROM {first_rows} AS staged "
+        f"ON CONFLICT ({_quote(key)}) DO NOTHING RETURNING {_quote(key)}) "
+        f"INSERT INTO {target} ({columns}) SELECT {staged_columns} FROM {first_rows} AS staged "
+        f"JOIN claimed ON claimed.{_quote(key)} = staged.{_quote(key)}"
+    )
+
+
+def revise_staged(conn, schema_name, table_name, key, keys_table, match_column, since, columns, derived=()):
+    """
+    Run after merge_frame, in the same transaction, on its staging table. Rows
+    already in the table take the staged values of `columns` when the key and
+    the day of match_column agree, that day is on or after `since` (a date the
+    source may still revise) and one of `columns` changed. `derived` columns are
+    never compared, only recomputed with them: the staged values were derived
+    from the revised ones. Returns the number of rows updated.
+    """
+    target = f"{_quote(schema_name)}.{_quote(table_name)}"
+    staging = f"pg_temp.{_quote(staging_table_name(table_name))}"
+    first_rows = _first_rows(staging, key, PARTITION_COLUMN)
+    key, match = _quote(key), _quote(match_column)
+    quoted = [_quote(str(column)) for column in columns]
+    updated = quoted + [_quote(str(column)) for column in derived]
+    return _execute(
+        conn,
+        f"UPDATE {target} AS current SET {', '.join(f'{column} = staged.{column}' for column in updated)} "
+        f"FROM {first_rows} AS staged "
+        f"JOIN {_quote(schema_name)}.{_quote(keys_table)} AS claimed ON claimed.{key} = staged.{key} "
+        # the registry's created_at pins the partition holding the current row
+        f"WHERE current.{key} = staged.{key} "
+        f"AND current.{_quote(PARTITION_COLUMN)} = claimed.{_quote(PARTITION_COLUMN)} "
+        f"AND current.{match}::date = staged.{match}::date "
+        f"AND current.{match} >= DATE '{since.isoformat()}' "
+        f"AND ({', '.join(f'current.{column}' for column in quoted)}) "
+        f"IS DISTINCT FROM ({', '.join(f'staged.{column}' for column in quoted)})"
+    )
@@ -0,0 +1,76 @@
+# QUARANTINE
+# Rows that fail row-level validation rules are written to a quarantine table
+# with the names of the rules they broke; the remaining rows carry on to the
+# load and monitor steps in the same run. Frame-level failures (missing
+# columns, wrong dtypes) cannot be split by row and still halt the batch. The
+# quarantine tables come from the versioned migrations (src/migrations).
+
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import text
+
+from .db import create_db_engine
+from .dtypes import storage_frame
+from .pg_copy import copy_frame
+
+
+def split_failed_rows(df, report, masks):
+    """Returns (valid rows, failed rows with quarantine_reasons), or None when the batch cannot be split."""
+    failed = [result for result in report["rules"] if not result["passed"] and result["severity"] == "error"]
+    if any(result["rule"] not in masks for result in failed):
+        return None
+
+    bad = np.zeros(len(df), dtype=bool)
+    reasons = np.full(len(df), "", dtype=object)
+    for result in failed:
+        mask = masks[result["rule"]]
+        bad |= mask
+        reasons[mask] += result["rule"] + ";"
+
+    quarantined = df[bad].copy()
+    quarantined["quarantine_reasons"] = [reason.rstrip(";") for reason in reasons[bad]]
+    return df[~bad], quarantined
+
+
+def write_quarantine(rows, schema, schema_name, table_name):
+    """COPYs rows (as split by split_failed_rows) into schema_name.table_name in one transaction."""
+    rows = storage_frame(rows, schema)
+    rows["quarantined_at"] = datetime.now()
+    with create_db_engine().begin() as conn:
+        exists = conn.execute(text("SELECT to_regclass(:name)"), {'name': f'"{schema_name}"."{table_name}"'}).scalar()
+        if exists is None:
+            raise RuntimeError(f"Missing table {schema_name}.{table_name}, run `python -m src.migrations upgrade`")
+        copy_frame(conn, rows, schema_name, table_name)
+    return len(rows)
+
+
+def quarantine_failed_rows(df, report, masks, schema, schema_name, table_name, system):
+    """
+    Quarantine-and-continue: returns (rows safe to load, report). On success the
+    report is marked passed with a "quarantine" entry; if the batch cannot be
+    split, would be left empty, or the quarantine write fails, the report keeps
+    passed=False and the run halts as before.
+    """
+    if report["passed"]:
+        return df, report
+
+    split = split_failed_rows(df, report, masks)
+    if split is None:
+        print(f"❌ Validation failure is not row-level, halting the batch for {system}.")
+        return df, report
+    valid, quarantined = split
+    if valid.empty:
+        print(f"❌ Every row failed validation, halting the batch for {system}.")
+        return df, report
+
+    try:
+        count = write_quarantine(quarantined, schema, schema_name, table_name)
+    except Exception as e:  # SQLAlchemy or driver (COPY) errors, missing table
+        print(f"❌ Failed to write quarantined rows, halting the batch for {system}: {e}")
+        return df, report
+
+    report["passed"] = True
+    report["quarantine"] = {"schema": schema_name, "table": table_name, "rows": count}
+    print(f"🟡 {count} row(s) quarantined to {schema_name}.{table_name}; {len(valid)} row(s) continue for {system}.")
+    return valid, report
@@ -0,0 +1,182 @@
+# API RATE LIMITER
+# Token bucket shared by every Celery worker through Redis (in-memory when no
+# Redis is configured or it cannot be reached), adapted to the quota the API
+# reports back.
+
+import math
+import os
+import threading
+import time
+
+from .settings import load_settings
+
+# Refill the bucket from Redis server time so every worker sees the same clock.
+# Returns the seconds to wait before the tokens are available (0 = granted).
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local refill_per_s = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill_per_s)
+local remaining = tonumber(redis.call('GET', KEYS[2]))
+if remaining then
+    tokens = math.min(tokens, remaining)
+end
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+    if remaining then
+        redis.call('DECRBY', KEYS[2], requested)
+    end
+else
+    wait = (requested - tokens) / refill_per_s
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 3600)
+return tostring(wait)
+"""
+
+
+class InMemoryTokenBucket:
+    """Per-process bucket with the same interface as RedisTokenBucket (local runs and tests)."""
+
+    def __init__(self, name, capacity, refill_per_s):
+        self.name = name
+        self.capacity = capacity
+        self.refill_per_s = refill_per_s
+        self._tokens = float(capacity)
+        self._ts = time.monotonic()
+        self._quota = None  # (remaining, limit) last reported by the API
+        self._lock = threading.Lock()
+
+    def _try_acquire(self, tokens):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._ts) * self.refill_per_s)
+            self._ts = now
+            if self._quota is not None:
+                self._tokens = min(self._tokens, self._quota[0])
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                if self._quota is not None:
+                    self._quota = (self._quota[0] - tokens, self._quota[1])
+                return 0.0
+            return (tokens - self._tokens) / self.refill_per_s
+
+    def _store_quota(self, remaining, limit):
+        with self._lock:
+            self._quota = (remaining, limit)
+
+    def quota(self):
+        with self._lock:
+            return self._quota
+
+    def acquire(self, tokens=1, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise TimeoutError(f"Rate limit '{self.name}': no token available within {timeout}s")
+            time.sleep(min(wait, 5))
+
+    def observe(self, headers):
+        # X-RateLimit-Remaining / X-RateLimit-Limit as returned by api.nasa.gov
+        remaining = headers.get("X-RateLimit-Remaining")
+        limit = headers.get("X-RateLimit-Limit")
+        if remaining is None:
+            return
+        self._store_quota(int(remaining), int(limit) if limit else None)
+
+    def recommended_concurrency(self, max_workers):
+        quota = self.quota()
+        if quota is None or not quota[1]:
+            return max_workers
+        remaining, limit = quota
+        if remaining <= 0:
+            return 1
+        # scale the pool with the share of the hourly quota still left
+        return max(1, min(max_workers, math.ceil(max_workers * remaining / limit)))
+
+
+class RedisTokenBucket(InMemoryTokenBucket):
+    """
+    Bucket state lives in Redis, so all workers draw from one quota. While Redis
+    cannot be reached the inherited per-process bucket stands in (with a warning),
+    and Redis is tried again after REDIS_RETRY_AFTER_S.
+    """
+
+    REDIS_RETRY_AFTER_S = 60
+
+    def __init__(self, name, capacity, refill_per_s, client):
+        super().__init__(name, capacity, refill_per_s)
+        self.client = client
+        self._bucket_key = f"rate_limit:{name}:bucket"
+        self._remaining_key = f"rate_limit:{name}:remaining"
+        self._limit_key = f"rate_limit:{name}:limit"
+        self._script = client.register_script(_TOKEN_BUCKET_LUA)
+        self._redis_down_until = 0.0
+
+    def _redis(self, call, fallback):
+        if time.monotonic() < self._redis_down_until:
+            return fallback()
+        from redis.exceptions import ConnectionError, TimeoutError
+        try:
+            return call()
+        except (ConnectionError, TimeoutError) as e:
+            self._redis_down_until = time.monotonic() + self.REDIS_RETRY_AFTER_S
+            print(f"🟡 Rate limit '{self.name}': Redis unavailable ({e.__class__.__name__}), per-process bucket for {self.REDIS_RETRY_AFTER_S}s")
+            return fallback()
+
+    def _try_acquire(self, tokens):
+        def redis_acquire():
+            wait = self._script(
+                keys=[self._bucket_key, self._remaining_key],
+                args=[self.capacity, self.refill_per_s, tokens]
+            )
+            return float(wait)
+        return self._redis(redis_acquire, lambda: super(RedisTokenBucket, self)._try_acquire(tokens))
+
+    def _store_quota(self, remaining, limit):
+        def redis_store():
+            pipe = self.client.pipeline()
+            pipe.set(self._remaining_key, remaining, ex=3600)
+            if limit:
+                pipe.set(self._limit_key, limit, ex=3600)
+            pipe.execute()
+        # the local copy keeps the fallback bucket clamped too
+        super()._store_quota(remaining, limit)
+        self._redis(redis_store, lambda: None)
+
+    def quota(self):
+        def redis_quota():
+            remaining, limit = self.client.mget(self._remaining_key, self._limit_key)
+            if remaining is None:
+                return None
+            return int(remaining), int(limit) if limit else None
+        return self._redis(redis_quota, lambda: super(RedisTokenBucket, self).quota())
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name, requests_per_hour, burst):
+    """Shared bucket for `name`: Redis-backed when RATE_LIMIT_REDIS_URL is set, in-memory otherwise."""
+    with _limiters_lock:
+        if name not in _limiters:
+            refill_per_s = requests_per_hour / 3600
+            load_settings()
+            redis_url = os.getenv("RATE_LIMIT_REDIS_URL")
+            if redis_url:
+                import redis
+                client = redis.Redis.from_url(redis_url, socket_connect_timeout=2, socket_timeout=5)
+                _limiters[name] = RedisTokenBucket(name, burst, refill_per_s, client)
+            else:
+                _limiters[name] = InMemoryTokenBucket(name, burst, refill_per_s)
+        return _limiters[name]
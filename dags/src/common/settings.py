@@ -0,0 +1,24 @@
+# SETTINGS
+# The .env file is loaded once per process on first use, by the functions that
+# read settings (connection, schema and table names, API keys, mail), never at
+# import: DAG parsing and task module imports leave os.environ untouched.
+# Module-level tuning constants (pool sizes, timeouts, paths) are read from the
+# process environment at import; docker-compose passes .env to it (env_file).
+
+import threading
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_settings():
+    """Load .env into os.environ once (variables already set win)."""
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _loaded = True
+
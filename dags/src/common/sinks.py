@@ -0,0 +1,341 @@
+# LOAD SINKS
+# One load path for both pipelines. A load target names the key column, the
+# schema/table and the audit table; the configured sinks (SPACE_ALERT_SINKS /
+# WEATHER_ALERT_SINKS, comma separated) receive the same storage frame in
+# parallel and each reports its rows/s:
+#   postgres  COPY + server-side dedupe into the migrated, partitioned table
+#   parquet   date-partitioned dataset (created_date=YYYY-MM-DD) for cheap history
+#   sqlite    local file, for running the pipeline without a database server
+# The first sink is the primary one: its commit decides whether the batch counts
+# as loaded (watermark, load alert) and its inserted count goes into the load
+# result. A failed secondary sink is reported but does not fail the load.
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from .db import create_db_engine
+from .dtypes import storage_frame
+from .partitions import PARTITION_COLUMN, batch_months, ensure_month_partitions, keys_table_name
+from .pg_copy import merge_frame, revise_staged
+from .settings import load_settings
+
+DEFAULT_SINKS = "postgres"
+PARQUET_SINK_PATH = os.getenv("PARQUET_SINK_PATH", "/opt/airflow/data/parquet")
+PARQUET_COMPRESSION = os.getenv("PARQUET_SINK_COMPRESSION", "zstd")
+SQLITE_SINK_PATH = os.getenv("SQLITE_SINK_PATH", "/opt/airflow/data/pipeline_sink.sqlite")
+LOADED_STATUS = "loaded to db"
+
+
+def load_target(env_prefix, key, dtypes, system, sinks_env, revision=None):
+    """
+    Where and how one pipeline loads: env_prefix is 'nasa' or 'weather'
+    (<prefix>_schema_name, ...). revision, when given, lets a batch update rows
+    already loaded: {"match_column": ..., "columns": [...], "derived": [...],
+    "since": date}, see pg_copy.revise_staged.
+    """
+    load_settings()
+    return {
+        "revision": revision,
+        "system": system,
+        "sinks_env": sinks_env,
+        "key": key,
+        "dtypes": dtypes,
+        "schema_name": os.getenv(f"{env_prefix}_schema_name"),
+        "table_name": os.getenv(f"{env_prefix}_table_name"),
+        "audit_table": os.getenv(f"{env_prefix}_audit_table"),
+    }
+
+
+class PostgresSink:
+    """COPY into the migrated, month-partitioned table; keys claimed in <table>_keys, audit row in the same transaction."""
+
+    name = "postgres"
+
+    # (schema, table, audit table) already checked by this process
+    _ready_tables = set()
+
+    def __init__(self, target):
+        self.target = target
+
+    def ensure_tables(self, engine):
+        # the tables come from the versioned migrations (src/migrations); only check they are there
+        schema_name, table_name, audit_table = (self.target[k] for k in ("schema_name", "table_name", "audit_table"))
+        if (schema_name, table_name, audit_table) in self._ready_tables:
+            return
+        with engine.connect() as conn:
+            missing = [
+                name for name in (table_name, keys_table_name(table_name), audit_table)
+                if conn.execute(text("SELECT to_regclass(:name)"), {'name': f'"{schema_name}"."{name}"'}).scalar() is None
+            ]
+        if missing:
+            raise RuntimeError(f"Missing tables {missing} in schema {schema_name}, run `python -m src.migrations upgrade`")
+        self._ready_tables.add((schema_name, table_name, audit_table))
+
+    def write(self, df, batch_id):
+        schema_name, table_name, audit_table = (self.target[k] for k in ("schema_name", "table_name", "audit_table"))
+        engine = create_db_engine()
+
+        # --- Tables exist (checked once per process), partitions for this batch's months ---
+        self.ensure_tables(engine)
+        with engine.begin() as conn:
+            ensure_month_partitions(conn, schema_name, table_name, batch_months(df[PARTITION_COLUMN]))
+
+        # --- One transaction: insert with the final status, then the audit row ---
+        now = datetime.now()
+        with engine.begin() as conn:
+            record_count = merge_frame(
+                conn, df, schema_name, table_name, self.target["key"], keys_table=keys_table_name(table_name)
+            )
+            revision = self.target.get("revision")
+            if revision:
+                revised = revise_staged(
+                    conn, schema_name, table_name, self.target["key"], keys_table_name(table_name),
+                    revision["match_column"], revision["since"], revision["columns"], revision.get("derived", ())
+                )
+                print(f"🔁 postgres sink: {revised} already loaded row(s) revised for {self.target['system']}")
+            if record_count:
+                conn.execute(text(f'''
+                    INSERT INTO "{schema_name}"."{audit_table}" (batch_id, date, time, record_count)
+                    VALUES (:batch_id, :date, :time, :record_count)
+                    ON CONFLICT (batch_id) DO NOTHING
+                '''), {
+                    'batch_id': batch_id,
+                    'date': now.date(),
+                    'time': now.time(),
+                    'record_count': record_count
+                })
+        return record_count
+
+
+class SQLiteSink:
+    """
+    Same contract as PostgresSink in a local SQLite file: tables created from the
+    frame on first use, a unique index on the key, INSERT OR IGNORE through a
+    staging table and the audit row in the same transaction. schema_name is not
+    used, SQLite has a single namespace per file.
+    """
+
+    name = "sqlite"
+
+    _engines = {}
+    _lock = threading.Lock()
+
+    def __init__(self, target, path=None):
+        self.target = target
+        self.path = path or SQLITE_SINK_PATH
+
+    def engine(self):
+        with self._lock:
+            if self.path not in self._engines:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                # waits on the file lock when parallel tasks load into the same file
+                self._engines[self.path] = create_engine(f"sqlite:///{self.path}", connect_args={"timeout": 60})
+            return self._engines[self.path]
+
+    def write(self, df, batch_id):
+        table_name, audit_table, key = (self.target[k] for k in ("table_name", "audit_table", "key"))
+        staging = f"{table_name}_staging"
+        columns = ", ".join(f'"{column}"' for column in df.columns)
+
+        now = datetime.now()
+        with self.engine().begin() as conn:
+            df.head(0).to_sql(table_name, conn, if_exists='append', index=False)
+            conn.execute(text(f'CREATE UNIQUE INDEX IF NOT EXISTS "{table_name}_{key}_key" ON "{table_name}" ("{key}")'))
+            conn.execute(text(f'''
+                CREATE TABLE IF NOT EXISTS "{audit_table}" (
+                    batch_id TEXT PRIMARY KEY,
+                    date TEXT NOT NULL,
+                    time TEXT NOT NULL,
+                    record_count INTEGER NOT NULL
+                )
+            '''))
+
+            df.to_sql(staging, conn, if_exists='replace', index=False, chunksize=10000)
+            record_count = conn.execute(text(
+                f'INSERT OR IGNORE INTO "{table_name}" ({columns}) SELECT {columns} FROM "{staging}"'
+            )).rowcount
+            revision = self.target.get("revision")
+            if revision:
+                revised = self._revise(conn, staging, revision)
+                print(f"🔁 sqlite sink: {revised} already loaded row(s) revised for {self.target['system']}")
+            conn.execute(text(f'DROP TABLE "{staging}"'))
+
+            if record_count:
+                conn.execute(text(f'''
+                    INSERT OR IGNORE INTO "{audit_table}" (batch_id, date, time, record_count)
+                    VALUES (:batch_id, :date, :time, :record_count)
+                '''), {
+                    'batch_id': batch_id,
+                    'date': now.date().isoformat(),
+                    'time': now.time().isoformat(),
+                    'record_count': record_count
+                })
+        return record_count
+
+    def _revise(self, conn, staging, revision):
+        # same rule as pg_copy.revise_staged; timestamps are ISO text here
+        table_name, key, match = self.target["table_name"], self.target["key"], revision["match_column"]
+        quoted = [f'"{column}"' for column in revision["columns"]]
+        updated = quoted + [f'"{column}"' for column in revision.get("derived", ())]
+        return conn.execute(text(
+            f'UPDATE "{table_name}" AS current SET {", ".join(f"{column} = staged.{column}" for column in updated)} '
+            f'FROM "{staging}" AS staged '
+            f'WHERE current."{key}" = staged."{key}" '
+            f'AND date(current."{match}") = date(staged."{match}") '
+            f'AND date(current."{match}") >= :since '
+            f'AND ({", ".join(f"current.{column}" for column in quoted)}) '
+            f'IS NOT ({", ".join(f"staged.{column}" for column in quoted)})'
+        ), {"since": revision["since"].isoformat()}).rowcount
+
+
+class ParquetSink:
+    """
+    Append-only history as a hive-style dataset,
+    <PARQUET_SINK_PATH>/<schema>/<table>/created_date=YYYY-MM-DD/<batch_id>.parquet,
+    local or an object-store URI (s3://, gs://). Keys are unique within a batch;
+    there is no lookup against earlier batches, so a key seen again later is kept
+    as a new snapshot. One file per batch and day makes a retried batch overwrite
+    its own files; the audit row goes to <audit_table>/<batch_id>.parquet.
+    """
+
+    name = "parquet"
+
+    def __init__(self, target, path=None):
+        self.target = target
+        self.path = path or PARQUET_SINK_PATH
+
+    def filesystem(self):
+        # pyarrow is only imported by this sink, a postgres-only load never pays for it
+        import pyarrow.fs as pafs
+        if "://" in self.path:
+            return pafs.FileSystem.from_uri(self.path)
+        return pafs.LocalFileSystem(), os.path.abspath(self.path)
+
+    def _write_file(self, fs, path, table):
+        import pyarrow.parquet as pq
+        fs.create_dir(path.rsplit("/", 1)[0], recursive=True)
+        # written aside and moved, readers never see a half-written file
+        partial = f"{path}.partial"
+        pq.write_table(table, partial, filesystem=fs, compression=PARQUET_COMPRESSION)
+        fs.move(partial, path)
+
+    def write(self, df, batch_id):
+        import pyarrow as pa
+        fs, base = self.filesystem()
+        root = f"{base}/{self.target['schema_name']}"
+        df = df.drop_duplicates(subset=self.target["key"])
+
+        created_date = pd.to_datetime(df[PARTITION_COLUMN]).dt.date
+        for day, rows in df.groupby(created_date, sort=True):
+            table = pa.Table.from_pandas(rows, preserve_index=False)
+            self._write_file(fs, f"{root}/{self.target['table_name']}/created_date={day}/{batch_id}.parquet", table)
+
+        if len(df):
+            now = datetime.now()
+            audit = pa.table({
+                "batch_id": [batch_id],
+                "date": [now.date()],
+                "time": [now.time()],
+                "record_count": pa.array([len(df)], pa.int32()),
+            })
+            self._write_file(fs, f"{root}/{self.target['audit_table']}/{batch_id}.parquet", audit)
+        return len(df)
+
+
+SINK_TYPES = {
+    PostgresSink.name: PostgresSink,
+    ParquetSink.name: ParquetSink,
+    SQLiteSink.name: SQLiteSink,
+}
+
+
+def configured_sinks(env_var, target):
+    """Sinks listed in env_var (comma separated, first = primary); postgres when unset."""
+    load_settings()
+    names = [name.strip().lower() for name in os.getenv(env_var, DEFAULT_SINKS).split(",") if name.strip()]
+    unknown = [name for name in names if name not in SINK_TYPES]
+    if unknown or not names:
+        raise ValueError(f"{env_var}={os.getenv(env_var)!r}: unknown sinks {unknown}, expected some of {list(SINK_TYPES)}")
+    return [SINK_TYPES[name](target) for name in dict.fromkeys(names)]
+
+
+def _timed_write(sink, df, batch_id):
+    start = time.perf_counter()
+    record_count = sink.write(df, batch_id)
+    seconds = time.perf_counter() - start
+    return {"rows": record_count, "seconds": seconds, "rows_per_sec": len(df) / seconds if seconds else 0.0}
+
+
+def write_to_sinks(df, sinks, batch_id, system):
+    """
+    Write df to every sink in parallel. Returns {sink name: stats}; the sinks are
+    independent, so a failed sink's entry holds its {"error": ...} instead.
+    """
+    with ThreadPoolExecutor(max_workers=len(sinks)) as pool:
+        futures = {sink.name: pool.submit(_timed_write, sink, df, batch_id) for sink in sinks}
+
+    results = {}
+    for name, future in futures.items():
+        try:
+            stats = results[name] = future.result()
+        except Exception as e:
+            results[name] = {"error": f"{e.__class__.__name__}: {e}"}
+            print(f"❌ {name} sink failed for {system}: {e}")
+            continue
+        print(
+            f"⏱️ {name} sink: {stats['rows']} new of {len(df)} rows in {stats['seconds']:.2f}s "
+            f"({stats['rows_per_sec']:,.0f} rows/s) for {system}"
+        )
+    return results
+
+
+def load_dataframe(df, target, sinks=None):
+    """
+    Load one batch into every sink (default: the ones configured for the target).
+    Returns [True, schema, table, batch_id, count] with the primary sink's inserted
+    count, [True] when it inserted nothing new and [False] when the primary sink
+    failed. Secondary sinks that failed after the primary committed are appended
+    as a list of names: [True, schema, table, batch_id, count, failed_sinks].
+    """
+    schema_name, table_name, system = target["schema_name"], target["table_name"], target["system"]
+    try:
+        sinks = sinks or configured_sinks(target["sinks_env"], target)
+
+        # --- Extract batch_id from DataFrame ---
+        batch_ids = df['batch_id'].unique()
+        if len(batch_ids) != 1:
+            raise ValueError("DataFrame must contain exactly one unique batch_id for this operation.")
+        batch_id = batch_ids[0]
+
+        # --- Widen the compact in-memory dtypes once, shared read-only by the sinks ---
+        df = storage_frame(df, target["dtypes"]).assign(processing_status=LOADED_STATUS)
+
+        results = write_to_sinks(df, sinks, batch_id, system)
+        primary = sinks[0].name
+        if "error" in results[primary]:
+            raise RuntimeError(f"primary {primary} sink failed: {results[primary]['error']}")
+        failed_sinks = [name for name, stats in results.items() if "error" in stats]
+        if failed_sinks:
+            print(f"🟡 Secondary sinks {failed_sinks} failed for {system}; the {primary} load is committed and counts")
+        record_count = results[primary]["rows"]
+
+        if record_count == 0:
+            print(f"🟡 No new records to insert. All {target['key']} values already exist.")
+            return [True]
+
+        print(f"✅ Data loaded and 'processing_status' updated in {schema_name}.{table_name} for batch_id={batch_id} for {system}")
+        print(f"✅ Audit trail updated in schema: '{schema_name}', table: '{target['audit_table']}' for batch_id={batch_id} with record count: {record_count} for {system}")
+
+        output = [True, schema_name, table_name, batch_id, record_count]
+        return (output + [failed_sinks]) if failed_sinks else output
+
+    except Exception as e:
+        print(f"❌ Failed to load data: {e}")
+        return [False]
@@ -0,0 +1,94 @@
+# STARTUP PROFILER
+# Measures DAG parse time and task cold-start (first import of every task module)
+# in fresh interpreters, breaks it down per imported module with -X importtime and
+# exits non-zero when a target is over budget.
+#
+#   cd dags && python -m src.common.startup_profiler
+#
+# Budgets (ms): DAG_PARSE_BUDGET_MS, TASK_STARTUP_BUDGET_MS
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+DAGS_FOLDER = Path(__file__).resolve().parents[2]
+DAG_PARSE_BUDGET_MS = float(os.getenv("DAG_PARSE_BUDGET_MS", "1500"))
+TASK_STARTUP_BUDGET_MS = float(os.getenv("TASK_STARTUP_BUDGET_MS", "3000"))
+TOP_MODULES = 8
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def dag_files():
+    return sorted(DAGS_FOLDER.glob("*_dag.py"))
+
+
+def task_modules():
+    modules = []
+    for package in ("space_alert", "weather_alert"):
+        for path in sorted((DAGS_FOLDER / "src" / package).glob("*.py")):
+            if path.stem != "__init__":
+                modules.append(f"src.{package}.{path.stem}")
+    return modules
+
+
+def profile(statement):
+    """Run `statement` in a fresh interpreter; returns wall ms and per-module self-time ms."""
+    code = (
+        "import time; _started = time.perf_counter()\n"
+        f"{statement}\n"
+        "print('__elapsed_ms__', (time.perf_counter() - _started) * 1000)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=DAGS_FOLDER, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"{statement!r} failed: {errors[-1] if errors else result.returncode}")
+
+    elapsed_ms = float(result.stdout.rsplit("__elapsed_ms__", 1)[1])
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(1)) / 1000
+    return elapsed_ms, modules
+
+
+def main():
+    targets = [
+        (f"DAG parse {path.name}", f"import runpy; runpy.run_path({str(path)!r})", DAG_PARSE_BUDGET_MS)
+        for path in dag_files()
+    ] + [
+        (f"task import {module}", f"import {module}", TASK_STARTUP_BUDGET_MS)
+        for module in task_modules()
+    ]
+
+    over_budget = []
+    for name, statement, budget_ms in targets:
+        try:
+            elapsed_ms, modules = profile(statement)
+        except RuntimeError as e:
+            print(f"❌ {name}: {e}")
+            over_budget.append(name)
+            continue
+
+        status = "✅" if elapsed_ms <= budget_ms else "❌"
+        print(f"{status} {name}: {elapsed_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+        for module, self_ms in sorted(modules.items(), key=lambda item: -item[1])[:TOP_MODULES]:
+            print(f"      {self_ms:8.1f} ms  {module}")
+        if elapsed_ms > budget_ms:
+            over_budget.append(name)
+
+    if over_budget:
+        print(f"❌ Startup budget exceeded: {', '.join(over_budget)}")
+        return 1
+    print("✅ DAG parse and task cold-start within budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+# VALIDATION ENGINE
+# Rule specs (plain dicts, shared by both pipelines) are compiled once into
+# vectorized checks: dtype-level checks look at column dtypes, mask-level checks
+# build one boolean "failing rows" mask per rule. Running them returns a report
+# with the failing row index labels and timing per rule.
+#
+# Rule types:
+#   columns     {"columns": [...]}                         all columns present
+#   dtype       {"column", "kind": string|float|number|datetime|bool}
+#   unique      {"column"}                                 duplicates fail (every copy)
+#   range       {"column", "min", "max", "min_inclusive", "max_inclusive"}
+#   compare     {"left", "op", "right"}                    rows where left <op> right is false fail
+#   allowed     {"column", "values": [...]}
+#   implies     {"when": [(column, op, value), ...], "then": flag_column}  any condition needs the flag
+#   not_future  {"column"}
+# Every rule has a "name" and an optional "severity" ("error" by default; "warn"
+# is reported but does not fail the batch). NaN never fails a comparison rule.
+
+import operator
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+MAX_REPORTED_ROWS = int(os.getenv("VALIDATION_MAX_REPORTED_ROWS", "1000"))
+
+_OPS = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt,
+    ">=": operator.ge, "==": operator.eq, "!=": operator.ne
+}
+_NEGATED = {"<": ">=", "<=": ">", ">": "<=", ">=": "<", "==": "!=", "!=": "=="}
+
+
+class _Columns:
+    """Column access shared by all rules of one run, each column fetched once."""
+
+    def __init__(self, df):
+        self.df = df
+        self._series = {}
+        self._arrays = {}
+
+    def series(self, column):
+        if column not in self._series:
+            self._series[column] = self.df[column]
+        return self._series[column]
+
+    def array(self, column):
+        if column not in self._arrays:
+            self._arrays[column] = self.series(column).to_numpy()
+        return self._arrays[column]
+
+
+def _is_string_column(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return pd.api.types.infer_dtype(series.cat.categories, skipna=False) == "string" and not series.isna().any()
+    return pd.api.types.infer_dtype(series, skipna=False) == "string"
+
+
+_DTYPE_KINDS = {
+    "string": _is_string_column,
+    "float": lambda series: pd.api.types.is_float_dtype(series.dtype),
+    "number": lambda series: pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype),
+    "datetime": lambda series: pd.api.types.is_datetime64_any_dtype(series.dtype),
+    "bool": lambda series: pd.api.types.is_bool_dtype(series.dtype),
+}
+
+
+def _compile(rule):
+    """Returns check(columns) -> failing-row mask, or a message for frame-level failures (None = ok)."""
+    kind = rule["type"]
+
+    if kind == "columns":
+        def check(cols):
+            missing = [column for column in rule["columns"] if column not in cols.df.columns]
+            return f"Missing columns: {missing}" if missing else None
+
+    elif kind == "dtype":
+        is_kind = _DTYPE_KINDS[rule["kind"]]
+
+        def check(cols):
+            series = cols.series(rule["column"])
+            return None if is_kind(series) else f"Column {rule['column']} has dtype {series.dtype}, expected {rule['kind']}"
+
+    elif kind == "unique":
+        def check(cols):
+            series = cols.series(rule["column"])
+            # is_unique is one hash pass; only build the row mask when there is something to report
+            return None if series.is_unique else series.duplicated(keep=False).to_numpy()
+
+    elif kind == "range":
+        low, high = rule.get("min"), rule.get("max")
+        below = operator.lt if rule.get("min_inclusive", True) else operator.le
+        above = operator.gt if rule.get("max_inclusive", True) else operator.ge
+
+        def check(cols):
+            values = cols.array(rule["column"])
+            mask = np.zeros(len(values), dtype=bool)
+            if low is not None:
+                mask |= below(values, low)
+            if high is not None:
+                mask |= above(values, high)
+            return mask
+
+    elif kind == "compare":
+        fails = _OPS[_NEGATED[rule["op"]]]
+
+        def check(cols):
+            return fails(cols.array(rule["left"]), cols.array(rule["right"]))
+
+    elif kind == "allowed":
+        def check(cols):
+            return ~cols.series(rule["column"]).isin(rule["values"]).to_numpy()
+
+    elif kind == "implies":
+        def check(cols):
+            condition = np.zeros(len(cols.df), dtype=bool)
+            for column, op, value in rule["when"]:
+                condition |= _OPS[op](cols.array(column), value)
+            return condition & ~cols.array(rule["then"]).astype(bool)
+
+    elif kind == "not_future":
+        def check(cols):
+            return (cols.series(rule["column"]) > datetime.now()).to_numpy()
+
+    else:
+        raise ValueError(f"Unknown validation rule type {kind!r} in rule {rule.get('name')!r}")
+
+    return check
+
+
+def compile_rules(rules):
+    return [(rule, _compile(rule)) for rule in rules]
+
+
+def run_validation(df, compiled_rules, system, masks=None):
+    """Pass a dict as masks to get the full failing-row mask of every failed row-level rule."""
+    cols = _Columns(df)
+    results = []
+    started = time.perf_counter()
+
+    for rule, check in compiled_rules:
+        rule_started = time.perf_counter()
+        failed_count, failed_rows, message = 0, [], None
+        try:
+            with np.errstate(invalid="ignore"):
+                outcome = check(cols)
+        except KeyError as e:
+            outcome = f"Column {e} missing"
+
+        # frame-level failures (missing columns, wrong dtype) count against every row
+        if isinstance(outcome, str):
+            failed_count, message = len(df), f"{rule['name']}: {outcome}"
+        elif outcome is not None:
+            mask = np.asarray(outcome, dtype=bool)
+            failed_count = int(mask.sum())
+            if failed_count:
+                failed_rows = df.index[mask][:MAX_REPORTED_ROWS].tolist()
+                message = f"{rule['name']}: {failed_count} row(s)"
+                if masks is not None:
+                    masks[rule["name"]] = mask
+        results.append({
+            "rule": rule["name"],
+            "severity": rule.get("severity", "error"),
+            "passed": message is None,
+            "failed_count": failed_count,
+            "failed_rows": failed_rows,
+            "message": message,
+            "seconds": round(time.perf_counter() - rule_started, 6)
+        })
+
+    passed = all(result["passed"] for result in results if result["severity"] == "error")
+    report = {
+        "passed": passed,
+        "rows": len(df),
+        "seconds": round(time.perf_counter() - started, 6),
+        "rules": results
+    }
+
+    errors = [result for result in results if not result["passed"] and result["severity"] == "error"]
+    warnings = [result for result in results if not result["passed"] and result["severity"] != "error"]
+    if errors:
+        print(f"❌ Validation FAILED with the following issues for {system}:")
+        for result in errors:
+            print("-", result["message"], f"(rows: {result['failed_rows'][:10]})" if result["failed_rows"] else "")
+    for result in warnings:
+        print("🟡 Validation warning:", result["message"])
+    if passed:
+        print(f"✅ Validation PASSED. Data is ready for downstream for {system}.")
+    print(f"⏱️ {len(results)} validation rules over {len(df)} rows in {report['seconds']:.4f}s")
+    return report
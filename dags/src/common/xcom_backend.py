@@ -0,0 +1,39 @@
+# ARROW XCOM BACKEND
+# Set as [core] xcom_backend. DataFrames are stored out of band through
+# frame_store; every other value goes to the metadata DB as before.
+
+import json
+
+from airflow.sdk.bases.xcom import BaseXCom
+from .frame_store import is_reference, write_frame, read_frame, delete_frame
+
+
+class ArrowXComBackend(BaseXCom):
+
+    @staticmethod
+    def serialize_value(value, *, key=None, task_id=None, dag_id=None, run_id=None, map_index=None):
+        import pandas as pd
+        if isinstance(value, pd.DataFrame):
+            value = write_frame(value, dag_id, run_id, task_id, key, map_index)
+        return BaseXCom.serialize_value(
+            value, key=key, task_id=task_id, dag_id=dag_id, run_id=run_id, map_index=map_index
+        )
+
+    @staticmethod
+    def deserialize_value(result):
+        value = BaseXCom.deserialize_value(result)
+        if is_reference(value):
+            return read_frame(value)
+        return value
+
+    @classmethod
+    def purge(cls, xcom, *args):
+        value = getattr(xcom, "value", None)
+        # the stored value may still be JSON encoded, depending on the caller
+        if isinstance(value, str) and not is_reference(value):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return
+        if is_reference(value):
+            delete_frame(value)
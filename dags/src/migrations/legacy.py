@@ -0,0 +1,71 @@
+# LEGACY TABLES
+# Tables created by the old df.head(0).to_sql path are plain, untyped tables.
+# A migration renames such a table to <table>_legacy, creates the typed
+# table in its place and copies the rows over (first row per key when keyed).
+# The legacy table is kept for the operator to drop once checked.
+
+from sqlalchemy import text
+
+from ..common.partitions import PARTITION_COLUMN, ensure_month_partitions
+
+
+def adopt_legacy_table(conn, schema_name, table_name):
+    """Rename an unpartitioned schema_name.table_name out of the way; returns the new name, or None."""
+    relkind = conn.execute(text('''
+        SELECT c.relkind FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = :schema_name AND c.relname = :table_name
+    '''), {"schema_name": schema_name, "table_name": table_name}).scalar()
+    if relkind != 'r':
+        return None
+    legacy = f"{table_name}_legacy"
+    conn.execute(text(f'ALTER TABLE "{schema_name}"."{table_name}" RENAME TO "{legacy}"'))
+    return legacy
+
+
+def _columns(conn, schema_name, table_name):
+    rows = conn.execute(text('''
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = :schema_name AND table_name = :table_name
+        ORDER BY ordinal_position
+    '''), {"schema_name": schema_name, "table_name": table_name}).fetchall()
+    return [row[0] for row in rows]
+
+
+def copy_legacy_rows(conn, schema_name, legacy, table_name, keys_table, key):
+    """Copy legacy rows into the partitioned table and its key registry; returns the rows copied."""
+    legacy_columns = set(_columns(conn, schema_name, legacy))
+    columns = ", ".join(f'"{column}"' for column in _columns(conn, schema_name, table_name) if column in legacy_columns)
+    source = f'''
+        SELECT DISTINCT ON ("{key}") * FROM "{schema_name}"."{legacy}"
+        WHERE "{key}" IS NOT NULL AND "{PARTITION_COLUMN}" IS NOT NULL
+        ORDER BY "{key}", "{PARTITION_COLUMN}"
+    '''
+
+    months = conn.execute(text(f'''
+        SELECT DISTINCT date_trunc('month', "{PARTITION_COLUMN}")::date FROM "{schema_name}"."{legacy}"
+        WHERE "{PARTITION_COLUMN}" IS NOT NULL
+    ''')).fetchall()
+    ensure_month_partitions(conn, schema_name, table_name, [row[0] for row in months])
+
+    conn.execute(text(f'''
+        INSERT INTO "{schema_name}"."{keys_table}" ("{key}", "{PARTITION_COLUMN}")
+        SELECT "{key}", "{PARTITION_COLUMN}" FROM ({source}) AS first_rows
+    '''))
+    copied = conn.execute(text(f'''
+        INSERT INTO "{schema_name}"."{table_name}" ({columns})
+        SELECT {columns} FROM ({source}) AS first_rows
+    ''')).rowcount
+    print(f"✅ Copied {copied} row(s) from {schema_name}.{legacy} into {schema_name}.{table_name}")
+    return copied
+
+
+def copy_all_rows(conn, schema_name, legacy, table_name):
+    """Copy every legacy row into an unpartitioned table, by matching column names; returns the rows copied."""
+    legacy_columns = set(_columns(conn, schema_name, legacy))
+    columns = ", ".join(f'"{column}"' for column in _columns(conn, schema_name, table_name) if column in legacy_columns)
+    copied = conn.execute(text(f'''
+        INSERT INTO "{schema_name}"."{table_name}" ({columns})
+        SELECT {columns} FROM "{schema_name}"."{legacy}"
+    ''')).rowcount
+    print(f"✅ Copied {copied} row(s) from {schema_name}.{legacy} into {schema_name}.{table_name}")
+    return copied
@@ -0,0 +1,125 @@
+# MIGRATION RUNNER
+# Versioned schema migrations for the pipeline tables: every vNNN_*.py module in
+# this package has upgrade(conn) and runs once, in order, in its own transaction.
+# Applied versions are recorded in <db_migrations_schema>.pipeline_schema_migrations.
+#
+#   python -m src.migrations upgrade        apply pending migrations
+#   python -m src.migrations status         list applied / pending
+#   python -m src.migrations prune --keep-months 24
+#                                           drop monthly partitions past retention
+
+import argparse
+import importlib
+import os
+import pkgutil
+import re
+from datetime import date
+
+from sqlalchemy import text
+
+from ..common.db import create_db_engine
+from ..common.partitions import drop_partitions_before
+from ..common.settings import load_settings
+
+MIGRATIONS_TABLE = "pipeline_schema_migrations"
+_VERSION_MODULE = re.compile(r"^v(\d{3})_\w+$")
+
+
+def available_migrations():
+    """[(version, name, module)] sorted by version."""
+    package = importlib.import_module(__package__)
+    migrations = []
+    for module_info in pkgutil.iter_modules(package.__path__):
+        match = _VERSION_MODULE.match(module_info.name)
+        if match:
+            module = importlib.import_module(f"{__package__}.{module_info.name}")
+            migrations.append((int(match.group(1)), module_info.name, module))
+    return sorted(migrations, key=lambda migration: migration[0])
+
+
+def _migrations_schema():
+    load_settings()
+    return os.getenv("db_migrations_schema", "public")
+
+
+def _without_statement_timeout(conn):
+    # migrations copy whole legacy tables and drop partitions: lift DB_STATEMENT_TIMEOUT_MS
+    # for this transaction only (overrides the session option and the pgbouncer SET LOCAL)
+    conn.execute(text("SET LOCAL statement_timeout = 0"))
+
+
+def _ensure_migrations_table(conn):
+    schema_name = _migrations_schema()
+    conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{schema_name}"'))
+    conn.execute(text(f'''
+        CREATE TABLE IF NOT EXISTS "{schema_name}"."{MIGRATIONS_TABLE}" (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT now()
+        )
+    '''))
+
+
+def applied_versions(conn):
+    _ensure_migrations_table(conn)
+    rows = conn.execute(text(f'SELECT version FROM "{_migrations_schema()}"."{MIGRATIONS_TABLE}"')).fetchall()
+    return {row[0] for row in rows}
+
+
+def upgrade():
+    engine = create_db_engine()
+    applied = []
+    for version, name, module in available_migrations():
+        with engine.begin() as conn:
+            _without_statement_timeout(conn)
+            # serialises concurrent runners (several containers starting at once)
+            conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:lock))"), {"lock": MIGRATIONS_TABLE})
+            if version in applied_versions(conn):
+                continue
+            print(f"⏳ Applying migration {name}")
+            module.upgrade(conn)
+            conn.execute(text(f'''
+                INSERT INTO "{_migrations_schema()}"."{MIGRATIONS_TABLE}" (version, name) VALUES (:version, :name)
+            '''), {"version": version, "name": name})
+        applied.append(name)
+    print(f"✅ Schema up to date ({len(applied)} migration(s) applied)")
+    return applied
+
+
+def status():
+    with create_db_engine().begin() as conn:
+        done = applied_versions(conn)
+    for version, name, _ in available_migrations():
+        print(f"{'applied' if version in done else 'pending'}  {name}")
+
+
+def prune(keep_months):
+    """Drop the monthly partitions older than keep_months for every partitioned pipeline table."""
+    today = date.today()
+    months = today.year * 12 + today.month - 1 - keep_months
+    before = date(months // 12, months % 12 + 1, 1)
+    dropped = []
+    with create_db_engine().begin() as conn:
+        _without_statement_timeout(conn)
+        for _, _, module in available_migrations():
+            for schema_name, table_name, keys_table in getattr(module, "partitioned_tables", lambda: [])():
+                dropped += drop_partitions_before(conn, schema_name, table_name, before, keys_table)
+    print(f"✅ Dropped {len(dropped)} partition(s) older than {before}: {dropped}")
+    return dropped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.migrations")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("upgrade", help="apply pending migrations")
+    commands.add_parser("status", help="list applied and pending migrations")
+    prune_parser = commands.add_parser("prune", help="drop monthly partitions past retention")
+    prune_parser.add_argument("--keep-months", type=int, required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "upgrade":
+        upgrade()
+    elif args.command == "status":
+        status()
+    else:
+        prune(args.keep_months)
@@ -0,0 +1,75 @@
+# 001: typed space alert table, range-partitioned by created_at month, with its
+# nasa_id key registry and the audit table.
+
+import os
+
+from sqlalchemy import text
+
+from ..common.partitions import keys_table_name
+from .legacy import adopt_legacy_table, copy_legacy_rows
+
+
+def _names():
+    table_name = os.getenv("nasa_table_name")
+    return os.getenv("nasa_schema_name"), table_name, keys_table_name(table_name), os.getenv("nasa_audit_table")
+
+
+def partitioned_tables():
+    schema_name, table_name, keys_table, _ = _names()
+    return [(schema_name, table_name, keys_table)]
+
+
+def upgrade(conn):
+    schema_name, table_name, keys_table, audit_table = _names()
+    conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{schema_name}"'))
+    legacy = adopt_legacy_table(conn, schema_name, table_name)
+
+    conn.execute(text(f'''
+        CREATE TABLE "{schema_name}"."{table_name}" (
+            nasa_id TEXT NOT NULL,
+            asteroid_name TEXT,
+            "closest_approach_time_to_earth_IST" TIMESTAMP,
+            closest_approach_distance_km DOUBLE PRECISION,
+            velocity_kmph DOUBLE PRECISION,
+            diameter_min_m DOUBLE PRECISION,
+            diameter_max_m DOUBLE PRECISION,
+            nasa_site_url TEXT,
+            is_potentially_hazardous BOOLEAN,
+            velocity_category TEXT CHECK (velocity_category IN ('slow', 'moderate', 'fast')),
+            hazard_score DOUBLE PRECISION CHECK (hazard_score BETWEEN 0 AND 1),
+            risk_level TEXT CHECK (risk_level IN ('Low', 'Medium', 'High', 'Critical')),
+            size_category TEXT CHECK (size_category IN ('small', 'medium', 'large', 'very_large')),
+            is_close BOOLEAN,
+            is_missing_data BOOLEAN NOT NULL,
+            is_outlier BOOLEAN NOT NULL,
+            is_deleted BOOLEAN NOT NULL DEFAULT FALSE,
+            processing_status TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            data_id TEXT NOT NULL,
+            batch_id TEXT NOT NULL,
+            PRIMARY KEY (nasa_id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    '''))
+    # append-only by created_at, so BRIN stays tiny; approach times follow the feed dates
+    conn.execute(text(f'CREATE INDEX "{table_name}_created_at_brin" ON "{schema_name}"."{table_name}" USING brin (created_at)'))
+    conn.execute(text(f'CREATE INDEX "{table_name}_approach_time_brin" ON "{schema_name}"."{table_name}" USING brin ("closest_approach_time_to_earth_IST")'))
+    conn.execute(text(f'CREATE INDEX "{table_name}_batch_id_idx" ON "{schema_name}"."{table_name}" (batch_id)'))
+
+    conn.execute(text(f'''
+        CREATE TABLE "{schema_name}"."{keys_table}" (
+            nasa_id TEXT PRIMARY KEY,
+            created_at TIMESTAMP NOT NULL
+        )
+    '''))
+
+    conn.execute(text(f'''
+        CREATE TABLE IF NOT EXISTS "{schema_name}"."{audit_table}" (
+            batch_id VARCHAR PRIMARY KEY,
+            date DATE NOT NULL,
+            time TIME NOT NULL,
+            record_count INTEGER NOT NULL
+        )
+    '''))
+
+    if legacy:
+        copy_legacy_rows(conn, schema_name, legacy, table_name, keys_table, 'nasa_id')
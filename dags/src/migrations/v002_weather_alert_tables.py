@@ -0,0 +1,86 @@
+# 002: typed weather alert table, range-partitioned by created_at month, with
+# its weather_id key registry and the audit table.
+
+import os
+
+from sqlalchemy import text
+
+from ..common.partitions import keys_table_name
+from .legacy import adopt_legacy_table, copy_legacy_rows
+
+
+def _names():
+    table_name = os.getenv("weather_table_name")
+    return os.getenv("weather_schema_name"), table_name, keys_table_name(table_name), os.getenv("weather_audit_table")
+
+
+def partitioned_tables():
+    schema_name, table_name, keys_table, _ = _names()
+    return [(schema_name, table_name, keys_table)]
+
+
+def upgrade(conn):
+    schema_name, table_name, keys_table, audit_table = _names()
+    conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{schema_name}"'))
+    legacy = adopt_legacy_table(conn, schema_name, table_name)
+
+    conn.execute(text(f'''
+        CREATE TABLE "{schema_name}"."{table_name}" (
+            city TEXT NOT NULL,
+            temperature_celcius DOUBLE PRECISION NOT NULL,
+            feels_like_temperature_celcius DOUBLE PRECISION,
+            dew_temperature_celcius DOUBLE PRECISION,
+            "humidity_%" DOUBLE PRECISION,
+            vapour_pressure_deficit_kpa DOUBLE PRECISION,
+            wind_speed_kmph DOUBLE PRECISION,
+            "precipitation_%" DOUBLE PRECISION,
+            precipitation_occured_mm DOUBLE PRECISION,
+            rain_mm DOUBLE PRECISION,
+            showers_mm DOUBLE PRECISION,
+            is_rainfall BOOLEAN,
+            snowfall_mm DOUBLE PRECISION,
+            snow_depth_mm DOUBLE PRECISION,
+            is_snowfall BOOLEAN,
+            effective_precipitation_mm DOUBLE PRECISION,
+            is_foggy BOOLEAN,
+            visibility_m DOUBLE PRECISION,
+            "cloud_cover_%" DOUBLE PRECISION,
+            mean_sea_level_pressure_hpa DOUBLE PRECISION,
+            surface_pressure_hpa DOUBLE PRECISION,
+            evapotranspiration_mm DOUBLE PRECISION,
+            et0_fao_evapotranspiration_mm DOUBLE PRECISION,
+            weather_code SMALLINT NOT NULL,
+            weather_type TEXT,
+            water_stress_index DOUBLE PRECISION,
+            extreme_weather_yn TEXT CHECK (extreme_weather_yn IN ('Y', 'N', 'N/A')),
+            weather_id TEXT NOT NULL,
+            is_deleted BOOLEAN NOT NULL DEFAULT FALSE,
+            created_at TIMESTAMP NOT NULL,
+            is_missing_data BOOLEAN NOT NULL,
+            is_outlier BOOLEAN NOT NULL,
+            processing_status TEXT NOT NULL,
+            batch_id TEXT NOT NULL,
+            PRIMARY KEY (weather_id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    '''))
+    conn.execute(text(f'CREATE INDEX "{table_name}_created_at_brin" ON "{schema_name}"."{table_name}" USING brin (created_at)'))
+    conn.execute(text(f'CREATE INDEX "{table_name}_batch_id_idx" ON "{schema_name}"."{table_name}" (batch_id)'))
+
+    conn.execute(text(f'''
+        CREATE TABLE "{schema_name}"."{keys_table}" (
+            weather_id TEXT PRIMARY KEY,
+            created_at TIMESTAMP NOT NULL
+        )
+    '''))
+
+    conn.execute(text(f'''
+        CREATE TABLE IF NOT EXISTS "{schema_name}"."{audit_table}" (
+            batch_id VARCHAR PRIMARY KEY,
+            date DATE NOT NULL,
+            time TIME NOT NULL,
+            record_count INTEGER NOT NULL
+        )
+    '''))
+
+    if legacy:
+        copy_legacy_rows(conn, schema_name, legacy, table_name, keys_table, 'weather_id')
@@ -0,0 +1,44 @@
+# 003: quarantine tables for both pipelines. Same columns and types as the
+# pipeline table (rows that broke a row-level rule can still hold any value, so
+# no NOT NULL or CHECK constraints), plus the rules they broke and when.
+
+import os
+
+from sqlalchemy import text
+
+from .legacy import adopt_legacy_table, copy_all_rows
+
+
+def _tables():
+    return [
+        (os.getenv("nasa_schema_name"), os.getenv("nasa_table_name"),
+         os.getenv("nasa_quarantine_table", "space_alert_quarantine")),
+        (os.getenv("weather_schema_name"), os.getenv("weather_table_name"),
+         os.getenv("weather_quarantine_table", "weather_alert_quarantine")),
+    ]
+
+
+def upgrade(conn):
+    for schema_name, table_name, quarantine_table in _tables():
+        legacy = adopt_legacy_table(conn, schema_name, quarantine_table)
+
+        # LIKE keeps the pipeline table's column types in one place (v001 / v002)
+        conn.execute(text(f'''
+            CREATE TABLE "{schema_name}"."{quarantine_table}" (LIKE "{schema_name}"."{table_name}")
+        '''))
+        not_null = conn.execute(text('''
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = :schema_name AND table_name = :table_name AND is_nullable = 'NO'
+        '''), {"schema_name": schema_name, "table_name": quarantine_table}).fetchall()
+        for (column,) in not_null:
+            conn.execute(text(f'ALTER TABLE "{schema_name}"."{quarantine_table}" ALTER COLUMN "{column}" DROP NOT NULL'))
+        conn.execute(text(f'''
+            ALTER TABLE "{schema_name}"."{quarantine_table}"
+                ADD COLUMN quarantine_reasons TEXT NOT NULL,
+                ADD COLUMN quarantined_at TIMESTAMP NOT NULL
+        '''))
+        conn.execute(text(f'CREATE INDEX "{quarantine_table}_quarantined_at_brin" ON "{schema_name}"."{quarantine_table}" USING brin (quarantined_at)'))
+        conn.execute(text(f'CREATE INDEX "{quarantine_table}_batch_id_idx" ON "{schema_name}"."{quarantine_table}" (batch_id)'))
+
+        if legacy:
+            copy_all_rows(conn, schema_name, legacy, quarantine_table)
@@ -0,0 +1,24 @@
+# 004: running min/max behind hazard_score (src/space_alert/hazard_scaler.py),
+# one row per score name. IF NOT EXISTS adopts the table older versions
+# created on first use; its rows are already in this shape.
+
+import os
+
+from sqlalchemy import text
+
+
+def _names():
+    return os.getenv("nasa_schema_name"), os.getenv("nasa_hazard_state_table", "hazard_score_state")
+
+
+def upgrade(conn):
+    schema_name, table_name = _names()
+    conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{schema_name}"'))
+    conn.execute(text(f'''
+        CREATE TABLE IF NOT EXISTS "{schema_name}"."{table_name}" (
+            score_name TEXT PRIMARY KEY,
+            data_min DOUBLE PRECISION,
+            data_max DOUBLE PRECISION,
+            updated_at TIMESTAMP NOT NULL DEFAULT now()
+        )
+    '''))
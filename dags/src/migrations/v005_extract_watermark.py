@@ -0,0 +1,23 @@
+# 005: NEO extraction watermark (src/space_alert/neo_watermark.py), one row per
+# feed date ingested. IF NOT EXISTS adopts the table older versions created on
+# first use; its rows are already in this shape.
+
+import os
+
+from sqlalchemy import text
+
+
+def _names():
+    return os.getenv("nasa_schema_name"), os.getenv("nasa_watermark_table", "space_alert_extract_watermark")
+
+
+def upgrade(conn):
+    schema_name, table_name = _names()
+    conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{schema_name}"'))
+    conn.execute(text(f'''
+        CREATE TABLE IF NOT EXISTS "{schema_name}"."{table_name}" (
+            feed_date DATE PRIMARY KEY,
+            fetched_at TIMESTAMP NOT NULL,
+            is_final BOOLEAN NOT NULL
+        )
+    '''))
@@ -0,0 +1,106 @@
+# HAZARD SCORE SCALER
+# Min-max normalization of velocity x diameter against the running min/max of
+# every batch loaded so far, kept in the NASA schema so scores (and risk_level)
+# stay comparable between runs and can be computed chunk by chunk. Scoring only
+# reads the stored range; a batch widens it once it passed validation and was
+# loaded (fold_loaded_batch), so rejected rows never skew later scores. The
+# table comes from migration v004; nothing here runs DDL.
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+import os
+from ..common.db import create_db_engine
+from ..common.settings import load_settings
+
+HAZARD_SCORE_STATE = "velocity_x_diameter"
+
+
+class RunningMinMaxScaler:
+    """NumPy min-max scaler whose range only widens with partial_fit (NaN ignored)."""
+
+    def __init__(self, data_min=np.nan, data_max=np.nan):
+        self.data_min = float(data_min)
+        self.data_max = float(data_max)
+
+    def partial_fit(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size and not np.isnan(values).all():
+            self.data_min = float(np.fmin(self.data_min, np.nanmin(values)))
+            self.data_max = float(np.fmax(self.data_max, np.nanmax(values)))
+        return self
+
+    def transform(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        span = self.data_max - self.data_min
+        if not span > 0:
+            # a single distinct value (or no state yet) scores 0
+            return np.where(np.isnan(values), np.nan, 0.0)
+        return np.clip((values - self.data_min) / span, 0.0, 1.0)
+
+
+def _state_table():
+    load_settings()
+    schema_name = os.getenv("nasa_schema_name")
+    table_name = os.getenv("nasa_hazard_state_table", "hazard_score_state")
+    return schema_name, table_name
+
+
+def merge_state(scaler, score_name=HAZARD_SCORE_STATE):
+    """Widen the stored range with the scaler's and load the merged range back into it."""
+    schema_name, table_name = _state_table()
+    # LEAST/GREATEST skip NULLs, so concurrent runs merge instead of overwriting
+    with create_db_engine().begin() as conn:
+        row = conn.execute(text(f'''
+            INSERT INTO "{schema_name}"."{table_name}" AS state (score_name, data_min, data_max)
+            VALUES (:score_name, :data_min, :data_max)
+            ON CONFLICT (score_name) DO UPDATE
+            SET data_min = LEAST(state.data_min, EXCLUDED.data_min),
+                data_max = GREATEST(state.data_max, EXCLUDED.data_max),
+                updated_at = now()
+            RETURNING data_min, data_max
+        '''), {
+            'score_name': score_name,
+            'data_min': None if np.isnan(scaler.data_min) else scaler.data_min,
+            'data_max': None if np.isnan(scaler.data_max) else scaler.data_max
+        }).fetchone()
+    scaler.data_min = np.nan if row[0] is None else float(row[0])
+    scaler.data_max = np.nan if row[1] is None else float(row[1])
+    return scaler
+
+
+def load_state(score_name=HAZARD_SCORE_STATE):
+    """The stored range as a scaler (empty when nothing was loaded yet); read only."""
+    schema_name, table_name = _state_table()
+    with create_db_engine().begin() as conn:
+        row = conn.execute(text(f'''
+            SELECT data_min, data_max FROM "{schema_name}"."{table_name}" WHERE score_name = :score_name
+        '''), {'score_name': score_name}).fetchone()
+    if row is None:
+        return RunningMinMaxScaler()
+    return RunningMinMaxScaler(
+        np.nan if row[0] is None else row[0],
+        np.nan if row[1] is None else row[1]
+    )
+
+
+def hazard_scores(values):
+    """
+    Scores in [0, 1] for one batch or chunk against the stored range widened by
+    the batch itself. The widening stays local: the stored range only changes in
+    fold_loaded_batch.
+    """
+    try:
+        scaler = load_state()
+    except SQLAlchemyError as e:
+        print(f"🟡 Hazard score state unavailable (run `python -m src.migrations upgrade`?), scaling on this batch only: {e.__class__.__name__}")
+        scaler = RunningMinMaxScaler()
+    return scaler.partial_fit(values).transform(values)
+
+
+def fold_loaded_batch(values):
+    """Widen the stored range with a batch that passed validation and was loaded."""
+    try:
+        merge_state(RunningMinMaxScaler().partial_fit(values))
+    except SQLAlchemyError as e:
+        print(f"🟡 Hazard score state not updated (run `python -m src.migrations upgrade`?): {e.__class__.__name__}")
@@ -0,0 +1,69 @@
+# EXTRACTION WATERMARK
+# One row per feed date already ingested, kept in the NASA schema next to the
+# audit table. Dates are only requested again while NASA may still revise them;
+# the loader then updates the rows it already has for those dates (see step05).
+# The table comes from migration v005; nothing here runs DDL.
+
+from sqlalchemy import text
+from datetime import datetime, timedelta, date
+import os
+from ..common.db import create_db_engine
+from ..common.settings import load_settings
+
+REFETCH_AFTER = timedelta(hours=float(os.getenv("NASA_NEO_REFETCH_HOURS", "6")))
+REVISION_DAYS = int(os.getenv("NASA_NEO_REVISION_DAYS", "1"))
+
+
+def revisable_since():
+    """First feed date NASA may still revise; earlier dates are final."""
+    return datetime.utcnow().date() - timedelta(days=REVISION_DAYS)
+
+
+def _watermark_table():
+    load_settings()
+    schema_name = os.getenv("nasa_schema_name")
+    table_name = os.getenv("nasa_watermark_table", "space_alert_extract_watermark")
+    return schema_name, table_name
+
+
+def pending_dates(start_date, end_date):
+    """Dates in [start_date, end_date] that were never ingested or may have been revised since."""
+    schema_name, table_name = _watermark_table()
+    now = datetime.utcnow()
+
+    with create_db_engine().begin() as conn:
+        rows = conn.execute(text(f'''
+            SELECT feed_date, fetched_at, is_final FROM "{schema_name}"."{table_name}"
+            WHERE feed_date BETWEEN :start_date AND :end_date
+        '''), {'start_date': start_date, 'end_date': end_date}).fetchall()
+    ingested = {row[0]: (row[1], row[2]) for row in rows}
+
+    dates = []
+    day = start_date
+    while day <= end_date:
+        fetched_at, is_final = ingested.get(day, (None, False))
+        if fetched_at is None or (not is_final and now - fetched_at >= REFETCH_AFTER):
+            dates.append(day)
+        day += timedelta(days=1)
+    return dates
+
+
+def mark_dates_ingested(dates):
+    if not dates:
+        return
+    dates = [day if isinstance(day, date) else date.fromisoformat(day) for day in dates]
+    schema_name, table_name = _watermark_table()
+    now = datetime.utcnow()
+    final_before = revisable_since()
+
+    with create_db_engine().begin() as conn:
+        conn.execute(text(f'''
+            INSERT INTO "{schema_name}"."{table_name}" (feed_date, fetched_at, is_final)
+            VALUES (:feed_date, :fetched_at, :is_final)
+            ON CONFLICT (feed_date) DO UPDATE
+            SET fetched_at = EXCLUDED.fetched_at, is_final = EXCLUDED.is_final
+        '''), [
+            {'feed_date': day, 'fetched_at': now, 'is_final': day < final_before}
+            for day in dates
+        ])
+    print(f"✅ Extraction watermark updated for {len(dates)} feed date(s) for space alert system")
@@ -0,0 +1,258 @@
+# NASA NeoWs HTTP CLIENT
+# One pooled keep-alive session per process, shared by the feed extraction and
+# per-asteroid lookups, with timeouts, jittered retries and ETag/If-Modified-Since.
+# Every attempt, retries included, takes a token from the shared hourly budget.
+# Validators and payloads for the conditional requests are kept per process and
+# in NASA_NEO_CACHE_PATH, so a later task run (a fresh process) can revalidate.
+
+import hashlib
+import os
+import pickle
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+
+import requests
+from requests.adapters import HTTPAdapter
+from ..common.rate_limiter import get_rate_limiter
+from ..common.settings import load_settings
+
+NEOWS_BASE_URL = os.getenv("NASA_NEO_API_URL", "https://api.nasa.gov/neo/rest/v1").rstrip("/")
+CONNECT_TIMEOUT = float(os.getenv("NASA_NEO_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("NASA_NEO_READ_TIMEOUT", "30"))
+POOL_SIZE = int(os.getenv("NASA_NEO_POOL_SIZE", "10"))
+MAX_RETRIES = int(os.getenv("NASA_NEO_MAX_RETRIES", "4"))
+RATE_LIMITED_RETRIES = int(os.getenv("NASA_NEO_429_RETRIES", "1"))  # kept low: each retry spends quota
+RETRY_STATUSES = (500, 502, 503, 504)
+BACKOFF_S = 0.5
+CONDITIONAL_CACHE_SIZE = 256
+# shared directory (the data volume) for the conditional cache; empty = this process only
+CONDITIONAL_CACHE_PATH = os.getenv("NASA_NEO_CACHE_PATH", "/opt/airflow/data/neows_cache")
+CONDITIONAL_CACHE_TTL_HOURS = float(os.getenv("NASA_NEO_CACHE_TTL_HOURS", "168"))
+LATENCY_SAMPLES = 1024
+RATE_LIMIT_PER_HOUR = int(os.getenv("NASA_RATE_LIMIT_PER_HOUR", "1000"))
+RATE_LIMIT_BURST = int(os.getenv("NASA_RATE_LIMIT_BURST", "40"))
+RATE_LIMIT_MAX_WAIT = float(os.getenv("NASA_RATE_LIMIT_MAX_WAIT", "300"))
+
+_session = None
+_session_lock = threading.Lock()
+_conditional_cache = OrderedDict()  # request key -> (etag, last_modified, payload)
+_cache_lock = threading.Lock()
+_cache_swept = False
+_latencies = deque(maxlen=LATENCY_SAMPLES)  # (path, status, seconds), most recent requests
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            # no urllib3 retries: they would bypass the rate limiter, _get retries instead
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get_limiter():
+    # the quota belongs to the API key, so workers using the same key share a bucket
+    load_settings()
+    api_key = os.getenv("NASA_NEO_API_KEY") or "DEMO_KEY"
+    return get_rate_limiter(f"nasa-neows:{api_key[-6:]}", RATE_LIMIT_PER_HOUR, RATE_LIMIT_BURST)
+
+
+def recommended_concurrency(max_workers):
+    return get_limiter().recommended_concurrency(max_workers)
+
+
+def _cache_key(path, params, parse):
+    query = tuple(sorted((k, str(v)) for k, v in params.items() if k != "api_key"))
+    return path, query, getattr(parse, "__name__", None)
+
+
+def _cache_file(key):
+    return os.path.join(CONDITIONAL_CACHE_PATH, hashlib.sha256(repr(key).encode()).hexdigest() + ".pickle")
+
+
+def _expired(path):
+    return time.time() - os.path.getmtime(path) > CONDITIONAL_CACHE_TTL_HOURS * 3600
+
+
+def _cached_response(key):
+    """(etag, last_modified, payload) of the last response for key: this process first, then the shared directory."""
+    with _cache_lock:
+        cached = _conditional_cache.get(key)
+    if cached or not CONDITIONAL_CACHE_PATH:
+        return cached
+    path = _cache_file(key)
+    try:
+        if _expired(path):
+            return None
+        with open(path, "rb") as file:
+            cached = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError) as e:
+        print(f"🟡 NeoWs conditional cache entry unreadable, fetching in full: {e}")
+        return None
+    with _cache_lock:
+        _conditional_cache[key] = cached
+    return cached
+
+
+def _sweep_cache_dir():
+    # once per process: drop entries past the TTL (windows that are never requested again)
+    global _cache_swept
+    if _cache_swept:
+        return
+    _cache_swept = True
+    for entry in os.scandir(CONDITIONAL_CACHE_PATH):
+        if entry.name.endswith(".pickle") and _expired(entry.path):
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+def _store_response(key, cached):
+    with _cache_lock:
+        _conditional_cache[key] = cached
+        _conditional_cache.move_to_end(key)
+        while len(_conditional_cache) > CONDITIONAL_CACHE_SIZE:
+            _conditional_cache.popitem(last=False)
+    if not CONDITIONAL_CACHE_PATH:
+        return
+    path = _cache_file(key)
+    try:
+        os.makedirs(CONDITIONAL_CACHE_PATH, exist_ok=True)
+        _sweep_cache_dir()
+        # written aside and moved, a concurrent reader never sees half an entry
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}.partial"
+        with open(partial, "wb") as file:
+            pickle.dump(cached, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, path)
+    except OSError as e:
+        print(f"🟡 NeoWs conditional cache not persisted to {CONDITIONAL_CACHE_PATH}: {e}")
+
+
+def _backoff(attempt, retry_after=None):
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:  # HTTP-date form, fall back to the exponential backoff
+            pass
+    return BACKOFF_S * 2 ** attempt + random.uniform(0, BACKOFF_S)
+
+
+def _get(path, params, headers, stream):
+    """
+    GET with retries on connection errors, timeouts and 5xx (up to MAX_RETRIES)
+    and on 429 (up to RATE_LIMITED_RETRIES, honouring Retry-After). Each attempt
+    acquires its own token, so retries count against the shared hourly budget.
+    """
+    limiter = get_limiter()
+    attempt = rate_limited = 0
+    while True:
+        limiter.acquire(timeout=RATE_LIMIT_MAX_WAIT)
+        try:
+            response = get_session().get(
+                f"{NEOWS_BASE_URL}{path}",
+                params=params,
+                headers=headers,
+                timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                stream=stream
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt >= MAX_RETRIES:
+                raise
+            wait = _backoff(attempt)
+            attempt += 1
+            print(f"🔁 NeoWs GET {path} failed ({type(e).__name__}), retry {attempt} in {wait:.1f}s")
+            time.sleep(wait)
+            continue
+
+        limiter.observe(response.headers)
+        if response.status_code == 429 and rate_limited < RATE_LIMITED_RETRIES:
+            wait = _backoff(rate_limited, response.headers.get("Retry-After"))
+            rate_limited += 1
+        elif response.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+            wait = _backoff(attempt)
+            attempt += 1
+        else:
+            return response
+        response.close()
+        print(f"🔁 NeoWs GET {path} -> {response.status_code}, retry in {wait:.1f}s")
+        time.sleep(wait)
+
+
+def get_json(path, params=None, parse=None):
+    # parse: optional callable consuming the raw response stream; its result is
+    # returned (and cached for 304 revalidation) instead of the decoded JSON
+    load_settings()
+    params = dict(params or {})
+    params.setdefault("api_key", os.getenv("NASA_NEO_API_KEY"))
+    key = _cache_key(path, params, parse)
+
+    # --- Conditional request headers from the last response for the same query ---
+    headers = {}
+    cached = _cached_response(key)
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    started = time.perf_counter()
+    response = _get(path, params, headers, parse is not None)
+    if response.status_code == 304 and not cached:
+        # nothing to revalidate against (no conditional headers were sent): ask for the full body
+        response.close()
+        response = _get(path, params, {}, parse is not None)
+    with response:
+        if response.status_code == 304 and cached:
+            payload = cached[2]
+        else:
+            response.raise_for_status()
+            if response.status_code == 304:
+                raise requests.HTTPError(f"304 Not Modified for {path} without a cached body", response=response)
+            if parse is None:
+                payload = response.json()
+            else:
+                response.raw.decode_content = True
+                payload = parse(response.raw)
+    elapsed = time.perf_counter() - started
+    _latencies.append((path, response.status_code, elapsed))
+    print(f"🌐 NeoWs GET {path} -> {response.status_code} in {elapsed:.3f}s")
+
+    if response.status_code == 304:
+        _store_response(key, cached)  # revalidated: keeps the entry within the TTL
+        return payload
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        _store_response(key, (etag, last_modified, payload))
+    return payload
+
+
+def get_feed(start_date, end_date, parse=None):
+    return get_json("/feed", {"start_date": start_date, "end_date": end_date}, parse=parse)
+
+
+def get_neo(asteroid_id):
+    return get_json(f"/neo/{asteroid_id}")
+
+
+def latency_summary():
+    if not _latencies:
+        return {"requests": 0}
+    durations = sorted(seconds for _, _, seconds in _latencies)
+    return {
+        "requests": len(durations),
+        "total_s": round(sum(durations), 3),
+        "p50_s": round(durations[len(durations) // 2], 3),
+        "max_s": round(durations[-1], 3),
+    }
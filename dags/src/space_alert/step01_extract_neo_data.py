@@ -1,61 +1,181 @@
-import requests
-from datetime import datetime, timedelta
-from dotenv import load_dotenv
+import json
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, date
 import os
-load_dotenv()
+import numpy as np
+import pandas as pd
+from .neows_client import get_feed, latency_summary, recommended_concurrency
+from ..common.dtypes import NEO_SCHEMA, apply_dtypes, memory_report
+from ..common.settings import load_settings
+try:
+    import ijson
+except ImportError:  # falls back to json.load of the whole response
+    ijson = None
+FEED_WINDOW_DAYS = 7  # NeoWs feed rejects ranges longer than 7 days
+NEO_COLUMNS = [
+    "asteroid_name", "nasa_id", "nasa_site_url", "closest_approach_time_to_earth_IST",
+    "closest_approach_distance_km", "velocity_kmph", "diameter_min_m", "diameter_max_m",
+    "is_potentially_hazardous"
+]
 
-def neosapi():
-    nasa_neo_api_key = os.getenv("NASA_NEO_API_KEY") # <-- your API key here
 
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value), "%Y-%m-%d").date()
+
+
+def split_date_range(start_date, end_date, window_days=FEED_WINDOW_DAYS):
+    start = _to_date(start_date)
+    end = _to_date(end_date)
+    if end < start:
+        raise ValueError(f"end_date {end} is before start_date {start}")
+
+    windows = []
+    while start <= end:
+        window_end = min(start + timedelta(days=window_days - 1), end)
+        windows.append((start.strftime("%Y-%m-%d"), window_end.strftime("%Y-%m-%d")))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+def _contiguous_ranges(dates):
+    ranges = []
+    for day in sorted(dates):
+        if ranges and day == ranges[-1][1] + timedelta(days=1):
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+    return ranges
+
+
+def plan_feed_dates(start_date=None, end_date=None, incremental=False):
+    # default: half-day window around now, otherwise backfill the given range
     now = datetime.utcnow()
-    start_date = (now - timedelta(days=0.5)).strftime("%Y-%m-%d")
-    end_date = (now + timedelta(days=0.5)).strftime("%Y-%m-%d")
-
-    url = "https://api.nasa.gov/neo/rest/v1/feed"
-    params = {
-        "start_date": start_date,
-        "end_date": end_date,
-        "api_key": nasa_neo_api_key
-    }
+    start = _to_date(start_date or now - timedelta(days=0.5))
+    end = _to_date(end_date or now + timedelta(days=0.5))
+    if end < start:
+        raise ValueError(f"end_date {end} is before start_date {start}")
+
+    if incremental:
+        from .neo_watermark import pending_dates
+        return pending_dates(start, end)
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def _iter_feed_days(stream):
+    if ijson is not None:
+        # yields one (date, [neos]) pair at a time straight off the socket
+        return ijson.kvitems(stream, "near_earth_objects", use_float=True)
+    return json.load(stream).get("near_earth_objects", {}).items()
 
-    response = requests.get(url, params=params)
-    data = response.json()
 
-    neos_list = []
+def parse_neo_feed(stream):
+    # typed column buffers, filled in a single pass over the feed
+    asteroid_name, nasa_id, nasa_site_url, approach_time, feed_dates = [], [], [], [], []
+    distance_km, velocity_kmph = array("d"), array("d")
+    diameter_min_m, diameter_max_m = array("d"), array("d")
+    is_hazardous = array("B")
 
-    for date in data.get("near_earth_objects", {}):
-        for neo in data["near_earth_objects"][date]:
+    for feed_date, neos in _iter_feed_days(stream):
+        for neo in neos:
             approach_data = neo.get("close_approach_data", [])
             if approach_data:
-                approach_time = approach_data[0].get("close_approach_date_full")
-                neos_list.append({
-                    "asteroid_name": neo["name"],
-                    "nasa_id": neo["id"],
-                    "nasa_site_url": neo["nasa_jpl_url"],
-                    "closest_approach_time_to_earth_IST": approach_time,
-                    "closest_approach_distance_km": float(approach_data[0]["miss_distance"]["kilometers"]),
-                    "velocity_kmph": float(approach_data[0]["relative_velocity"]["kilometers_per_hour"]),
-                    "diameter_min_m": float(neo["estimated_diameter"]["meters"]["estimated_diameter_min"]),
-                    "diameter_max_m": float(neo["estimated_diameter"]["meters"]["estimated_diameter_max"]),
-                    "is_potentially_hazardous": neo["is_potentially_hazardous_asteroid"]
-                })
-    print('✅ Data fetched successfully for space alert system.')
-    return neos_list
+                approach = approach_data[0]
+                meters = neo["estimated_diameter"]["meters"]
+                asteroid_name.append(neo["name"])
+                nasa_id.append(neo["id"])
+                nasa_site_url.append(neo["nasa_jpl_url"])
+                approach_time.append(approach.get("close_approach_date_full"))
+                feed_dates.append(feed_date)
+                distance_km.append(float(approach["miss_distance"]["kilometers"]))
+                velocity_kmph.append(float(approach["relative_velocity"]["kilometers_per_hour"]))
+                diameter_min_m.append(float(meters["estimated_diameter_min"]))
+                diameter_max_m.append(float(meters["estimated_diameter_max"]))
+                is_hazardous.append(bool(neo["is_potentially_hazardous_asteroid"]))
+
+    # numeric buffers are wrapped, not copied
+    return {
+        "asteroid_name": asteroid_name,
+        "nasa_id": nasa_id,
+        "nasa_site_url": nasa_site_url,
+        "closest_approach_time_to_earth_IST": approach_time,
+        "closest_approach_distance_km": np.frombuffer(distance_km, dtype=np.float64),
+        "velocity_kmph": np.frombuffer(velocity_kmph, dtype=np.float64),
+        "diameter_min_m": np.frombuffer(diameter_min_m, dtype=np.float64),
+        "diameter_max_m": np.frombuffer(diameter_max_m, dtype=np.float64),
+        "is_potentially_hazardous": np.frombuffer(is_hazardous, dtype=np.bool_),
+        "feed_date": feed_dates
+    }
+
+
+def fetch_feed_window(start_date, end_date):
+    return pd.DataFrame(get_feed(start_date, end_date, parse=parse_neo_feed), copy=False)
+
+
+def neosapi(start_date=None, end_date=None, max_workers=None, dates=None):
+    load_settings()
+    max_workers = max_workers or int(os.getenv("NASA_NEO_MAX_WORKERS", "4"))
+
+    if dates is None:
+        dates = plan_feed_dates(start_date, end_date)
+    windows = [
+        window
+        for range_start, range_end in _contiguous_ranges(dates)
+        for window in split_date_range(range_start, range_end)
+    ]
+    if not windows:
+        print('🟡 No feed dates left to fetch for space alert system.')
+        return pd.DataFrame(columns=NEO_COLUMNS)
+
+    # shrink the pool when the hourly quota is running low
+    max_workers = recommended_concurrency(max_workers)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(windows))) as pool:
+        frames = list(pool.map(lambda window: fetch_feed_window(*window), windows))
+
+    # merge windows in date order and keep the first approach per nasa_id
+    df = pd.concat(frames, ignore_index=True)
+    df = df.sort_values("feed_date", kind="stable").drop_duplicates(subset=["nasa_id"])
+    df = df.drop(columns=["feed_date"]).reset_index(drop=True)
+    apply_dtypes(df, NEO_SCHEMA)
+
+    print(f'✅ Data fetched successfully for space alert system ({len(windows)} window(s), {len(df)} objects).')
+    print(f'⏱️ NeoWs request latency: {latency_summary()}')
+    memory_report(df, 'extract', 'space alert system')
+    return df
 
 # print(neosapi())
+# print(neosapi("2024-01-01", "2024-12-31"))  # backfill a full year
+# print(neosapi(dates=plan_feed_dates(incremental=True)))  # only dates not ingested yet
 
 
 
 
 """
-    Fetches Near-Earth Object (NEO) data from NASA's public API within a
-    half-day window around the current UTC time (12 hours before and after now).
-    
+    Fetches Near-Earth Object (NEO) data from NASA's public API.
+
+    By default the window is half a day around the current UTC time (12 hours
+    before and after now). Passing start_date/end_date (YYYY-MM-DD) backfills an
+    arbitrary range instead: the range is split into 7-day feed windows which are
+    fetched concurrently (up to NASA_NEO_MAX_WORKERS threads, fewer when the API
+    quota is running low), merged in date order and
+    deduplicated by nasa_id. plan_feed_dates(incremental=True) narrows the range to
+    the dates the extraction watermark (neo_watermark) has not ingested yet, or
+    that NASA may still have revised since the last fetch. Requests go through the
+    pooled client in neows_client; NASA_NEO_API_URL can point it at a local
+    stand-in server.
+
+    The response is streamed (ijson) straight into typed column buffers, so no
+    intermediate list of dicts is built.
+
     Returns:
-        A list of dictionaries, each containing detailed information about
-        a Near-Earth Object expected to approach Earth in the specified time frame.
-    
-    Each dictionary contains:
+        A DataFrame with one row per Near-Earth Object expected to approach
+        Earth in the specified time frame.
+
+    Columns:
         - name: The official name of the NEO.
         - id: Unique identifier of the NEO.
         - nasa_jpl_url: URL linking to NASA's Jet Propulsion Laboratory page for more info.
@@ -65,8 +185,8 @@ def neosapi():
         - diameter_min_m: Estimated minimum diameter of the NEO, in meters.
         - diameter_max_m: Estimated maximum diameter of the NEO, in meters.
         - is_potentially_hazardous: Boolean indicating if the NEO is classified as potentially hazardous.
-    
+
     Note:
         - Requires a valid NASA API key.
         - Uses NASA's NEO Feed API endpoint.
-"""
\ No newline at end of file
+"""
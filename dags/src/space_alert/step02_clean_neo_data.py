@@ -1,74 +1,56 @@
 #CLEAN DATA
 
 import pandas as pd
+import numpy as np
 from datetime import datetime
-
+from ..common.dtypes import NEO_SCHEMA, apply_dtypes, memory_report
+
+# --- Cleaning plan: every column is handled by exactly one fused pass ---
+ROUND_DECIMALS = {
+    "closest_approach_distance_km": 2,
+    "velocity_kmph": 2,
+    "diameter_min_m": 2,
+    "diameter_max_m": 2
+}
+OUTLIER_THRESHOLDS = {
+    "closest_approach_distance_km": (100000, 110000000),
+    "velocity_kmph": (7000, 99000)
+}
+CRITICAL_COLUMNS = ["asteroid_name", "nasa_id", "closest_approach_time_to_earth_IST", "closest_approach_distance_km", "velocity_kmph", "diameter_max_m", "is_potentially_hazardous"]
+APPROACH_TIME_FORMAT = "%Y-%b-%d %H:%M"
+IST_OFFSET = pd.Timedelta(hours=5, minutes=30)
 
 
 def clean_data(data):
-    df=pd.DataFrame(data)
-
-    # Data Type Optimization
-    df['asteroid_name'] = df['asteroid_name'].astype(str)
-    df['nasa_id'] = df['nasa_id'].astype(str)
-    df['nasa_site_url'] = df['nasa_site_url'].astype(str)
-    df['is_potentially_hazardous'] = df['is_potentially_hazardous'].astype(bool)
-
-
-
-    #round off int/float columns
-    df['closest_approach_distance_km'] = df['closest_approach_distance_km'].round(2)
-    df['velocity_kmph'] = df['velocity_kmph'].round(2)
-    df['diameter_min_m'] = df['diameter_min_m'].round(2)
-    df['diameter_max_m'] = df['diameter_max_m'].round(2)
-
-
-
-    #time ordering -> YYYY-MM-DD HH:MM:SS
-    df['closest_approach_time_to_earth_IST'] = pd.to_datetime(df['closest_approach_time_to_earth_IST'], format='%Y-%b-%d %H:%M')
-
-
-
-    #chnage UTC to IST
-    df['closest_approach_time_to_earth_IST'] = df['closest_approach_time_to_earth_IST'] + pd.Timedelta(hours=5, minutes=30)
-
-
-
-    #cleaning asteroid_name column and removing brackets
-    df['asteroid_name'] = df['asteroid_name'].astype(str).str.replace(r'[()]', '', regex=True)
-
-
-
-    #uppercasing asteroid_name
-    df['asteroid_name'] = df['asteroid_name'].str.upper()  
-
-
-
-    #drop duplicates
-    df.drop_duplicates(subset=['nasa_id'], inplace=True)
-
-
-
-    #missing values check
-    critical_columns = ["asteroid_name","nasa_id","closest_approach_time_to_earth_IST","closest_approach_distance_km","velocity_kmph","diameter_max_m","is_potentially_hazardous"]
-    df['is_missing_data'] = df[critical_columns].isnull().any(axis=1)
-
-
-
-    #outliers check
-    thresholds = {
-        "closest_approach_distance_km": (100000, 110000000),
-        "velocity_kmph":(7000,99000)
+    df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+
+    # --- Rows first: first approach per nasa_id that has a distance, in one take ---
+    nasa_id = df['nasa_id'].astype(str)
+    keep = ~nasa_id.duplicated() & df['closest_approach_distance_km'].notna()
+    df = df[keep.to_numpy()]
+
+    cleaned = {
+        # removing brackets (plain substring kernels, no regex engine) and uppercasing
+        'asteroid_name': df['asteroid_name'].astype(str).str.replace('(', '', regex=False).str.replace(')', '', regex=False).str.upper(),
+        'nasa_id': nasa_id[keep.to_numpy()],
+        'nasa_site_url': df['nasa_site_url'].astype(str),
+        # time ordering -> YYYY-MM-DD HH:MM:SS, shifted from UTC to IST
+        'closest_approach_time_to_earth_IST': pd.to_datetime(df['closest_approach_time_to_earth_IST'], format=APPROACH_TIME_FORMAT) + IST_OFFSET,
     }
-    df['is_outlier'] = False
-    for col, (min_val, max_val) in thresholds.items():
-        if col in df.columns:
-            df['is_outlier'] |= (df[col] < min_val) | (df[col] > max_val)
+    for column, decimals in ROUND_DECIMALS.items():
+        cleaned[column] = df[column].round(decimals)
+    cleaned['is_potentially_hazardous'] = df['is_potentially_hazardous'].astype(bool)
+    df = pd.DataFrame(cleaned, index=df.index, copy=False)
 
 
 
-    #drop if imp cols have null values
-    df.dropna(subset=["nasa_id","closest_approach_distance_km"],inplace=True)
+    #missing values and outliers check
+    df['is_missing_data'] = df[CRITICAL_COLUMNS].isnull().any(axis=1)
+    is_outlier = np.zeros(len(df), dtype=bool)
+    for col, (min_val, max_val) in OUTLIER_THRESHOLDS.items():
+        values = df[col].to_numpy()
+        is_outlier |= (values < min_val) | (values > max_val)
+    df['is_outlier'] = is_outlier
 
 
 
@@ -77,5 +59,7 @@ def clean_data(data):
 
 
 
+    apply_dtypes(df, NEO_SCHEMA)
+    memory_report(df, 'clean', 'space alert system')
     print('✅ Data cleaning completed successfully for space alert system.')
-    return df
\ No newline at end of file
+    return df
@@ -1,21 +1,17 @@
 #DATA TRANSFORMATION
-from sklearn.preprocessing import MinMaxScaler
 import pandas as pd
 from datetime import datetime
 import numpy as np
+from .hazard_scaler import hazard_scores
+from ..common.ids import row_ids, batch_id
+from ..common.dtypes import NEO_SCHEMA, apply_dtypes, memory_report
 
 
-def transform_data(data):
+def transform_data(data, run_key=None, run_ts=None):
     df=data
 
-    #unique column as data_id combination of date time(including miliseconds)
-    def generate_data_id(nasa_id):
-        now = datetime.now()
-            # Format date and time as required (2 digits each, millisecond 2 digits)
-        dt_str = now.strftime('%d%m%y%H%M%S')  # day, month, year, hour, minute, second (all 2 digits)
-        ms_str = str(int(now.microsecond / 10000)).zfill(2)  # convert microsecond to 2 digit millisecond (0-99)
-        return f"{nasa_id}-{dt_str}{ms_str}"
-    df['data_id'] = df['nasa_id'].apply(generate_data_id)
+    #unique column as data_id: nasa_id + time-sortable id (reproducible for the same run_key)
+    df['data_id'] = df['nasa_id'].astype(str) + '-' + row_ids(df[['nasa_id']], run_key, run_ts)
 
 
 
@@ -25,38 +21,29 @@ def transform_data(data):
 
 
     #verify url and correction
-    df['nasa_site_url'] = df['nasa_site_url'].apply(
-        lambda url: url if isinstance(url, str) and url.startswith('https://') and 'nasa.gov' in url
-        else 'url not found'
+    url = df['nasa_site_url']
+    is_valid_url = (
+        url.str.startswith('https://', na=False) &
+        url.str.contains('nasa.gov', regex=False, na=False)
     )
+    df['nasa_site_url'] = np.where(is_valid_url, url, 'url not found')
 
 
 
     #handle is_potentially_hazardous boolean value and fill if needed
-    def determine_hazard(row):
-        val = str(row['is_potentially_hazardous']).strip().lower()
-        if val in ['true', 'yes', '1']:
-            return True
-        elif val in ['false', 'no', '0']:
-            return False
-        else:
-            # Check other conditions
-            if (row['diameter_max_m'] > 150 and
-                row['closest_approach_distance_km'] < 1000000 and
-                row['velocity_kmph'] > 8000):
-                return True
-            else:
-                return False
-    df['is_potentially_hazardous'] = df.apply(determine_hazard, axis=1)
-
-
-
-    #recheck duplicate based on data_id and drop if duplicate found.
-    if not df['data_id'].is_unique:
-        print("Duplicates found in 'data_id'. Removing duplicate rows, keeping the first occurrence.")
-        df = df.drop_duplicates(subset=['data_id'], keep='first')
-    else:
-        pass
+    if not pd.api.types.is_bool_dtype(df['is_potentially_hazardous']):
+        hazard_text = df['is_potentially_hazardous'].astype(str).str.strip().str.lower()
+        # Check other conditions when the flag is missing or unreadable
+        hazard_by_size = (
+            (df['diameter_max_m'] > 150) &
+            (df['closest_approach_distance_km'] < 1000000) &
+            (df['velocity_kmph'] > 8000)
+        )
+        df['is_potentially_hazardous'] = np.select(
+            [hazard_text.isin(['true', 'yes', '1']), hazard_text.isin(['false', 'no', '0'])],
+            [True, False],
+            default=hazard_by_size
+        )
 
 
 
@@ -71,26 +58,19 @@ def transform_data(data):
 
     # Add audit trail columns
     df['processing_status'] = 'transformed'
-    df['batch_id'] = datetime.now().strftime('%Y%m%d%H%M%S') + f"{datetime.now().microsecond // 1000:03d}"
+    df['batch_id'] = batch_id(run_key, run_ts)
 
 
 
     # Add velocity catagory column
-    def categorize_speed(speed):
-        if speed < 25000:
-            return "slow"
-        elif speed < 65000:
-            return "moderate"
-        else:
-            return "fast"
-    df['velocity_category'] = df['velocity_kmph'].apply(categorize_speed)
+    speed = df['velocity_kmph']
+    df['velocity_category'] = np.select([speed < 25000, speed < 65000], ["slow", "moderate"], default="fast")
 
 
 
-    # Add hazard score based on velocity and size
-    scaler = MinMaxScaler()
-    df['hazard_score'] = scaler.fit_transform(
-        (df['velocity_kmph'] * df['diameter_max_m']).values.reshape(-1, 1)
+    # Add hazard score based on velocity and size, scaled against every batch seen so far
+    df['hazard_score'] = hazard_scores(
+        (df['velocity_kmph'] * df['diameter_max_m']).to_numpy()
     ).round(3)
 
 
@@ -136,7 +116,8 @@ def transform_data(data):
         'data_id',
         'batch_id'
     ]
-    df = df[sorted_columns]
+    df = apply_dtypes(df[sorted_columns], NEO_SCHEMA)
+    memory_report(df, 'transform', 'space alert system')
 
 
 
@@ -1,73 +1,61 @@
 # VALIDATE DATA
-import pandas as pd
-from datetime import datetime
-
-def validate_data(data):
-    df=data
-    errors = []
-
+import os
+from ..common.dtypes import NEO_SCHEMA
+from ..common.quarantine import quarantine_failed_rows
+from ..common.settings import load_settings
+from ..common.validation import compile_rules, run_validation
+
+REQUIRED_COLUMNS = [
+    'nasa_id', 'asteroid_name', 'closest_approach_time_to_earth_IST',
+    'closest_approach_distance_km', 'velocity_kmph',
+    'diameter_min_m', 'diameter_max_m', 'nasa_site_url',
+    'is_potentially_hazardous', 'velocity_category', 'hazard_score',
+    'risk_level', 'size_category', 'is_close', 'is_missing_data',
+    'is_outlier', 'is_deleted', 'processing_status', 'created_at',
+    'data_id', 'batch_id'
+]
+
+VALIDATION_RULES = [
     # 1. Schema Validation
-    required_columns = [
-        'nasa_id', 'asteroid_name', 'closest_approach_time_to_earth_IST', 
-        'closest_approach_distance_km', 'velocity_kmph', 
-        'diameter_min_m', 'diameter_max_m', 'nasa_site_url', 
-        'is_potentially_hazardous', 'velocity_category', 'hazard_score', 
-        'risk_level', 'size_category', 'is_close', 'is_missing_data', 
-        'is_outlier', 'is_deleted', 'processing_status', 'created_at', 
-        'data_id', 'batch_id'
-    ]
-    missing_columns = [col for col in required_columns if col not in df.columns]
-    if missing_columns:
-        errors.append(f"Missing columns: {missing_columns}")
+    {"name": "required_columns", "type": "columns", "columns": REQUIRED_COLUMNS},
 
     # 2. Uniqueness Constraint
-    if not df['nasa_id'].is_unique:
-        errors.append("Duplicate nasa_id found")
-
-    if not df['data_id'].is_unique:
-        errors.append("Duplicate data_id found")
+    {"name": "nasa_id_unique", "type": "unique", "column": "nasa_id"},
+    {"name": "data_id_unique", "type": "unique", "column": "data_id"},
 
     # 3. Value Range Checks
-    if (df['closest_approach_distance_km'] <= 0).any():
-        errors.append("Invalid values in closest_approach_distance_km (should be > 0)")
-
-    if (df['velocity_kmph'] <= 0).any():
-        errors.append("Invalid values in velocity_kmph (should be > 0)")
-
-    if (df['diameter_min_m'] < 0).any() or (df['diameter_max_m'] < 0).any():
-        errors.append("Negative diameters detected")
-
-    if (df['diameter_min_m'] > df['diameter_max_m']).any():
-        errors.append("diameter_min_m greater than diameter_max_m")
-
-    if (df['hazard_score'] < 0).any() or (df['hazard_score'] > 1).any():
-        errors.append("hazard_score out of [0, 1] range")
+    {"name": "distance_positive", "type": "range", "column": "closest_approach_distance_km", "min": 0, "min_inclusive": False},
+    {"name": "velocity_positive", "type": "range", "column": "velocity_kmph", "min": 0, "min_inclusive": False},
+    {"name": "diameter_min_non_negative", "type": "range", "column": "diameter_min_m", "min": 0},
+    {"name": "diameter_max_non_negative", "type": "range", "column": "diameter_max_m", "min": 0},
+    {"name": "diameter_min_le_max", "type": "compare", "left": "diameter_min_m", "op": "<=", "right": "diameter_max_m"},
+    {"name": "hazard_score_unit_range", "type": "range", "column": "hazard_score", "min": 0, "max": 1},
 
     # 4. Categorical Consistency
-    expected_velocity_cats = {'slow', 'moderate', 'fast'}
-    if not df['velocity_category'].isin(expected_velocity_cats).all():
-        errors.append("Unexpected values in velocity_category")
-
-    expected_risk_levels = {'Low', 'Medium', 'High', 'Critical'}
-    if not df['risk_level'].isin(expected_risk_levels).all():
-        errors.append("Unexpected values in risk_level")
-
-    expected_size_cats = {'small', 'medium', 'large', 'very_large'}
-    if not df['size_category'].isin(expected_size_cats).all():
-        errors.append("Unexpected values in size_category")
+    {"name": "velocity_category_values", "type": "allowed", "column": "velocity_category", "values": ['slow', 'moderate', 'fast']},
+    {"name": "risk_level_values", "type": "allowed", "column": "risk_level", "values": ['Low', 'Medium', 'High', 'Critical']},
+    {"name": "size_category_values", "type": "allowed", "column": "size_category", "values": ['small', 'medium', 'large', 'very_large']},
 
     # 5. created_at must not be in future
-    if (df['created_at'] > datetime.now()).any():
-        errors.append("created_at has future dates")
+    {"name": "created_at_not_future", "type": "not_future", "column": "created_at"},
+]
 
-    # Final output
-    if errors:
-        print("❌ Validation FAILED with the following issues:")
-        for err in errors:
-            print("-", err)
-        return False
-    else:
-        print("✅ Validation PASSED. Data is ready for downstream for space alert system.")
-        return True
+COMPILED_RULES = compile_rules(VALIDATION_RULES)
 
 
+def validate_data(data):
+    """Returns the validation report; report['passed'] is the old True/False result."""
+    return run_validation(data, COMPILED_RULES, "space alert system")
+
+
+def validate_and_quarantine(data):
+    """Quarantine mode: returns (rows to load and monitor, report) with failing rows moved to the quarantine table."""
+    load_settings()
+    masks = {}
+    report = run_validation(data, COMPILED_RULES, "space alert system", masks=masks)
+    return quarantine_failed_rows(
+        data, report, masks, NEO_SCHEMA,
+        os.getenv("nasa_schema_name"),
+        os.getenv("nasa_quarantine_table", "space_alert_quarantine"),
+        "space alert system"
+    )
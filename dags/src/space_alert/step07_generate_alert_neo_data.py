@@ -3,9 +3,7 @@
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from dotenv import load_dotenv
 import os
-load_dotenv()
 
 def send_asteroid_threat_alert_email(alerts, recipient_email, sender_email, sender_password):
     if not alerts:
@@ -1,11 +1,10 @@
 import os
 import smtplib
 from email.message import EmailMessage
-from dotenv import load_dotenv
-
-load_dotenv()
+from ..common.settings import load_settings
 
 def send_load_success_email(is_skipped, is_failure, schema_name, table_name, batch_id, record_count):
+    load_settings()
     sender_email = os.getenv("SENDER_MAIL_ID")
     sender_password = os.getenv("GMAIL_APP_PASSWORD")
     recipient_emails = os.getenv("RECIPIENT_EMAILS", "")
@@ -1,95 +1,122 @@
 # Fetch hourly weather info through open-meteo API
 
-import openmeteo_requests
+import numpy as np
 import pandas as pd
-import requests_cache
-from retry_requests import retry
-import json
-from datetime import datetime, timezone
-
-def weatherapi(latitude, longitude,location_name):
-    # Setup session with caching and retry logic
-    cache_session = requests_cache.CachedSession('.cache', expire_after=3600)
-    retry_session = retry(cache_session, retries=5, backoff_factor=0.2)
-    client = openmeteo_requests.Client(session=retry_session)
-
-    # API endpoint and parameters
-    url = "https://api.open-meteo.com/v1/forecast"
-    params = {
-        "latitude": latitude,
-        "longitude": longitude,
-        "hourly": [
-            "temperature_2m", "relative_humidity_2m", "dew_point_2m", "apparent_temperature","wind_speed_10m",
-            "precipitation_probability", "precipitation", "rain", "showers", "snowfall",
-            "snow_depth", "weather_code", "pressure_msl", "surface_pressure", "cloud_cover",
-            "cloud_cover_low", "cloud_cover_mid", "cloud_cover_high", "visibility",
-            "evapotranspiration", "et0_fao_evapotranspiration", "vapour_pressure_deficit"
-        ]
-    }
-
-    # Fetch weather data
-    responses = client.weather_api(url, params=params)
-    response = responses[0]
-    hourly = response.Hourly()
-
-    # Generate datetime range for all hourly data points
-    time_range = pd.date_range(
-        start=pd.to_datetime(hourly.Time(), unit="s", utc=True),
-        end=pd.to_datetime(hourly.TimeEnd(), unit="s", utc=True),
-        freq=pd.Timedelta(seconds=hourly.Interval()),
-        inclusive="left"
+import os
+from .locations import shard_locations
+
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+LOCATIONS_PER_REQUEST = int(os.getenv("OPEN_METEO_LOCATIONS_PER_REQUEST", "100"))
+
+# (open-meteo hourly variable, output column) in request order
+HOURLY_VARIABLES = [
+    ("temperature_2m", "temperature_celcius"),
+    ("relative_humidity_2m", "humidity_%"),
+    ("dew_point_2m", "dew_temperature_celcius"),
+    ("apparent_temperature", "feels_like_temperature_celcius"),
+    ("wind_speed_10m", "wind_speed_kmph"),
+    ("precipitation_probability", "precipitation_%"),
+    ("precipitation", "precipitation_occured_mm"),
+    ("rain", "rain_mm"),
+    ("showers", "showers_mm"),
+    ("snowfall", "snowfall_mm"),
+    ("snow_depth", "snow_depth_mm"),
+    ("weather_code", "weather_code"),
+    ("pressure_msl", "mean_sea_level_pressure_hpa"),
+    ("surface_pressure", "surface_pressure_hpa"),
+    ("cloud_cover", "cloud_cover_%"),
+    ("visibility", "visibility_m"),
+    ("evapotranspiration", "evapotranspiration_mm"),
+    ("et0_fao_evapotranspiration", "et0_fao_evapotranspiration_mm"),
+    ("vapour_pressure_deficit", "vapour_pressure_deficit_kpa")
+]
+
+_client = None
+
+
+def get_client():
+    # Setup session with caching and retry logic once per process
+    global _client
+    if _client is None:
+        # imported on first use so importing this module stays cheap
+        import openmeteo_requests
+        import requests_cache
+        from retry_requests import retry
+        cache_session = requests_cache.CachedSession('.cache', expire_after=3600)
+        retry_session = retry(cache_session, retries=5, backoff_factor=0.2)
+        _client = openmeteo_requests.Client(session=retry_session)
+    return _client
+
+
+def fetch_weather_forecast(locations):
+    # locations: list of (name, latitude, longitude); one request per chunk of locations.
+    # Returns the full hourly horizon as a (city, forecast_time) x variable float32 frame
+    # laid over a single (location x hour x variable) array.
+    client = get_client()
+    columns = [column for _, column in HOURLY_VARIABLES]
+    cube = None
+    forecast_start = None
+
+    for offset in range(0, len(locations), LOCATIONS_PER_REQUEST):
+        chunk = locations[offset:offset + LOCATIONS_PER_REQUEST]
+        params = {
+            "latitude": ",".join(str(latitude) for _, latitude, _ in chunk),
+            "longitude": ",".join(str(longitude) for _, _, longitude in chunk),
+            "hourly": [variable for variable, _ in HOURLY_VARIABLES]
+        }
+        # open-meteo answers with one response per location, in request order
+        responses = client.weather_api(OPEN_METEO_URL, params=params)
+
+        for position, response in enumerate(responses, start=offset):
+            hourly = response.Hourly()
+            if cube is None:
+                forecast_start = hourly.Time()
+                interval = hourly.Interval()
+                hours = (hourly.TimeEnd() - forecast_start) // interval
+                cube = np.full((len(locations), hours, len(columns)), np.nan, dtype=np.float32)
+            elif hourly.Time() != forecast_start:
+                raise ValueError(f"Forecast for {locations[position][0]} starts at a different hour than the batch")
+
+            # one bulk copy per variable straight from the response buffer, no per-value boxing
+            for i in range(len(columns)):
+                values = hourly.Variables(i).ValuesAsNumpy()
+                cube[position, :values.size, i] = values[:hours]
+
+    forecast_times = pd.date_range(
+        start=pd.to_datetime(forecast_start, unit="s", utc=True),
+        periods=cube.shape[1],
+        freq=pd.Timedelta(seconds=interval)
     )
+    index = pd.MultiIndex.from_product(
+        [[name for name, _, _ in locations], forecast_times],
+        names=["city", "forecast_time"]
+    )
+    # reshape is a view, so the frame shares the cube's memory
+    return pd.DataFrame(cube.reshape(-1, len(columns)), index=index, columns=columns, copy=False)
 
-    # Find current UTC hour rounded down
-    now_utc = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
-
-    # Find the index of the current hour in the time_range
-    try:
-        current_index = time_range.get_loc(now_utc)
-    except KeyError:
-        # If current time not in forecast range, fallback to nearest time (first available)
-        current_index = 0
-
-    # Prepare data for the current hour only
-    current_hour_data = {"city": location_name}
-
-    variables = [
-        "temperature_celcius", "humidity_%", "dew_temperature_celcius", "feels_like_temperature_celcius","wind_speed_kmph",
-        "precipitation_%", "precipitation_occured_mm", "rain_mm", "showers_mm", "snowfall_mm",
-        "snow_depth_mm", "weather_code", "mean_sea_level_pressure_hpa", "surface_pressure_hpa", "cloud_cover_%",
-        "visibility_m",
-        "evapotranspiration_mm", "et0_fao_evapotranspiration_mm", "vapour_pressure_deficit_kpa"
-    ]
-
-    # Extract the value for the current hour from each variable
-    for i, var in enumerate(variables):
-        values = hourly.Variables(i).ValuesAsNumpy()
-        current_hour_data[var] = float(values[current_index]) if values.size > current_index else None
-
-    return current_hour_data
-
-def fetch_weather_batch():
-    delhi=weatherapi(28.7041,77.1025,'Delhi')
 
-    mumbai=weatherapi(18.9582,72.8321,'Mumbai')
+def current_hour_frame(forecast):
+    forecast_times = forecast.index.get_level_values("forecast_time").unique()
 
-    bengaluru=weatherapi(12.9629,77.5775,'Bengaluru')
+    # Find current UTC hour rounded down
+    now_utc = pd.Timestamp.now(tz="UTC").floor("h")
+    # If current time not in forecast range, fallback to nearest time (first available)
+    current_time = now_utc if now_utc in forecast_times else forecast_times[0]
 
-    hyderabad=weatherapi(17.4065, 78.4772,'Hyderabad')
+    return forecast.xs(current_time, level="forecast_time").reset_index()
 
-    chennai=weatherapi(13.0843,80.2705,'Chennai')
 
-    kolkata=weatherapi(22.5744,88.3629,'Kolkata')
+def current_hour_records(forecast):
+    return current_hour_frame(forecast).to_dict(orient="records")
 
-    ahmedabad=weatherapi(23.0225,72.5714,'Ahmedabad')
 
-    pune=weatherapi(18.5246,73.8786,'Pune')
+def weatherapi(latitude, longitude,location_name):
+    return current_hour_records(fetch_weather_forecast([(location_name, latitude, longitude)]))[0]
 
-    jaipur=weatherapi(26.9124,75.7873,'Jaipur')
 
-    lucknow=weatherapi(26.8467,80.9462,'Lucknow')
-    
-    all_cities=[delhi,mumbai,bengaluru,hyderabad,chennai,kolkata,ahmedabad,pune,jaipur,lucknow]
+def fetch_weather_batch(shard=None):
+    # every registered location, or only the given shard of the registry
+    all_cities = current_hour_records(fetch_weather_forecast(shard_locations(shard)))
 
     # debugging
     print(f"✅ Data fetched successfully from API for weather alert system")
@@ -97,7 +124,7 @@ def fetch_weather_batch():
 
     return all_cities
 
-print(fetch_weather_batch())
+# print(fetch_weather_batch())
 
 
 
@@ -116,10 +143,13 @@ print(fetch_weather_batch())
               cloud cover, and other atmospheric variables.
               
     Implementation details:
-        - Uses a cached session with automatic retries to improve API request reliability.
-        - Fetches hourly forecast data from Open-Meteo API for a wide range of weather variables.
-        - Converts API response timestamps to pandas datetime for easier time handling.
-        - Extracts the data corresponding to the current UTC hour.
+        - Uses one cached session with automatic retries per process to improve API request reliability.
+        - Fetches hourly forecast data from Open-Meteo API for a wide range of weather variables,
+          sending up to OPEN_METEO_LOCATIONS_PER_REQUEST comma-separated coordinates per request.
+        - fetch_weather_forecast() keeps every hourly variable for the whole forecast horizon in one
+          float32 (location x hour x variable) array and exposes it as a (city, forecast_time) frame.
+        - current_hour_frame() extracts the data corresponding to the current UTC hour
+          (current_hour_records() returns the same rows as dicts).
         - Returns a dictionary with all requested weather parameters for the current hour.
 
         
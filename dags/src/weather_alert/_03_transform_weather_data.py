@@ -1,13 +1,122 @@
 
 from datetime import datetime
-import random
 import pandas as pd
+from .locations import city_short_codes
+from ..common.ids import row_ids, batch_id
+from ..common.dtypes import WEATHER_SCHEMA, apply_dtypes, code_lookup, memory_report
+
+# weather type per WMO weather code, indexed by the code itself
+WEATHER_TYPES = [
+    "Clear sky",  # 0
+    "Mainly clear",  # 1
+    "Partly cloudy",  # 2
+    "Overcast",  # 3
+    "Fog",  # 4
+    "Drizzle",  # 5
+    "Rain",  # 6
+    "Showers",  # 7
+    "Snow",  # 8
+    "Rain and snow",  # 9
+    "Sleet",  # 10
+    "Hail",  # 11
+    "Thunderstorm",  # 12
+    "Duststorm",  # 13
+    "Sandstorm",  # 14
+    "Smoke",  # 15
+    "Volcanic ash",  # 16
+    "Windstorm",  # 17
+    "Tornado",  # 18
+    "Freezing rain",  # 19
+    "Mist",  # 20
+    "Light rain",  # 21
+    "Moderate rain",  # 22
+    "Heavy rain",  # 23
+    "Light snow",  # 24
+    "Moderate snow",  # 25
+    "Heavy snow",  # 26
+    "Light sleet",  # 27
+    "Moderate sleet",  # 28
+    "Heavy sleet",  # 29
+    "Light hail",  # 30
+    "Moderate hail",  # 31
+    "Heavy hail",  # 32
+    "Light thunderstorm",  # 33
+    "Moderate thunderstorm",  # 34
+    "Heavy thunderstorm",  # 35
+    "Light duststorm",  # 36
+    "Moderate duststorm",  # 37
+    "Heavy duststorm",  # 38
+    "Light sandstorm",  # 39
+    "Moderate sandstorm",  # 40
+    "Heavy sandstorm",  # 41
+    "Light smoke",  # 42
+    "Moderate smoke",  # 43
+    "Heavy smoke",  # 44
+    "Light volcanic ash",  # 45
+    "Moderate volcanic ash",  # 46
+    "Heavy volcanic ash",  # 47
+    "Light windstorm",  # 48
+    "Strong windstorm",  # 49
+    "Severe windstorm",  # 50
+    "Light tornado",  # 51
+    "Moderate tornado",  # 52
+    "Heavy tornado",  # 53
+    "Light freezing rain",  # 54
+    "Moderate freezing rain",  # 55
+    "Heavy freezing rain",  # 56
+    "Light mist",  # 57
+    "Moderate mist",  # 58
+    "Heavy mist",  # 59
+    "Light rain and snow",  # 60
+    "Moderate rain and snow",  # 61
+    "Heavy rain and snow",  # 62
+    "Light sleet and snow",  # 63
+    "Moderate sleet and snow",  # 64
+    "Heavy sleet and snow",  # 65
+    "Light hail and snow",  # 66
+    "Moderate hail and snow",  # 67
+    "Heavy hail and snow",  # 68
+    "Light thunderstorm with rain",  # 69
+    "Moderate thunderstorm with rain",  # 70
+    "Heavy thunderstorm with rain",  # 71
+    "Light thunderstorm with snow",  # 72
+    "Moderate thunderstorm with snow",  # 73
+    "Heavy thunderstorm with snow",  # 74
+    "Light thunderstorm with sleet",  # 75
+    "Moderate thunderstorm with sleet",  # 76
+    "Heavy thunderstorm with sleet",  # 77
+    "Light thunderstorm with hail",  # 78
+    "Moderate thunderstorm with hail",  # 79
+    "Heavy thunderstorm with hail",  # 80
+    "Light thunderstorm with dust",  # 81
+    "Moderate thunderstorm with dust",  # 82
+    "Heavy thunderstorm with dust",  # 83
+    "Light thunderstorm with sand",  # 84
+    "Moderate thunderstorm with sand",  # 85
+    "Heavy thunderstorm with sand",  # 86
+    "Light thunderstorm with smoke",  # 87
+    "Moderate thunderstorm with smoke",  # 88
+    "Heavy thunderstorm with smoke",  # 89
+    "Light thunderstorm with volcanic ash",  # 90
+    "Moderate thunderstorm with volcanic ash",  # 91
+    "Heavy thunderstorm with volcanic ash",  # 92
+    "Light windstorm with rain",  # 93
+    "Strong windstorm with rain",  # 94
+    "Severe windstorm with rain",  # 95
+    "Light windstorm with snow",  # 96
+    "Strong windstorm with snow",  # 97
+    "Severe windstorm with snow",  # 98
+    "Light windstorm with sleet",  # 99
+    "Severe windstorm with sleet",  # 100
+]
+WEATHER_TYPE_DTYPE = pd.CategoricalDtype(WEATHER_TYPES)
+
 # Add current datetime in the specified format
 
 
-def tranform_weather_data(data):
+def tranform_weather_data(data, run_key=None, run_ts=None):
 
-    df=pd.DataFrame(data)
+    df=apply_dtypes(pd.DataFrame(data), WEATHER_SCHEMA)
     df['created_at'] = datetime.now()
 
 
@@ -50,138 +159,17 @@ def tranform_weather_data(data):
 
 
     # creating weather_id
-    city_short_map = {
-        'Delhi': 'DEL', 
-        'Mumbai': 'MUM', 
-        'Bengaluru': 'BLR', 
-        'Hyderabad': 'HYD', 
-        'Chennai': 'CHE',  
-        'Kolkata': 'KOL',  
-        'Ahmedabad': 'AMD',  
-        'Pune': 'PUN',  
-        'Jaipur': 'JAI', 
-        'Lucknow': 'LKO'  
-    }
-    def generate_unique_id(row):
-        city_short = city_short_map.get(row['city'], row['city'][:3].upper())
-        weather_code_str = f"{int(row['weather_code']):02d}"  # pad weather code to 2 digits
-        rand_num = f"{random.randint(0, 99):02d}"            # 2 digit random number
-        dt = row['created_at']
-        dt_str = dt.strftime('%d%m%y%H%M%S')                # DDMMYYHHMMSS 
-        ms_str = f"{int(dt.microsecond / 10000):02d}"        # first 2 digits of milliseconds  
-        weather_id = f"{city_short}-{weather_code_str}-{rand_num}-{dt_str}{ms_str}"
-        return weather_id
-    df['weather_id'] = df.apply(generate_unique_id, axis=1)
-    #unique id = 3 leters city shortform-weather_code-random 2 digit-date time in format DDMMYYHHMMSSMS
-
-
-
-    #weather type column based on weather code (WMO standard)
-    # Step 1: Create the mapping dictionary
-    weather_code_map = {
-        0: "Clear sky",
-        1: "Mainly clear",
-        2: "Partly cloudy",
-        3: "Overcast",
-        4: "Fog",
-        5: "Drizzle",
-        6: "Rain",
-        7: "Showers",
-        8: "Snow",
-        9: "Rain and snow",
-        10: "Sleet",
-        11: "Hail",
-        12: "Thunderstorm",
-        13: "Duststorm",
-        14: "Sandstorm",
-        15: "Smoke",
-        16: "Volcanic ash",
-        17: "Windstorm",
-        18: "Tornado",
-        19: "Freezing rain",
-        20: "Mist",
-        21: "Light rain",
-        22: "Moderate rain",
-        23: "Heavy rain",
-        24: "Light snow",
-        25: "Moderate snow",
-        26: "Heavy snow",
-        27: "Light sleet",
-        28: "Moderate sleet",
-        29: "Heavy sleet",
-        30: "Light hail",
-        31: "Moderate hail",
-        32: "Heavy hail",
-        33: "Light thunderstorm",
-        34: "Moderate thunderstorm",
-        35: "Heavy thunderstorm",
-        36: "Light duststorm",
-        37: "Moderate duststorm",
-        38: "Heavy duststorm",
-        39: "Light sandstorm",
-        40: "Moderate sandstorm",
-        41: "Heavy sandstorm",
-        42: "Light smoke",
-        43: "Moderate smoke",
-        44: "Heavy smoke",
-        45: "Light volcanic ash",
-        46: "Moderate volcanic ash",
-        47: "Heavy volcanic ash",
-        48: "Light windstorm",
-        49: "Strong windstorm",
-        50: "Severe windstorm",
-        51: "Light tornado",
-        52: "Moderate tornado",
-        53: "Heavy tornado",
-        54: "Light freezing rain",
-        55: "Moderate freezing rain",
-        56: "Heavy freezing rain",
-        57: "Light mist",
-        58: "Moderate mist",
-        59: "Heavy mist",
-        60: "Light rain and snow",
-        61: "Moderate rain and snow",
-        62: "Heavy rain and snow",
-        63: "Light sleet and snow",
-        64: "Moderate sleet and snow",
-        65: "Heavy sleet and snow",
-        66: "Light hail and snow",
-        67: "Moderate hail and snow",
-        68: "Heavy hail and snow",
-        69: "Light thunderstorm with rain",
-        70: "Moderate thunderstorm with rain",
-        71: "Heavy thunderstorm with rain",
-        72: "Light thunderstorm with snow",
-        73: "Moderate thunderstorm with snow",
-        74: "Heavy thunderstorm with snow",
-        75: "Light thunderstorm with sleet",
-        76: "Moderate thunderstorm with sleet",
-        77: "Heavy thunderstorm with sleet",
-        78: "Light thunderstorm with hail",
-        79: "Moderate thunderstorm with hail",
-        80: "Heavy thunderstorm with hail",
-        81: "Light thunderstorm with dust",
-        82: "Moderate thunderstorm with dust",
-        83: "Heavy thunderstorm with dust",
-        84: "Light thunderstorm with sand",
-        85: "Moderate thunderstorm with sand",
-        86: "Heavy thunderstorm with sand",
-        87: "Light thunderstorm with smoke",
-        88: "Moderate thunderstorm with smoke",
-        89: "Heavy thunderstorm with smoke",
-        90: "Light thunderstorm with volcanic ash",
-        91: "Moderate thunderstorm with volcanic ash",
-        92: "Heavy thunderstorm with volcanic ash",
-        93: "Light windstorm with rain",
-        94: "Strong windstorm with rain",
-        95: "Severe windstorm with rain",
-        96: "Light windstorm with snow",
-        97: "Strong windstorm with snow",
-        98: "Severe windstorm with snow",
-        99: "Light windstorm with sleet",
-        100: "Severe windstorm with sleet"
-    }
-    df['weather_type'] = df['weather_code'].map(weather_code_map)
+    city_short_map = city_short_codes()
+    city_name = df['city'].astype(str)
+    city_short = city_name.map(city_short_map).fillna(city_name.str[:3].str.upper())
+    weather_code_str = df['weather_code'].astype(int).astype(str).str.zfill(2)  # pad weather code to 2 digits
+    df['weather_id'] = city_short + '-' + weather_code_str + '-' + row_ids(df[['city']], run_key, run_ts)
+    #unique id = 3 leters city shortform-weather_code-time sortable id (reproducible for the same run_key)
+
+
+
+    #weather type column based on weather code (WMO standard), looked up by code
+    df['weather_type'] = code_lookup(df['weather_code'], WEATHER_TYPE_DTYPE)
 
 
 
@@ -196,7 +184,7 @@ def tranform_weather_data(data):
 
     # Add audit trail columns
     df['processing_status'] = 'transformed'
-    df['batch_id'] = datetime.now().strftime('%Y%m%d%H%M%S') + f"{datetime.now().microsecond // 1000:03d}"
+    df['batch_id'] = batch_id(run_key, run_ts)
 
 
 
@@ -248,7 +236,8 @@ def tranform_weather_data(data):
         'batch_id'
 
     ]
-    df = df[sorted_columns]
+    df = apply_dtypes(df[sorted_columns], WEATHER_SCHEMA)
+    memory_report(df, 'transform', 'weather alert system')
 
     print("✅ Data transformation completed successfullyfor weather alert system.")
     return df
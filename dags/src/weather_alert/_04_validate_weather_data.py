@@ -1,69 +1,62 @@
 #DATA VALIDATION
+import os
 import pandas as pd
-from datetime import datetime
-
-def validate(data):
-
-    df=pd.DataFrame(data)
-    errors = []
+from ..common.dtypes import WEATHER_SCHEMA
+from ..common.quarantine import quarantine_failed_rows
+from ..common.settings import load_settings
+from ..common.validation import compile_rules, run_validation
 
+VALIDATION_RULES = [
     # 1. Schema / Column Presence
-    required_columns = [
+    {"name": "required_columns", "type": "columns", "columns": [
         'city', 'temperature_celcius', 'humidity_%', 'weather_code',
         'weather_id', 'created_at', 'is_deleted', 'processing_status', 'batch_id'
-    ]
-    missing_cols = [col for col in required_columns if col not in df.columns]
-    if missing_cols:
-        errors.append(f"Missing columns: {missing_cols}")
+    ]},
 
-    # 2. Data Type Checks (spot check)
-    expected_types = {
-        'city': str,
-        'temperature_celcius': float,
-        'humidity_%': float,
-        'weather_code': (int, float),
-        'weather_id': str,
-        'created_at': pd.Timestamp,
-    }
-    for col, dtype in expected_types.items():
-        if col in df.columns:
-            if not df[col].map(lambda x: isinstance(x, dtype)).all():
-                errors.append(f"Column {col} has wrong type(s)")
+    # 2. Data Type Checks
+    # measurements are float32 and city is categorical under the dtype contract
+    {"name": "city_dtype", "type": "dtype", "column": "city", "kind": "string"},
+    {"name": "temperature_dtype", "type": "dtype", "column": "temperature_celcius", "kind": "float"},
+    {"name": "humidity_dtype", "type": "dtype", "column": "humidity_%", "kind": "float"},
+    {"name": "weather_code_dtype", "type": "dtype", "column": "weather_code", "kind": "number"},
+    {"name": "weather_id_dtype", "type": "dtype", "column": "weather_id", "kind": "string"},
+    {"name": "created_at_dtype", "type": "dtype", "column": "created_at", "kind": "datetime"},
 
     # 3. Uniqueness Check
-    if not df['weather_id'].is_unique:
-        errors.append("Duplicate weather_id found")
-
+    {"name": "weather_id_unique", "type": "unique", "column": "weather_id"},
 
     # 5. Range/Logic Check: temperature and humidity
-    if df['temperature_celcius'].between(-90, 60).all() is False:
-        errors.append("Temperature out of expected range")
-
-    if df['humidity_%'].between(0, 100).all() is False:
-        errors.append("Humidity out of expected range")
+    # out-of-range readings are already flagged is_outlier by the clean step, so warn only
+    {"name": "temperature_range", "type": "range", "column": "temperature_celcius", "min": -90, "max": 60, "severity": "warn"},
+    {"name": "humidity_range", "type": "range", "column": "humidity_%", "min": 0, "max": 100, "severity": "warn"},
 
     # 6. Flag Consistency Check
-    if not df[df['snowfall_mm'] > 0]['is_snowfall'].all():
-        errors.append("is_snowfall mismatch")
-
-    if not df[(df['rain_mm'] > 0) | (df['showers_mm'] > 0)]['is_rainfall'].all():
-        errors.append("is_rainfall mismatch")
-
-    if not df[df['visibility_m'] < 1000]['is_foggy'].all():
-        errors.append("is_foggy mismatch")
+    {"name": "is_snowfall_flag", "type": "implies", "when": [('snowfall_mm', '>', 0)], "then": "is_snowfall"},
+    {"name": "is_rainfall_flag", "type": "implies", "when": [('rain_mm', '>', 0), ('showers_mm', '>', 0)], "then": "is_rainfall"},
+    {"name": "is_foggy_flag", "type": "implies", "when": [('visibility_m', '<', 1000)], "then": "is_foggy"},
 
     # 7. Date Check: created_at not in future
-    if (df['created_at'] > datetime.now()).any():
-        errors.append("created_at has future dates")
+    {"name": "created_at_not_future", "type": "not_future", "column": "created_at"},
+]
 
+COMPILED_RULES = compile_rules(VALIDATION_RULES)
 
-    # Final result
-    if errors:
-        print("❌ Validation FAILED with the following issues for weather alert system:")
-        for err in errors:
-            print("-", err)
-        return False
-    else:
-        print("✅ Validation PASSED. Data is ready for downstream for weather alert system.")
-        return True
-    
+
+def validate(data):
+    """Returns the validation report; report['passed'] is the old True/False result."""
+    df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+    return run_validation(df, COMPILED_RULES, "weather alert system")
+
+
+def validate_and_quarantine(data):
+    """Quarantine mode: returns (rows to load and monitor, report) with failing rows moved to the quarantine table."""
+    load_settings()
+    df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+    masks = {}
+    report = run_validation(df, COMPILED_RULES, "weather alert system", masks=masks)
+    return quarantine_failed_rows(
+        df, report, masks, WEATHER_SCHEMA,
+        os.getenv("weather_schema_name"),
+        os.getenv("weather_quarantine_table", "weather_alert_quarantine"),
+        "weather alert system"
+    )
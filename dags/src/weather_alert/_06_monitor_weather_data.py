@@ -1,53 +1,90 @@
 # MONITOR DATA
+import os
+import numpy as np
+import pandas as pd
+
+FORECAST_HORIZON_HOURS = int(os.getenv("WEATHER_FORECAST_HORIZON_HOURS", "72"))
+
+# event -> condition over column values; works on a Series (current hour) as well as
+# on a (city x forecast hour) array, NaN never fires
+WEATHER_RULES = {
+    "Heavy Thunderstorm / Storm": lambda v: (
+        (v['wind_speed_kmph'] > 50) &
+        (v['precipitation_%'] > 80) &
+        (v['precipitation_occured_mm'] > 10) &
+        (v['cloud_cover_%'] > 90) &
+        (v['visibility_m'] < 1000)
+    ),
+    "Cyclone / Severe Windstorm": lambda v: (
+        (v['wind_speed_kmph'] > 90) &
+        (v['mean_sea_level_pressure_hpa'] < 990) &
+        (v['visibility_m'] < 800)
+    ),
+    "Heatwave": lambda v: (v['temperature_celcius'] > 45) & (v['humidity_%'] < 30),
+    "Cold Wave": lambda v: (v['temperature_celcius'] < 5) & (v['humidity_%'] > 70),
+    "Heavy Rainfall": lambda v: (v['rain_mm'] + v['showers_mm']) > 50,
+    "Snowstorm / Blizzard": lambda v: (
+        ((v['snowfall_mm'] > 20) | (v['snow_depth_mm'] > 50)) &
+        (v['wind_speed_kmph'] > 30)
+    ),
+    "Dense Fog": lambda v: v['visibility_m'] < 40,
+}
+
 
 def monitor_weather_events(data):
     df=data
     extreme_events = []
-    for idx, row in df.iterrows():
-        events = []
-
-        if (
-            row['wind_speed_kmph'] > 50 and
-            row['precipitation_%'] > 80 and
-            row['precipitation_occured_mm'] > 10 and
-            row['cloud_cover_%'] > 90 and
-            row['visibility_m'] < 1000
-        ):
-            events.append("Heavy Thunderstorm / Storm")
 
-        if (
-            row['wind_speed_kmph'] > 90 and
-            row['mean_sea_level_pressure_hpa'] < 990 and
-            row['visibility_m'] < 800
-        ):
-            events.append("Cyclone / Severe Windstorm")
+    masks = {event: np.asarray(rule(df), dtype=bool) for event, rule in WEATHER_RULES.items()}
+    for position, city in enumerate(df['city']):
+        events = [event for event, mask in masks.items() if mask[position]]
+        if events:
+            extreme_events.append({
+                "city": city,
+                "events": events
+            })
 
-        if row['temperature_celcius'] > 45 and row['humidity_%'] < 30:
-            events.append("Heatwave")
+    return extreme_events
 
-        if row['temperature_celcius'] < 5 and row['humidity_%'] > 70:
-            events.append("Cold Wave")
 
-        if (row['rain_mm'] + row['showers_mm']) > 50:
-            events.append("Heavy Rainfall")
+def monitor_weather_forecast(forecast):
+    # forecast: (city, forecast_time) x variable frame from fetch_weather_forecast()
+    cities = forecast.index.get_level_values("city").unique()
+    forecast_times = forecast.index.get_level_values("forecast_time").unique()
+    if len(forecast) != len(cities) * len(forecast_times):
+        raise ValueError("Forecast frame must hold every forecast hour for every city")
 
-        if (
-            (row['snowfall_mm'] > 20 or row['snow_depth_mm'] > 50) and
-            row['wind_speed_kmph'] > 30
-        ):
-            events.append("Snowstorm / Blizzard")
+    # upcoming hours only: the current hour is covered by monitor_weather_events
+    now_utc = pd.Timestamp.now(tz="UTC").floor("h")
+    hours_ahead = ((forecast_times - now_utc) // pd.Timedelta(hours=1)).to_numpy()
+    upcoming = (hours_ahead >= 1) & (hours_ahead <= FORECAST_HORIZON_HOURS)
+    if not upcoming.any():
+        # horizon of 0 or a forecast ending at the current hour: nothing ahead to alert on
+        return []
 
-        if row['visibility_m'] < 40:
-            events.append("Dense Fog")
+    # one (city x hour) array per variable, views over the forecast block
+    values = {
+        column: forecast[column].to_numpy().reshape(len(cities), len(forecast_times))[:, upcoming]
+        for column in forecast.columns
+    }
+    upcoming_hours = hours_ahead[upcoming]
+    upcoming_times = forecast_times[upcoming]
 
-        if events:
-            extreme_events.append({
-                "city": row['city'],
-                "events": events
-            })
-        if_events = 'YES' if not events else 'NO'
+    fired = {}
+    for event, rule in WEATHER_RULES.items():
+        mask = rule(values)
+        first_hour = mask.argmax(axis=1)  # earliest forecast hour each city hits the event
+        for city_position in np.flatnonzero(mask.any(axis=1)):
+            hour_position = first_hour[city_position]
+            fired.setdefault(city_position, []).append(
+                f"{event} expected in {upcoming_hours[hour_position]}h "
+                f"({upcoming_times[hour_position]:%Y-%m-%d %H:%M} UTC)"
+            )
 
-    return extreme_events
+    return [
+        {"city": cities[city_position], "events": events}
+        for city_position, events in sorted(fired.items())
+    ]
 
 # Run only if load is successful
 # if not detect_extreme_weather_conditions(df):
@@ -1,13 +1,12 @@
 import os
 import smtplib
 from email.message import EmailMessage
-from dotenv import load_dotenv
-
-load_dotenv()
+from ..common.settings import load_settings
 
 def send_pipeline_halted_email():
     """Notifies the team that the pipeline was stopped due to validation failure."""
     
+    load_settings()
     sender_email = os.getenv("SENDER_MAIL_ID")
     sender_password = os.getenv("GMAIL_APP_PASSWORD")
     recipient_emails = os.getenv("RECIPIENT_EMAILS", "")
@@ -0,0 +1,51 @@
+# WEATHER LOCATION REGISTRY
+# Cities, short codes and shard assignments come from config/weather_locations.csv
+# (override with WEATHER_LOCATIONS_FILE). Rows with an empty shard are spread
+# over shards of WEATHER_LOCATIONS_PER_SHARD locations.
+
+import csv
+import os
+from functools import lru_cache
+from pathlib import Path
+
+DEFAULT_REGISTRY = Path(__file__).resolve().parents[3] / "config" / "weather_locations.csv"
+LOCATIONS_PER_SHARD = int(os.getenv("WEATHER_LOCATIONS_PER_SHARD", "500"))
+
+
+@lru_cache(maxsize=None)
+def load_locations(path=None):
+    path = path or os.getenv("WEATHER_LOCATIONS_FILE") or DEFAULT_REGISTRY
+    locations = []
+    with open(path, newline="", encoding="utf-8") as registry:
+        for position, row in enumerate(csv.DictReader(registry)):
+            city = row["city"].strip()
+            shard = (row.get("shard") or "").strip()
+            locations.append({
+                "city": city,
+                "short_code": (row.get("short_code") or "").strip() or city[:3].upper(),
+                "latitude": float(row["latitude"]),
+                "longitude": float(row["longitude"]),
+                "shard": int(shard) if shard else position // LOCATIONS_PER_SHARD
+            })
+
+    cities = [location["city"] for location in locations]
+    if len(cities) != len(set(cities)):
+        raise ValueError(f"Duplicate city names in weather location registry {path}")
+    return tuple(locations)
+
+
+def list_shards():
+    return sorted({location["shard"] for location in load_locations()})
+
+
+def shard_locations(shard=None):
+    # (city, latitude, longitude) for one shard, or for every location when shard is None
+    return [
+        (location["city"], location["latitude"], location["longitude"])
+        for location in load_locations()
+        if shard is None or location["shard"] == int(shard)
+    ]
+
+
+def city_short_codes():
+    return {location["city"]: location["short_code"] for location in load_locations()}
@@ -1,6 +1,13 @@
 from airflow.sdk import dag,task
-from airflow.operators import *
 from datetime import datetime, timedelta
+import os
+
+# fused: extract -> clean -> transform -> validate run in-process as one task (src/weather_alert/pipeline.py)
+FUSED = os.getenv("WEATHER_ALERT_EXECUTION_MODE", "tasks") == "fused"
+# quarantine: rows failing validation go to a quarantine table, the valid rows still load and monitor
+QUARANTINE = os.getenv("WEATHER_ALERT_VALIDATION_MODE", "halt") == "quarantine"
+FRAME_TASK = "process_weather_data" if FUSED else ("validate_weather_data" if QUARANTINE else "transform_weather_data")
+VALIDATION_TASK = "process_weather_data" if FUSED else "validate_weather_data"
 
 default_args = {
     'retries': 2,
@@ -18,21 +25,31 @@ default_args = {
 def weather_alert_dag():
 
     @task.python
-    def extract_weather_data(**kwargs):
-        from src.weather_alert._01_extract_weather_data import fetch_weather_batch
-        output=fetch_weather_batch()
+    def list_weather_shards():
+        from src.weather_alert.locations import list_shards
+        return list_shards()
+
+    # mapped once per shard of config/weather_locations.csv
+    @task.python
+    def extract_weather_data(shard, **kwargs):
+        from src.weather_alert._01_extract_weather_data import fetch_weather_forecast, current_hour_frame
+        from src.weather_alert.locations import shard_locations
         ti=kwargs['ti']
-        ti.xcom_push(key='fetch_weather_batch',value=output)
+        # full hourly horizon for the shard, kept for forecast analysis without extra API calls
+        forecast=fetch_weather_forecast(shard_locations(shard))
+        ti.xcom_push(key='weather_forecast',value=forecast)
+        output=current_hour_frame(forecast)
         return output
     
     @task.python
-    def clean_weather_data(**kwargs):
+    def clean_weather_data(shard_batches, **kwargs):
+        import pandas as pd
         from src.weather_alert._02_clean_weather_data import clean_weather_data
         ti=kwargs['ti']
-        input=ti.xcom_pull(key='fetch_weather_batch',task_ids='extract_weather_data')
+        # one columnar frame per shard, no records round trip
+        input=pd.concat(list(shard_batches), ignore_index=True)
         output=clean_weather_data(input)
         ti.xcom_push(key='cleaned_weather_data',value=output)
-        return output
     
     
     @task.python
@@ -40,25 +57,38 @@ def weather_alert_dag():
         from src.weather_alert._03_transform_weather_data import tranform_weather_data
         ti=kwargs['ti']
         input=ti.xcom_pull(key='cleaned_weather_data',task_ids='clean_weather_data')
-        output=tranform_weather_data(input)
+        output=tranform_weather_data(input,run_key=kwargs['run_id'],run_ts=kwargs['dag_run'].run_after)
         ti.xcom_push(key='transformed_weather_data',value=output)
-        return output
     
     @task.python
     def validate_weather_data(**kwargs):
-        from src.weather_alert._04_validate_weather_data import validate
+        from src.weather_alert._04_validate_weather_data import validate, validate_and_quarantine
         ti=kwargs['ti']
         input=ti.xcom_pull(key='transformed_weather_data',task_ids='transform_weather_data')
-        output=validate(input)
+        if QUARANTINE:
+            valid,output=validate_and_quarantine(input)
+            ti.xcom_push(key='transformed_weather_data',value=valid)
+        else:
+            output=validate(input)
         ti.xcom_push(key='validate_weather_data',value=output)
         return output
+
+    # returns the forecast alerts in the mapped monitor's shape: one list per shard
+    @task.python
+    def process_weather_data(**kwargs):
+        from src.weather_alert.pipeline import run_weather_alert_pipeline
+        ti=kwargs['ti']
+        output,validation_result,forecast_alerts,lineage=run_weather_alert_pipeline(run_key=kwargs['run_id'],run_ts=kwargs['dag_run'].run_after,quarantine=QUARANTINE)
+        ti.xcom_push(key='transformed_weather_data',value=output)
+        ti.xcom_push(key='validate_weather_data',value=validation_result)
+        ti.xcom_push(key='pipeline_lineage',value=lineage)
+        return forecast_alerts
     
     @task.branch
     def validation_checker(**kwargs):
-        from src.weather_alert._04_validate_weather_data import validate
         ti=kwargs['ti']
-        validation_result=ti.xcom_pull(key='validate_weather_data',task_ids='validate_weather_data')
-        if validation_result is True:
+        validation_result=ti.xcom_pull(key='validate_weather_data',task_ids=VALIDATION_TASK)
+        if validation_result['passed']:
             return ["monitor_weather_data","load_weather_data"]
         else:
             return "raiserror"
@@ -77,7 +107,7 @@ def weather_alert_dag():
     def monitor_weather_data(**kwargs):
         from src.weather_alert._06_monitor_weather_data import monitor_weather_events
         ti=kwargs['ti']
-        input=ti.xcom_pull(key='transformed_weather_data',task_ids='transform_weather_data')
+        input=ti.xcom_pull(key='transformed_weather_data',task_ids=FRAME_TASK)
         output=monitor_weather_events(input)
         if hasattr(output, 'select_dtypes'):
             for col in output.select_dtypes(include=['datetime64']).columns:
@@ -85,17 +115,29 @@ def weather_alert_dag():
         
         ti.xcom_push(key='monitor_weather_data',value=output)
         return output
+
+    # mapped like extract_weather_data, so map_index selects the same shard's forecast
+    @task.python
+    def monitor_weather_forecast_data(shard, **kwargs):
+        from src.weather_alert._06_monitor_weather_data import monitor_weather_forecast
+        ti=kwargs['ti']
+        forecast=ti.xcom_pull(key='weather_forecast',task_ids='extract_weather_data',map_indexes=ti.map_index)
+        output=monitor_weather_forecast(forecast)
+        return output
     
     
-    @task.python
-    def alert_weather_data(**kwargs):
+    # forecast early warnings go out even when current-hour validation fails:
+    # monitor_weather_data is then skipped (raiserror branch) and only the forecast alerts are sent
+    @task.python(trigger_rule="none_failed_min_one_success")
+    def alert_weather_data(forecast_alerts, **kwargs):
         from src.weather_alert._07_generate_alert_weather_data import send_weather_threat_alert_email
         from dotenv import load_dotenv
         import os
         load_dotenv()
         ti=kwargs['ti']
-        input=ti.xcom_pull(key='transformed_weather_data',task_ids='transform_weather_data')
         alerts=ti.xcom_pull(key='monitor_weather_data',task_ids='monitor_weather_data')
+        # current-hour events first, then early warnings from the forecast horizon
+        alerts=list(alerts or [])+[alert for shard_alerts in forecast_alerts or [] for alert in shard_alerts or []]
         recipient_emails = os.getenv("RECIPIENT_EMAILS", "")
         # for users
         # recipient_emails=os.getenv("USER_RECIPIENT_EMAILS", "")
@@ -110,7 +152,7 @@ def weather_alert_dag():
         from src.weather_alert._05_load_data_to_db import load_dataframe_to_postgres
         import pandas as pd
         ti=kwargs['ti']
-        input=ti.xcom_pull(key='transformed_weather_data',task_ids='transform_weather_data')
+        input=ti.xcom_pull(key='transformed_weather_data',task_ids=FRAME_TASK)
         output=load_dataframe_to_postgres(input)
         ti.xcom_push(key='load_weather_data',value=output)
         return output
@@ -135,26 +177,45 @@ def weather_alert_dag():
     
             
         send_load_success_email(is_skipped,is_failure,schema_name,table_name,batch_id,record_count)
+
+    # DataFrames travel as Arrow files (src/common/xcom_backend.py); drop the expired ones
+    @task.python(trigger_rule="all_done")
+    def purge_expired_xcom():
+        from src.common.frame_store import sweep_expired
+        return sweep_expired()
     
     
-    step1_extract=extract_weather_data()
-    step2_clean=clean_weather_data()
-    step3_transform=transform_weather_data()
-    step4_validate=validate_weather_data()
     step5_validation_check=validation_checker()
     step6_raiserror=raiserror()
     step6_load=load_weather_data()
     step7_monitor=monitor_weather_data()
-    step8_alert=alert_weather_data()
     step9_data_load_alert=data_load_alert()
     step10_pipeline_error_alert=error_alert()
-    
-    
-    step1_extract >> step2_clean >> step3_transform >> step4_validate >> step5_validation_check >> [step6_load,step6_raiserror]
+    step11_purge_xcom=purge_expired_xcom()
+    
+    
+    if FUSED:
+        step1_process=process_weather_data()
+        step8_alert=alert_weather_data(step1_process)
+        step1_process >> step5_validation_check
+    else:
+        step0_shards=list_weather_shards()
+        step1_extract=extract_weather_data.expand(shard=step0_shards)
+        step2_clean=clean_weather_data(step1_extract)
+        step3_transform=transform_weather_data()
+        step4_validate=validate_weather_data()
+        step7_forecast_monitor=monitor_weather_forecast_data.expand(shard=step0_shards)
+        step8_alert=alert_weather_data(step7_forecast_monitor)
+        step1_extract >> step2_clean >> step3_transform >> step4_validate >> step5_validation_check
+        step1_extract >> step7_forecast_monitor
+
+    step5_validation_check >> [step6_load,step6_raiserror]
     
     step6_raiserror >> step10_pipeline_error_alert
      
     step5_validation_check >> step7_monitor >> step8_alert
     
     step6_load >> step9_data_load_alert
+
+    [step8_alert,step9_data_load_alert,step10_pipeline_error_alert] >> step11_purge_xcom
 weather_alert_dag()
\ No newline at end of file
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# the DAG code imports as `src.*` from the dags folder, as on the Airflow workers
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "dags"))
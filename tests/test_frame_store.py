@@ -0,0 +1,86 @@
+import json
+import os
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.common import frame_store
+from src.common.frame_store import is_reference, read_frame, sweep_expired, write_frame
+
+
+@pytest.fixture(autouse=True)
+def store(monkeypatch, tmp_path):
+    monkeypatch.setattr(frame_store, "STORE_PATH", str(tmp_path))
+    monkeypatch.setattr(frame_store, "_store", None)
+    return tmp_path
+
+
+def write(df, key="frame"):
+    return write_frame(df, "space_alert_dag", "manual__2025-01-01T10:15:00+00:00", "transform_neo_data", key)
+
+
+def payloads(store):
+    return sorted(path for path in store.rglob("*.arrow"))
+
+
+def test_neo_frame_round_trips_with_its_dtypes():
+    df = pd.DataFrame({
+        "nasa_id": ["1", "2", "3"],
+        "risk_level": pd.Categorical(["Low", "High", "Low"], categories=["Low", "Medium", "High", "Critical"]),
+        "diameter_max_m": np.array([1.5, 2.25, np.nan], dtype=np.float32),
+        "closest_approach_time_to_earth_IST": pd.to_datetime(["2025-01-01 10:15", "2025-01-02 11:00", "2025-01-03 12:30"]),
+    }, index=[4, 7, 9])
+    reference = write(df)
+
+    assert is_reference(reference)
+    pd.testing.assert_frame_equal(read_frame(reference), df)
+
+
+def test_weather_cube_keeps_its_multiindex_and_timezone():
+    times = pd.date_range("2025-01-01", periods=3, freq="h", tz="UTC")
+    index = pd.MultiIndex.from_product([["Delhi", "Kolkata"], times], names=["city", "forecast_time"])
+    df = pd.DataFrame({"temperature_celcius": np.arange(6, dtype=np.float32)}, index=index)
+    restored = read_frame(write(df))
+
+    pd.testing.assert_frame_equal(restored, df)
+    assert str(restored.index.get_level_values("forecast_time").tz) == "UTC"
+
+
+def test_sweep_removes_only_expired_payloads(store):
+    expired, fresh = write(pd.DataFrame({"a": [1]}), "old"), write(pd.DataFrame({"a": [2]}), "new")
+    old_path = next(path for path in payloads(store) if path.name.startswith("old-"))
+    two_days_ago = time.time() - 48 * 3600
+    os.utime(old_path, (two_days_ago, two_days_ago))
+
+    assert sweep_expired(ttl_hours=24) == 1
+    assert [path.name.split("-")[0] for path in payloads(store)] == ["new"]
+    assert read_frame(fresh)["a"].tolist() == [2]
+
+
+def test_sweep_on_a_missing_store_is_a_no_op(monkeypatch, tmp_path):
+    monkeypatch.setattr(frame_store, "STORE_PATH", str(tmp_path / "missing"))
+
+    assert sweep_expired(ttl_hours=0) == 0
+
+
+@pytest.mark.parametrize("encode", [lambda reference: reference, json.dumps])
+def test_backend_purge_deletes_the_payload(store, encode):
+    xcom_backend = pytest.importorskip("src.common.xcom_backend", exc_type=ImportError)
+    reference = write(pd.DataFrame({"a": [1]}))
+
+    xcom_backend.ArrowXComBackend.purge(SimpleNamespace(value=encode(reference)))
+
+    assert payloads(store) == []
+
+
+def test_backend_purge_ignores_plain_values(store):
+    xcom_backend = pytest.importorskip("src.common.xcom_backend", exc_type=ImportError)
+    write(pd.DataFrame({"a": [1]}))
+
+    xcom_backend.ArrowXComBackend.purge(SimpleNamespace(value=json.dumps({"passed": True})))
+    xcom_backend.ArrowXComBackend.purge(SimpleNamespace(value="not json"))
+
+    assert len(payloads(store)) == 1
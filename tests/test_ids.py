@@ -0,0 +1,56 @@
+import re
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.common.ids import ID_LENGTH, batch_id, content_ids, new_ids, row_ids
+
+CROCKFORD_ID = re.compile(r"^[0-9A-HJKMNP-TV-Z]{26}$")
+RUN_TS = datetime(2025, 1, 1, 10, 15)
+
+
+def frame():
+    # rows 0, 1 and 3 are exact duplicates
+    return pd.DataFrame({"nasa_id": ["7", "7", "8", "7"], "velocity_kmph": [1.5, 1.5, 2.0, 1.5]})
+
+
+@pytest.mark.parametrize("run_key", [None, "manual__2025-01-01"])
+def test_ids_are_unique_within_a_batch_even_for_identical_rows(run_key):
+    ids = row_ids(frame(), run_key, RUN_TS)
+
+    assert len(ids) == 4
+    assert len(set(ids)) == 4
+
+
+def test_same_run_key_and_timestamp_reproduce_the_ids():
+    assert list(row_ids(frame(), "run-1", RUN_TS)) == list(row_ids(frame(), "run-1", RUN_TS))
+    assert batch_id("run-1", RUN_TS) == batch_id("run-1", RUN_TS)
+
+
+def test_other_run_key_gives_other_ids():
+    first, second = row_ids(frame(), "run-1", RUN_TS), row_ids(frame(), "run-2", RUN_TS)
+
+    assert not set(first) & set(second)
+    assert batch_id("run-1", RUN_TS) != batch_id("run-2", RUN_TS)
+
+
+def test_ids_sort_by_time():
+    earlier = content_ids(frame(), "run-1", datetime(2025, 1, 1, 10, 15))
+    later = content_ids(frame(), "run-1", datetime(2025, 1, 1, 10, 15, 0, 1000))
+
+    assert max(earlier) < min(later)
+    assert batch_id(None, datetime(2024, 12, 31)) < batch_id(None, datetime(2025, 1, 1))
+
+
+def test_ids_are_26_crockford_characters():
+    ids = list(row_ids(frame(), "run-1", RUN_TS)) + list(new_ids(50)) + [batch_id()]
+
+    assert all(len(id_) == ID_LENGTH and CROCKFORD_ID.match(id_) for id_ in ids)
+
+
+@pytest.mark.parametrize("run_key", [None, "run-1"])
+def test_empty_frame_gives_no_ids(run_key):
+    ids = row_ids(frame().iloc[:0], run_key, RUN_TS)
+
+    assert len(ids) == 0
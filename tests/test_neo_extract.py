@@ -0,0 +1,114 @@
+import json
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+from src.space_alert import neows_client
+from src.space_alert.step01_extract_neo_data import neosapi
+from src.space_alert.step02_clean_neo_data import clean_data
+
+
+def _neo(nasa_id, approach, distance_km):
+    return {
+        "id": nasa_id,
+        "name": f"({nasa_id})",
+        "nasa_jpl_url": f"https://ssd.jpl.nasa.gov/tools/sbdb_lookup.html#/?sstr={nasa_id}",
+        "is_potentially_hazardous_asteroid": nasa_id == "3",
+        "estimated_diameter": {"meters": {"estimated_diameter_min": 10.0, "estimated_diameter_max": 20.0}},
+        "close_approach_data": [{
+            "close_approach_date_full": approach,
+            "miss_distance": {"kilometers": str(distance_km)},
+            "relative_velocity": {"kilometers_per_hour": "50000.5"},
+        }],
+    }
+
+
+def canned_feed(day):
+    # "2" is seen on every day, the merged frame keeps its earliest approach;
+    # close_approach_date_full in the NeoWs format, e.g. "2024-Jan-01 10:00"
+    return [
+        _neo(str(day.day + 100), f"{day:%Y-%b-%d} 10:00", 1000.0 * day.day),
+        _neo("2", f"{day:%Y-%b-%d} 12:00", day.day),
+    ]
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.requests.append((url.path, query["start_date"], query["end_date"]))
+
+        start, end = date.fromisoformat(query["start_date"]), date.fromisoformat(query["end_date"])
+        days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+        # days come back out of order, as NeoWs does
+        body = json.dumps({"near_earth_objects": {str(day): canned_feed(day) for day in reversed(days)}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def feed_server(monkeypatch):
+    _FeedHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(neows_client, "NEOWS_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.delenv("RATE_LIMIT_REDIS_URL", raising=False)
+    yield _FeedHandler.requests
+    server.shutdown()
+    server.server_close()
+
+
+def test_backfill_is_split_into_feed_windows(feed_server):
+    neosapi("2024-01-01", "2024-01-10", max_workers=4)
+
+    assert sorted(feed_server) == [
+        ("/feed", "2024-01-01", "2024-01-07"),
+        ("/feed", "2024-01-08", "2024-01-10"),
+    ]
+
+
+def test_windows_are_merged_in_date_order_and_deduped(feed_server):
+    df = neosapi("2024-01-01", "2024-01-10", max_workers=4)
+
+    assert df["nasa_id"].is_unique
+    assert len(df) == 11  # one object per day plus "2"
+    shared = df[df["nasa_id"] == "2"].iloc[0]
+    assert shared["closest_approach_time_to_earth_IST"] == "2024-Jan-01 12:00"
+    assert shared["closest_approach_distance_km"] == 1.0
+
+    daily = df[df["nasa_id"] != "2"]
+    assert list(daily["nasa_id"]) == [str(day + 100) for day in range(1, 11)]
+
+
+def test_listed_dates_fetch_only_their_ranges(feed_server):
+    dates = [date(2024, 3, 1), date(2024, 3, 2), date(2024, 3, 20)]
+    df = neosapi(dates=dates, max_workers=2)
+
+    assert sorted(feed_server) == [
+        ("/feed", "2024-03-01", "2024-03-02"),
+        ("/feed", "2024-03-20", "2024-03-20"),
+    ]
+    assert set(df["nasa_id"]) == {"101", "102", "120", "2"}
+
+
+def test_extracted_frame_goes_through_cleaning(feed_server):
+    df = clean_data(neosapi("2024-01-01", "2024-01-03", max_workers=2))
+
+    assert len(df) == 4
+    shared = df[df["nasa_id"] == "2"].iloc[0]
+    # UTC approach time shifted to IST
+    assert shared["closest_approach_time_to_earth_IST"] == pd.Timestamp("2024-01-01 17:30")
+    assert shared["asteroid_name"] == "2"
@@ -0,0 +1,104 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.space_alert import neows_client
+
+
+class _ScriptedHandler(BaseHTTPRequestHandler):
+    # statuses to answer with, in order; 200 once they run out
+    script = []
+    seen_headers = []
+
+    def do_GET(self):
+        self.seen_headers.append(dict(self.headers))
+        status = self.script.pop(0) if self.script else 200
+        body = json.dumps({"ok": True}).encode() if status == 200 else b""
+        self.send_response(status)
+        if status == 200:
+            self.send_header("ETag", '"v1"')
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self, tokens=1, timeout=None):
+        self.acquired += tokens
+
+    def observe(self, headers):
+        pass
+
+
+@pytest.fixture
+def scripted_server(monkeypatch, tmp_path):
+    _ScriptedHandler.script, _ScriptedHandler.seen_headers = [], []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ScriptedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    limiter = _CountingLimiter()
+    monkeypatch.setattr(neows_client, "NEOWS_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(neows_client, "get_limiter", lambda: limiter)
+    monkeypatch.setattr(neows_client, "BACKOFF_S", 0.01)
+    monkeypatch.setattr(neows_client, "CONDITIONAL_CACHE_PATH", str(tmp_path))
+    neows_client._conditional_cache.clear()
+    yield _ScriptedHandler, limiter
+    server.shutdown()
+    server.server_close()
+
+
+def test_every_retry_takes_a_token(scripted_server):
+    handler, limiter = scripted_server
+    handler.script = [503, 429]
+
+    assert neows_client.get_json("/neo/1") == {"ok": True}
+    assert len(handler.seen_headers) == 3
+    assert limiter.acquired == 3
+
+
+def test_rate_limited_retries_are_capped(scripted_server, monkeypatch):
+    handler, limiter = scripted_server
+    monkeypatch.setattr(neows_client, "RATE_LIMITED_RETRIES", 1)
+    handler.script = [429, 429, 429]
+
+    with pytest.raises(neows_client.requests.HTTPError):
+        neows_client.get_json("/neo/1")
+    assert limiter.acquired == 2
+
+
+def test_304_without_cached_body_is_fetched_again(scripted_server):
+    handler, limiter = scripted_server
+    handler.script = [304]
+
+    assert neows_client.get_json("/neo/1") == {"ok": True}
+    assert "If-None-Match" not in handler.seen_headers[-1]
+    assert limiter.acquired == 2
+
+
+def test_validators_survive_a_new_process(scripted_server):
+    handler, _ = scripted_server
+    assert neows_client.get_json("/neo/1") == {"ok": True}
+
+    # a later task run starts with an empty in-process cache
+    neows_client._conditional_cache.clear()
+    handler.script = [304]
+
+    assert neows_client.get_json("/neo/1") == {"ok": True}
+    assert handler.seen_headers[-1]["If-None-Match"] == '"v1"'
+    assert len(handler.seen_headers) == 2
+
+
+def test_latency_samples_are_bounded():
+    for _ in range(neows_client.LATENCY_SAMPLES + 5):
+        neows_client._latencies.append(("/neo/1", 200, 0.01))
+
+    assert len(neows_client._latencies) == neows_client.LATENCY_SAMPLES
@@ -0,0 +1,90 @@
+import pandas as pd
+import pytest
+
+from src.common import quarantine
+from src.common.dtypes import NEO_SCHEMA
+from src.common.quarantine import quarantine_failed_rows, split_failed_rows
+from src.common.validation import compile_rules, run_validation
+
+RULES = compile_rules([
+    {"name": "columns_present", "type": "columns", "columns": ["nasa_id", "velocity_kmph"]},
+    {"name": "nasa_id_unique", "type": "unique", "column": "nasa_id"},
+    {"name": "velocity_positive", "type": "range", "column": "velocity_kmph", "min": 0, "min_inclusive": False},
+    {"name": "velocity_known", "type": "range", "column": "velocity_kmph", "max": 1e6, "severity": "warn"},
+])
+
+
+def frame():
+    return pd.DataFrame({"nasa_id": ["1", "2", "2", "4"], "velocity_kmph": [10.0, -1.0, 5.0, 2e6]})
+
+
+def validate(df):
+    masks = {}
+    return run_validation(df, RULES, "test", masks), masks
+
+
+@pytest.fixture
+def written(monkeypatch):
+    calls = []
+
+    def write_quarantine(rows, schema, schema_name, table_name):
+        calls.append((rows, schema_name, table_name))
+        return len(rows)
+
+    monkeypatch.setattr(quarantine, "write_quarantine", write_quarantine)
+    return calls
+
+
+def quarantine_rows(df):
+    report, masks = validate(df)
+    return quarantine_failed_rows(df, report, masks, NEO_SCHEMA, "nasa", "space_alert_quarantine", "test")
+
+
+def test_failed_rows_are_split_off_with_their_reasons():
+    df = frame()
+    report, masks = validate(df)
+    valid, quarantined = split_failed_rows(df, report, masks)
+
+    # warnings never quarantine a row
+    assert list(valid["nasa_id"]) == ["1", "4"]
+    assert list(quarantined.index) == [1, 2]
+    assert list(quarantined["quarantine_reasons"]) == ["nasa_id_unique;velocity_positive", "nasa_id_unique"]
+
+
+def test_valid_rows_continue_and_the_report_passes(written):
+    valid, report = quarantine_rows(frame())
+
+    assert report["passed"]
+    assert report["quarantine"] == {"schema": "nasa", "table": "space_alert_quarantine", "rows": 2}
+    assert list(valid["nasa_id"]) == ["1", "4"]
+    assert list(written[0][0]["nasa_id"]) == ["2", "2"]
+
+
+def test_frame_level_failure_halts_instead_of_quarantining(written):
+    df = frame().drop(columns="velocity_kmph").assign(speed=1.0)
+    rows, report = quarantine_rows(df)
+
+    assert not report["passed"]
+    assert rows is df
+    assert not written
+
+
+def test_every_row_failing_halts(written):
+    df = pd.DataFrame({"nasa_id": ["1", "2"], "velocity_kmph": [-1.0, -5.0]})
+    rows, report = quarantine_rows(df)
+
+    assert not report["passed"]
+    assert len(rows) == 2
+    assert not written
+
+
+def test_write_failure_halts(monkeypatch):
+    def write_quarantine(*args):
+        raise RuntimeError("Missing table nasa.space_alert_quarantine")
+
+    monkeypatch.setattr(quarantine, "write_quarantine", write_quarantine)
+    rows, report = quarantine_rows(frame())
+
+    assert not report["passed"]
+    assert "quarantine" not in report
+    assert len(rows) == 4
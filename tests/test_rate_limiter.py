@@ -0,0 +1,61 @@
+import fakeredis
+import pytest
+
+from src.common import rate_limiter
+from src.common.rate_limiter import InMemoryTokenBucket, RedisTokenBucket
+
+
+@pytest.fixture
+def redis_bucket():
+    # fakeredis runs the real Lua script (TIME, HMGET/HSET, DECRBY)
+    client = fakeredis.FakeRedis()
+    return RedisTokenBucket("test", capacity=3, refill_per_s=0.1, client=client), client
+
+
+@pytest.mark.parametrize("bucket_type", ["memory", "redis"])
+def test_burst_then_wait(bucket_type, redis_bucket):
+    bucket = InMemoryTokenBucket("test", 3, 0.1) if bucket_type == "memory" else redis_bucket[0]
+
+    assert [bucket._try_acquire(1) for _ in range(3)] == [0.0, 0.0, 0.0]
+    # one token short at 0.1 token/s
+    assert bucket._try_acquire(1) == pytest.approx(10, abs=0.1)
+
+
+def test_redis_bucket_refills_and_caps_at_capacity(redis_bucket):
+    bucket, client = redis_bucket
+    for _ in range(3):
+        bucket._try_acquire(1)
+
+    now = float(client.hget(bucket._bucket_key, "ts"))
+    client.hset(bucket._bucket_key, mapping={"tokens": 0, "ts": now - 10})
+    assert bucket._try_acquire(1) == 0.0
+    assert bucket._try_acquire(1) > 0
+
+    # an hour idle refills to the burst size, not beyond
+    client.hset(bucket._bucket_key, mapping={"tokens": 0, "ts": now - 3600})
+    assert [bucket._try_acquire(1) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket._try_acquire(1) > 0
+
+
+def test_redis_bucket_is_clamped_to_the_reported_quota(redis_bucket):
+    bucket, client = redis_bucket
+    bucket.observe({"X-RateLimit-Remaining": "1", "X-RateLimit-Limit": "1000"})
+
+    assert bucket.quota() == (1, 1000)
+    assert bucket._try_acquire(1) == 0.0
+    assert int(client.get(bucket._remaining_key)) == 0
+    assert bucket._try_acquire(1) > 0
+    assert bucket.recommended_concurrency(4) == 1
+
+
+def test_unreachable_redis_falls_back_to_the_local_bucket(monkeypatch, capsys):
+    monkeypatch.setenv("RATE_LIMIT_REDIS_URL", "redis://127.0.0.1:1/0")
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    bucket = rate_limiter.get_rate_limiter("unreachable", 3600, 2)
+
+    bucket.acquire(timeout=1)
+    bucket.acquire(timeout=1)
+    assert bucket._try_acquire(1) > 0
+    assert "Redis unavailable" in capsys.readouterr().out
+    bucket.observe({"X-RateLimit-Remaining": "5", "X-RateLimit-Limit": "1000"})
+    assert bucket.quota() == (5, 1000)
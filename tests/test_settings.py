@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+DAGS_FOLDER = Path(__file__).resolve().parents[1] / "dags"
+
+PROBE = """
+import importlib, os, pkgutil
+import src.common, src.space_alert, src.weather_alert
+for package in (src.common, src.space_alert, src.weather_alert):
+    for module in pkgutil.iter_modules(package.__path__):
+        if module.name != "xcom_backend":  # needs Airflow
+            importlib.import_module(f"{package.__name__}.{module.name}")
+print(os.getenv("PIPELINE_SETTINGS_PROBE"))
+from src.common.settings import load_settings
+load_settings()
+print(os.getenv("PIPELINE_SETTINGS_PROBE"))
+"""
+
+
+def test_env_file_is_loaded_on_first_use_not_at_import(tmp_path):
+    (tmp_path / ".env").write_text("PIPELINE_SETTINGS_PROBE=loaded\n")
+    env = {**os.environ, "PYTHONPATH": str(DAGS_FOLDER)}
+    env.pop("PIPELINE_SETTINGS_PROBE", None)
+
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=tmp_path, env=env, capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.split() == ["None", "loaded"]
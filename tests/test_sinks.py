@@ -0,0 +1,43 @@
+import pandas as pd
+
+from src.common.dtypes import NEO_SCHEMA
+from src.common.sinks import load_dataframe, load_target
+
+
+class _Sink:
+    def __init__(self, name, fails=False):
+        self.name = name
+        self.fails = fails
+
+    def write(self, df, batch_id):
+        if self.fails:
+            raise OSError(f"{self.name} unavailable")
+        return len(df)
+
+
+def batch():
+    return pd.DataFrame({"nasa_id": ["1", "2", "3"], "batch_id": ["b1"] * 3})
+
+
+def target():
+    return load_target("nasa", "nasa_id", NEO_SCHEMA, "space alert system", "SPACE_ALERT_SINKS")
+
+
+def test_secondary_failure_keeps_the_committed_load():
+    output = load_dataframe(batch(), target(), sinks=[_Sink("postgres"), _Sink("parquet", fails=True)])
+
+    assert output[0] is True
+    assert output[3:] == ["b1", 3, ["parquet"]]
+
+
+def test_primary_failure_fails_the_load():
+    output = load_dataframe(batch(), target(), sinks=[_Sink("postgres", fails=True), _Sink("parquet")])
+
+    assert output == [False]
+
+
+def test_all_sinks_ok_keeps_the_five_item_result():
+    output = load_dataframe(batch(), target(), sinks=[_Sink("postgres"), _Sink("sqlite")])
+
+    assert output[0] is True
+    assert len(output) == 5 and output[4] == 3
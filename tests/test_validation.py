@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.common.validation import compile_rules, run_validation
+
+
+def frame():
+    return pd.DataFrame({
+        "nasa_id": ["1", "2", "2", "4"],
+        "distance_km": [5.0, 10.0, np.nan, 20.0],
+        "diameter_min_m": [1.0, 8.0, 3.0, np.nan],
+        "diameter_max_m": [2.0, 4.0, 3.0, 9.0],
+        "risk_level": ["Low", "High", "Unknown", "Low"],
+        "is_hazardous": [False, True, False, False],
+        "approach_time": [datetime.now() - timedelta(days=1)] * 3 + [datetime.now() + timedelta(days=1)],
+    }, index=[10, 11, 12, 13])
+
+
+def run(rule, df=None, masks=None):
+    report = run_validation(frame() if df is None else df, compile_rules([{"name": "rule", **rule}]), "test", masks)
+    return report, report["rules"][0]
+
+
+def test_columns_rule_fails_the_frame_on_a_missing_column():
+    report, result = run({"type": "columns", "columns": ["nasa_id", "velocity_kmph"]})
+
+    assert not report["passed"]
+    assert result["failed_count"] == 4
+    assert "velocity_kmph" in result["message"]
+    assert run({"type": "columns", "columns": ["nasa_id"]})[0]["passed"]
+
+
+def test_dtype_rule_checks_the_column_kind():
+    assert run({"type": "dtype", "column": "distance_km", "kind": "float"})[0]["passed"]
+    assert run({"type": "dtype", "column": "nasa_id", "kind": "string"})[0]["passed"]
+    report, result = run({"type": "dtype", "column": "nasa_id", "kind": "number"})
+
+    assert not report["passed"]
+    assert result["failed_count"] == 4
+
+
+def test_unique_rule_fails_every_copy():
+    _, result = run({"type": "unique", "column": "nasa_id"})
+
+    assert result["failed_rows"] == [11, 12]
+
+
+@pytest.mark.parametrize("inclusive, failing", [(True, [10]), (False, [10, 11, 13])])
+def test_range_rule_bounds(inclusive, failing):
+    _, result = run({
+        "type": "range", "column": "distance_km", "min": 10, "max": 20,
+        "min_inclusive": inclusive, "max_inclusive": inclusive
+    })
+
+    # the NaN distance (row 12) never fails
+    assert result["failed_rows"] == failing
+
+
+def test_compare_rule_fails_rows_where_the_comparison_is_false():
+    masks = {}
+    _, result = run({"type": "compare", "left": "diameter_min_m", "op": "<=", "right": "diameter_max_m"}, masks=masks)
+
+    # row 13 has no diameter_min_m: NaN does not fail
+    assert result["failed_rows"] == [11]
+    assert masks["rule"].tolist() == [False, True, False, False]
+
+
+def test_allowed_rule():
+    _, result = run({"type": "allowed", "column": "risk_level", "values": ["Low", "Medium", "High", "Critical"]})
+
+    assert result["failed_rows"] == [12]
+
+
+def test_implies_rule_needs_the_flag_when_any_condition_holds():
+    _, result = run({
+        "type": "implies", "when": [("diameter_max_m", ">", 5), ("distance_km", "<", 6)], "then": "is_hazardous"
+    })
+
+    assert result["failed_rows"] == [10, 13]
+
+
+def test_not_future_rule():
+    _, result = run({"type": "not_future", "column": "approach_time"})
+
+    assert result["failed_rows"] == [13]
+
+
+def test_warning_does_not_fail_the_batch():
+    report, result = run({"type": "unique", "column": "nasa_id", "severity": "warn"})
+
+    assert report["passed"]
+    assert not result["passed"]
+    assert result["failed_count"] == 2
+
+
+def test_unknown_rule_type_raises():
+    with pytest.raises(ValueError, match="Unknown validation rule type"):
+        compile_rules([{"name": "rule", "type": "regex", "column": "nasa_id"}])
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.weather_alert import _06_monitor_weather_data as monitor
+from src.weather_alert._06_monitor_weather_data import monitor_weather_forecast
+
+
+def forecast_frame(hours, cities=("Kolkata", "Delhi")):
+    # hours relative to the current UTC hour; Delhi gets a heatwave at every hour
+    now = pd.Timestamp.now(tz="UTC").floor("h")
+    times = [now + pd.Timedelta(hours=hour) for hour in hours]
+    index = pd.MultiIndex.from_product([list(cities), times], names=["city", "forecast_time"])
+    columns = {
+        "wind_speed_kmph": 10.0, "precipitation_%": 0.0, "precipitation_occured_mm": 0.0, "cloud_cover_%": 0.0,
+        "visibility_m": 10000.0, "mean_sea_level_pressure_hpa": 1010.0, "temperature_celcius": 25.0,
+        "humidity_%": 50.0, "rain_mm": 0.0, "showers_mm": 0.0, "snowfall_mm": 0.0, "snow_depth_mm": 0.0,
+    }
+    frame = pd.DataFrame({column: np.full(len(index), value, dtype=np.float32) for column, value in columns.items()}, index=index)
+    delhi = frame.index.get_level_values("city") == "Delhi"
+    frame.loc[delhi, "temperature_celcius"] = 47.0
+    frame.loc[delhi, "humidity_%"] = 10.0
+    return frame
+
+
+def test_first_upcoming_hour_is_reported():
+    alerts = monitor_weather_forecast(forecast_frame(range(0, 6)))
+
+    assert [alert["city"] for alert in alerts] == ["Delhi"]
+    assert alerts[0]["events"][0].startswith("Heatwave expected in 1h")
+
+
+@pytest.mark.parametrize("hours, horizon", [(range(0, 6), 0), (range(-3, 1), 72)])
+def test_no_upcoming_hour_means_no_alerts(monkeypatch, hours, horizon):
+    monkeypatch.setattr(monitor, "FORECAST_HORIZON_HOURS", horizon)
+
+    assert monitor_weather_forecast(forecast_frame(hours)) == []